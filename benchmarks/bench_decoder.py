@@ -0,0 +1,70 @@
+"""
+Time spent building Client models from user.list entries, comparing the
+previous construction (copy the dicts, pop the nested objects, build each
+model with **) with the decoder generated by utils.decoder.
+
+    python benchmarks/bench_decoder.py [users]
+"""
+import sys
+import time
+from typing import Callable
+from bench_lazy_namespace import log_event
+import unrealircd_rpc_py.objects.Definition as Dfn
+from unrealircd_rpc_py.utils import decoder
+
+
+def previous_build_client(user: dict) -> Dfn.Client:
+    """The construction used by User.get before utils.decoder"""
+    user_for_client = user.copy()
+    user_for_user: dict = user.get('user', {}).copy()
+
+    for key in ['geoip', 'tls', 'user']:
+        user_for_client.pop(key, None)
+
+    for key in ['channels', 'security-groups']:
+        user_for_user.pop(key, None)
+
+    user_model = Dfn.User(
+        **user_for_user,
+        security_groups=user.get('user', {}).get('security-groups', []),
+        channels=[Dfn.UserChannel(**chans)
+                  for chans in user.get('user', {}).get('channels', [])]
+    )
+
+    return Dfn.Client(
+        **user_for_client,
+        geoip=Dfn.Geoip(**user.get('geoip', {})),
+        tls=Dfn.Tls(**user.get('tls', {})),
+        user=user_model
+    )
+
+
+def measure(build: Callable[[dict], Dfn.Client], users: list[dict]
+            ) -> tuple[float, list[Dfn.Client]]:
+    start = time.perf_counter()
+    clients = [build(user) for user in users]
+    return time.perf_counter() - start, clients
+
+
+def main() -> None:
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    users = []
+    for index in range(number):
+        user = log_event(index)['client']
+        user['user']['channels'] = [{'name': '#welcome', 'level': ''},
+                                    {'name': '#help', 'level': 'v'}]
+        users.append(user)
+
+    decode_client = decoder.decoder_for(Dfn.Client)
+
+    before, previous = measure(previous_build_client, users)
+    after, decoded = measure(decode_client, users)
+    assert previous == decoded
+
+    print(f'{number} clients')
+    print(f'  copy/pop/** : {before:.3f}s')
+    print(f'  decoder     : {after:.3f}s ({before / after:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
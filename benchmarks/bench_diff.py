@@ -0,0 +1,98 @@
+"""
+Time to find the changes between two user.list of 100k users with 1% of
+churn (quits, connections, nick changes and joins, 0.25% each):
+decoding both listings into Client models and comparing them by id,
+against the fingerprints of modules.mirror.snapshot_diff on the raw
+entries.
+
+    python benchmarks/bench_diff.py [users] [churn]
+"""
+import copy
+import sys
+import time
+from typing import Any, Callable
+from bench_lazy_namespace import log_event
+import unrealircd_rpc_py.objects.Definition as Dfn
+from unrealircd_rpc_py.modules.mirror import snapshot_diff
+from unrealircd_rpc_py.utils import decoder, json_codec
+
+
+def listings(users: int, churn: float) -> tuple[list[dict], list[dict]]:
+    before = []
+    for index in range(users):
+        entry = log_event(index)['client']
+        entry['user']['channels'] = [{'name': '#welcome', 'level': ''}]
+        before.append(entry)
+
+    after = [copy.deepcopy(entry) for entry in before]
+    step = int(1 / (churn / 4))
+    for index in range(0, users, step):
+        after[index + 1]['name'] = f'Renamed{index}'
+        after[index + 2]['user']['channels'].append(
+            {'name': '#help', 'level': 'v'}
+        )
+        after[index + 3] = log_event(users + index)['client']
+    quits = set(range(0, users, step))
+    after = [entry for index, entry in enumerate(after)
+             if index not in quits]
+    return before, after
+
+
+def previous_diff(before: list[dict], after: list[dict]) -> list[Any]:
+    """Build the models of both listings and compare them by id"""
+    old = {client.id: client for client
+           in decoder.decode_list(Dfn.Client, before)}
+    new = {client.id: client for client
+           in decoder.decode_list(Dfn.Client, after)}
+    changes: list[Any] = []
+    for client_id, client in new.items():
+        previous = old.get(client_id)
+        if previous is None:
+            changes.append(('connected', client))
+        elif previous != client:
+            changes.append(('changed', client))
+    changes.extend(('quit', old[client_id])
+                   for client_id in old.keys() - new.keys())
+    return changes
+
+
+def fingerprint_diff(before: list[dict], after: list[dict]) -> list[Any]:
+    return snapshot_diff.diff_users(snapshot_diff.Snapshot(before),
+                                    snapshot_diff.Snapshot(after))
+
+
+def timed(run: Callable[[], Any]) -> tuple[Any, float]:
+    start = time.perf_counter()
+    result = run()
+    return result, time.perf_counter() - start
+
+
+def main() -> None:
+    users = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    churn = float(sys.argv[2]) if len(sys.argv) > 2 else 0.01
+    before, after = listings(users, churn)
+
+    previous, previous_time = timed(lambda: previous_diff(before, after))
+    changes, changes_time = timed(lambda: fingerprint_diff(before, after))
+
+    old = snapshot_diff.Snapshot(before)
+    new = snapshot_diff.Snapshot(after)
+    _, compare_time = timed(lambda: snapshot_diff.diff_users(old, new))
+
+    kinds: dict[str, int] = {}
+    for change in changes:
+        kinds[type(change).__name__] = kinds.get(type(change).__name__, 0) + 1
+
+    print(f'{users} users, {churn:.0%} churn, '
+          f'JSON backend: {json_codec.backend}')
+    print(f'  models compared by id    : {previous_time:.3f}s '
+          f'({len(previous)} changes)')
+    print(f'  snapshots + diff_users   : {changes_time:.3f}s '
+          f'({previous_time / changes_time:.1f}x)')
+    print(f'  diff_users (snapshots kept from the last poll): '
+          f'{compare_time:.3f}s')
+    print(f'  {kinds}')
+
+
+if __name__ == '__main__':
+    main()
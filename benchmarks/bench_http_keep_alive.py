@@ -0,0 +1,44 @@
+"""
+Compare the calls per second of HttpConnection with and without the
+keep-alive session, against the local stand-in server.
+
+    python benchmarks/bench_http_keep_alive.py [calls] [threads]
+"""
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from standin import start_http_server
+from unrealircd_rpc_py.ConnectionFactory import ConnectionFactory
+
+
+def run(conn, calls: int, threads: int) -> float:
+    def worker(n: int) -> None:
+        for _ in range(n):
+            conn.query('stats.get', {'object_detail_level': 1})
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        for _ in range(threads):
+            pool.submit(worker, calls // threads)
+    return calls / (time.perf_counter() - start)
+
+
+def main() -> None:
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    server, url = start_http_server()
+
+    for keep_alive in (False, True):
+        conn = ConnectionFactory(40).get('http')
+        conn.setup({'url': url, 'username': 'bench', 'password': 'bench',
+                    'keep_alive': keep_alive, 'pool_size': threads})
+        rate = run(conn, calls, threads)
+        conn.close()
+        print(f'keep_alive={keep_alive!s:5} threads={threads}: '
+              f'{rate:8.0f} calls/s')
+
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
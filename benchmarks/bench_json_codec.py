@@ -0,0 +1,43 @@
+"""
+Decode speed of the JSON backends supported by utils.json_codec on live
+log events received as bytes, compared with the previous websocket path
+(json.loads(json.loads(json.dumps(str)))).
+
+    python benchmarks/bench_json_codec.py [number]
+"""
+import json
+import sys
+import time
+from bench_lazy_namespace import log_event
+from unrealircd_rpc_py.utils import json_codec
+
+
+def main() -> None:
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    events = [
+        json.dumps({'jsonrpc': '2.0', 'method': 'log.subscribe',
+                    'result': log_event(index)}).encode()
+        for index in range(number)
+    ]
+    texts = [event.decode() for event in events]
+
+    start = time.perf_counter()
+    for text in texts:
+        json.loads(json.loads(json.dumps(text)))
+    print(f'previous websocket path : {time.perf_counter() - start:.3f}s')
+
+    for backend in json_codec.BACKENDS:
+        try:
+            json_codec.use(backend)
+        except ImportError:
+            print(f'{backend:<24}: not installed')
+            continue
+
+        start = time.perf_counter()
+        for event in events:
+            json_codec.loads(event)
+        print(f'{backend:<24}: {time.perf_counter() - start:.3f}s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""
+Compare utils.dict_to_namespace (eager SimpleNamespace copy) with
+utils.dict_to_lazy_namespace (LazyNamespace view) on decoded responses.
+
+Two shapes are measured:
+  - live log events: one nested dict per event, the callback reads a few
+    fields (event_id, client.name).
+  - user.get replies: a nested client dict, the caller reads a few fields.
+
+    python benchmarks/bench_lazy_namespace.py [number]
+"""
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable
+from unrealircd_rpc_py.utils import utils
+
+
+def log_event(index: int) -> dict:
+    return {
+        'timestamp': '2025-01-01T10:00:00.000Z',
+        'level': 'info',
+        'subsystem': 'connect',
+        'event_id': 'LOCAL_CLIENT_CONNECT',
+        'log_source': 'irc.local',
+        'msg': f'Client connecting: Guest{index} (guest@192.168.1.10)',
+        'client': {
+            'name': f'Guest{index}',
+            'id': f'001{index:06d}',
+            'hostname': '192.168.1.10',
+            'ip': '192.168.1.10',
+            'details': f'Guest{index}!guest@192.168.1.10',
+            'connected_since': '2025-01-01T10:00:00.000Z',
+            'idle_since': '2025-01-01T10:00:00.000Z',
+            'user': {
+                'username': 'guest',
+                'realname': 'Guest user',
+                'vhost': 'Clk-1234ABCD.ip',
+                'cloakedhost': 'Clk-1234ABCD.ip',
+                'servername': 'irc.local',
+                'reputation': 0,
+                'security-groups': ['unknown-users'],
+                'modes': 'iwx',
+                'channels': []
+            },
+            'geoip': {'country_code': 'FR', 'asn': 3215, 'asname': 'Orange'},
+            'tls': {'certfp': 'a' * 64, 'cipher': 'TLSv1.3-AES256'}
+        }
+    }
+
+
+def user_get(index: int) -> dict:
+    return {
+        'jsonrpc': '2.0',
+        'method': 'user.get',
+        'id': index,
+        'result': {'client': log_event(index)['client']}
+    }
+
+
+def read_event(namespace: Any) -> tuple:
+    return namespace.event_id, namespace.client.name
+
+
+def read_user(namespace: Any) -> tuple:
+    return namespace.result.client.name, namespace.result.client.user.modes
+
+
+def run(convert: Callable[[Any], Any], read: Callable[[Any], Any],
+        payloads: list[dict]) -> list:
+    kept = []
+    for payload in payloads:
+        namespace = convert(payload)
+        read(namespace)
+        kept.append(namespace)
+    return kept
+
+
+def measure(convert: Callable[[Any], Any], read: Callable[[Any], Any],
+            payloads: list[dict]) -> tuple[float, float]:
+    """Returns the time in seconds and the memory peak in MB of converting
+    and reading all the payloads while keeping the results alive."""
+    start = time.perf_counter()
+    run(convert, read, payloads)
+    elapsed = time.perf_counter() - start
+
+    # Measured apart, tracemalloc slows down the allocations
+    tracemalloc.start()
+    run(convert, read, payloads)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return elapsed, peak / 1024 / 1024
+
+
+def main() -> None:
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+
+    for label, build, read in (('log events', log_event, read_event),
+                               ('user.get replies', user_get, read_user)):
+        payloads = [build(index) for index in range(number)]
+        eager = measure(utils.dict_to_namespace, read, payloads)
+        lazy = measure(utils.dict_to_lazy_namespace, read, payloads)
+
+        print(f'{label} x {number}')
+        print(f'  dict_to_namespace      : {eager[0]:.3f}s '
+              f'{eager[1]:8.1f} MB')
+        print(f'  dict_to_lazy_namespace : {lazy[0]:.3f}s '
+              f'{lazy[1]:8.1f} MB')
+        print(f'  saved                  : {eager[0] - lazy[0]:.3f}s '
+              f'{eager[1] - lazy[1]:8.1f} MB')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Events per second of a live unix socket stream with each event_format:
+namespace (LiveRPCResult), dict (the decoded line) and raw (the line not
+decoded). The stand-in streams `number` log events after the reply of
+log.subscribe then closes the stream (logged as an error), the callback
+reads the event_id.
+
+    python benchmarks/bench_live_formats.py [number]
+"""
+import asyncio
+import json
+import os
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+from typing import Any
+from bench_lazy_namespace import log_event
+from standin import answer
+from unrealircd_rpc_py.connections.live.live_unixsocket import LiveUnixSocket
+
+
+def stream_server(lines: bytes) -> str:
+    """Start a stand-in streaming `lines` to each log.subscribe
+
+    Returns:
+        str: The path to the socket file
+    """
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            for line in self.rfile:
+                request = json.loads(line)
+                reply = json.dumps(answer(request)).encode() + b'\n'
+                if request.get('method') != 'log.subscribe':
+                    self.wfile.write(reply)
+                    continue
+                self.wfile.write(reply + lines)
+                return
+
+    path = os.path.join(tempfile.mkdtemp(), 'rpc.socket')
+    server = socketserver.ThreadingUnixStreamServer(path, Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return path
+
+
+class Reader:
+    """The callback, reads the event_id of each log event"""
+
+    def __init__(self) -> None:
+        self.events = 0
+
+    def namespace(self, event: Any) -> None:
+        if event.method == 'log.event':
+            self.events += event.result.event_id is not None
+
+    def dict(self, event: Any) -> None:
+        # The error of the closed stream is a LiveRPCResult
+        if isinstance(event, dict) and event['method'] == 'log.event':
+            self.events += event['result']['event_id'] is not None
+
+    def raw(self, event: Any) -> None:
+        # Forwarded as is, only the method is peeked
+        if getattr(event, 'method', None) == 'log.event':
+            self.events += 1
+
+
+def measure(path: str, event_format: str, number: int) -> float:
+    """Returns the events per second given to the callback"""
+    reader = Reader()
+    live = LiveUnixSocket(40)
+    live.setup({'path_to_socket_file': path,
+                'callback_object_instance': reader,
+                'callback_method_or_function_name': event_format,
+                'event_format': event_format})
+
+    start = time.perf_counter()
+    asyncio.run(live.subscribe(['all']))
+    elapsed = time.perf_counter() - start
+
+    assert reader.events == number, reader.events
+    return number / elapsed
+
+
+def main() -> None:
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    lines = b''.join(
+        json.dumps({'jsonrpc': '2.0', 'method': 'log.event',
+                    'result': log_event(index)}).encode() + b'\n'
+        for index in range(number)
+    )
+    path = stream_server(lines)
+
+    print(f'live log events x {number} ({len(lines) / 1024 / 1024:.1f} MB)')
+    rates = {}
+    for event_format in ('namespace', 'dict', 'raw'):
+        rates[event_format] = measure(path, event_format, number)
+        print(f'  {event_format:<9} : {rates[event_format]:10,.0f} events/s '
+              f'x{rates[event_format] / rates["namespace"]:.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Bytes per Client model (with its User, Geoip, Tls and two UserChannel)
+for synthetic users, comparing the slotted models of objects.Definition
+with the same models rebuilt as regular dataclasses (one __dict__ per
+instance, as before).
+
+    python benchmarks/bench_model_slots.py [users]
+"""
+import sys
+import tracemalloc
+from dataclasses import MISSING, field, fields, make_dataclass
+from typing import Any, Callable
+import unrealircd_rpc_py.objects.Definition as Dfn
+
+
+def without_slots(cls: type) -> type:
+    """The same dataclass, without __slots__"""
+    specs = []
+    for model_field in fields(cls):
+        if model_field.default_factory is not MISSING:
+            default = field(default_factory=model_field.default_factory)
+        else:
+            default = field(default=model_field.default)
+        specs.append((model_field.name, model_field.type, default))
+
+    return make_dataclass(cls.__name__, specs)
+
+
+def build(models: dict[str, type], users: int) -> list[Any]:
+    clients = []
+    for index in range(users):
+        clients.append(models['Client'](
+            name=f'Guest{index}', id=f'001{index:06d}',
+            hostname='192.168.1.10', ip='192.168.1.10',
+            details=f'Guest{index}!guest@192.168.1.10',
+            geoip=models['Geoip'](country_code='FR', asn='3215',
+                                  asname='Orange'),
+            tls=models['Tls'](certfp='a' * 64, cipher='TLSv1.3'),
+            user=models['User'](
+                username='guest', realname='Guest user',
+                servername='irc.local', modes='iwx',
+                security_groups=['unknown-users'],
+                channels=[models['UserChannel'](name='#welcome', level=''),
+                          models['UserChannel'](name='#help', level='v')]
+            ),
+            error=models['RPCErrorModel']()
+        ))
+    return clients
+
+
+def measure(make: Callable[[], list]) -> int:
+    tracemalloc.start()
+    kept = make()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return size
+
+
+def main() -> None:
+    users = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    names = ('Client', 'User', 'UserChannel', 'Geoip', 'Tls',
+             'RPCErrorModel')
+
+    slotted = {name: getattr(Dfn, name) for name in names}
+    regular = {name: without_slots(model) for name, model in slotted.items()}
+
+    before = measure(lambda: build(regular, users))
+    after = measure(lambda: build(slotted, users))
+
+    print(f'{users} clients')
+    print(f'  regular dataclasses : {before / users:7.0f} bytes per Client '
+          f'({before / 1024 / 1024:.1f} MB)')
+    print(f'  slotted dataclasses : {after / users:7.0f} bytes per Client '
+          f'({after / 1024 / 1024:.1f} MB)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+Time spent serializing Client models: dataclasses.asdict (the previous
+MainModel.to_dict) against the serializers generated by utils.serializer,
+for to_dict, to_dict with the nested objects skipped (as ToSql does) and
+JSON encoding.
+
+    python benchmarks/bench_serializer.py [clients]
+"""
+import sys
+import time
+from dataclasses import asdict
+from typing import Any, Callable
+from bench_lazy_namespace import log_event
+import unrealircd_rpc_py.objects.Definition as Dfn
+from unrealircd_rpc_py.utils import decoder, json_codec
+
+NESTED = ('geoip', 'tls', 'user', 'error')
+
+
+def previous_tosql_dict(client: Dfn.Client) -> dict:
+    client_dict = asdict(client)
+    for key in NESTED:
+        client_dict.pop(key)
+    return client_dict
+
+
+def timed(run: Callable[[Any], Any], clients: list) -> float:
+    start = time.perf_counter()
+    for client in clients:
+        run(client)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    clients = []
+    for index in range(number):
+        user = log_event(index)['client']
+        user['user']['channels'] = [{'name': '#welcome', 'level': ''},
+                                    {'name': '#help', 'level': 'v'}]
+        clients.append(decoder.decode(Dfn.Client, user))
+
+    assert clients[0].to_dict() == asdict(clients[0])
+
+    cases = (
+        ('to_dict', asdict, Dfn.Client.to_dict),
+        ('to_dict without nested', previous_tosql_dict,
+         lambda client: client.to_dict(exclude=NESTED)),
+        ('JSON bytes', lambda client: json_codec.dumps_bytes(asdict(client)),
+         Dfn.Client.to_json_bytes),
+    )
+
+    print(f'{number} clients, JSON backend: {json_codec.backend}')
+    for label, before, after in cases:
+        previous = timed(before, clients)
+        generated = timed(after, clients)
+        print(f'  {label:<24}: asdict {previous:.3f}s, '
+              f'generated {generated:.3f}s ({previous / generated:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Compare the memory peak of User.list_ (whole response decoded, then all
+the models built) with User.iter_ (one entry decoded and built at a time)
+on a synthetic user.list of detail level 4.
+
+The stand-in server runs in a child process so its own memory is not
+counted.
+
+    python benchmarks/bench_stream_list.py [users]
+"""
+import multiprocessing
+import sys
+import time
+import tracemalloc
+from typing import Callable
+from bench_lazy_namespace import log_event
+from standin import default_result, start_unix_server
+from unrealircd_rpc_py.ConnectionFactory import ConnectionFactory
+
+
+def serve(users: int, paths: multiprocessing.Queue) -> None:
+    clients = [log_event(index)['client'] for index in range(users)]
+
+    def result(method: str, params: dict):
+        if method == 'user.list':
+            return {'list': clients}
+        return default_result(method, params)
+
+    server, path = start_unix_server(result)
+    paths.put(path)
+    server.serve_forever()
+
+
+def measure(run: Callable[[], int]) -> tuple[int, float, float]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = run()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return count, elapsed, peak / 1024 / 1024
+
+
+def main() -> None:
+    users = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    paths = multiprocessing.Queue()
+    server = multiprocessing.Process(
+        target=serve, args=(users, paths), daemon=True
+    )
+    server.start()
+
+    conn = ConnectionFactory(40).get('unixsocket')
+    conn.setup({'path_to_socket_file': paths.get()})
+
+    def with_list() -> int:
+        return sum(1 for client in conn.User.list_(4) if client.name)
+
+    def with_iter() -> int:
+        return sum(1 for client in conn.User.iter_(4) if client.name)
+
+    for label, run in (('User.list_', with_list), ('User.iter_', with_iter)):
+        count, elapsed, peak = measure(run)
+        print(f'{label}: {count} users {elapsed:.2f}s peak {peak:.1f} MB')
+
+    server.terminate()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""
+Compare the Client models (one per user, as built by User.list_) with
+User.list_columns (UserTable, one array per attribute) on a synthetic
+user.list:
+memory kept by the result, and time of an aggregate query (users per
+country with a reputation above 100).
+
+The stand-in server runs in a child process so its own memory is not
+counted.
+
+    python benchmarks/bench_table.py [users]
+"""
+import multiprocessing
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from typing import Any, Callable
+from bench_lazy_namespace import log_event
+from standin import default_result, start_unix_server
+from unrealircd_rpc_py.ConnectionFactory import ConnectionFactory
+from unrealircd_rpc_py.objects import Table
+
+COUNTRIES = ('FR', 'DE', 'US', 'GB', 'NL', 'BE', 'CA', 'ES')
+
+
+def serve(users: int, paths: multiprocessing.Queue) -> None:
+    clients = []
+    for index in range(users):
+        client = log_event(index)['client']
+        client['server_port'] = 6697
+        client['client_port'] = 40000 + index % 20000
+        client['geoip']['country_code'] = COUNTRIES[index % len(COUNTRIES)]
+        client['user']['reputation'] = index % 500
+        client['user']['account'] = f'account{index}' if index % 4 else None
+        clients.append(client)
+
+    def result(method: str, params: dict):
+        if method == 'user.list':
+            return {'list': clients}
+        return default_result(method, params)
+
+    server, path = start_unix_server(result)
+    paths.put(path)
+    server.serve_forever()
+
+
+def kept_memory(build: Callable[[], Any]) -> tuple[Any, float]:
+    tracemalloc.start()
+    kept = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return kept, size / 1024 / 1024
+
+
+def timed(run: Callable[[], Any]) -> tuple[Any, float]:
+    start = time.perf_counter()
+    result = run()
+    return result, time.perf_counter() - start
+
+
+def main() -> None:
+    users = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    paths = multiprocessing.Queue()
+    server = multiprocessing.Process(
+        target=serve, args=(users, paths), daemon=True
+    )
+    server.start()
+
+    conn = ConnectionFactory(40).get('unixsocket')
+    conn.setup({'path_to_socket_file': paths.get()})
+
+    clients, clients_size = kept_memory(lambda: list(conn.User.iter_(2)))
+    table, table_size = kept_memory(lambda: conn.User.list_columns(2))
+
+    print(f'{users} users')
+    print(f'  Client models     : {clients_size:7.1f} MB')
+    print(f'  User.list_columns : {table_size:7.1f} MB')
+
+    by_models, models_time = timed(lambda: Counter(
+        client.geoip.country_code for client in clients
+        if client.user.reputation > 100
+    ))
+    by_table, table_time = timed(lambda: table.count_by(
+        'country', reputation=lambda reputation: reputation > 100
+    ))
+    assert by_models == by_table
+
+    print('users per country with a reputation > 100')
+    print(f'  loop over Client  : {models_time:.3f}s')
+    print(f'  UserTable.count_by: {table_time:.3f}s')
+
+    if Table.numpy is not None:
+        by_numpy, numpy_time = timed(lambda: table.count_by(
+            'country',
+            Table.numpy.frombuffer(table['reputation'], dtype='int64') > 100
+        ))
+        assert by_numpy == by_table
+        print(f'  numpy mask        : {numpy_time:.3f}s')
+
+    server.terminate()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Compare the previous Unix socket read loop (bytes concatenation and a
+regex per chunk) with FrameReader on synthetic multi-MB responses.
+
+    python benchmarks/bench_unix_framing.py [size_mb ...]
+"""
+import socket
+import sys
+import threading
+import time
+from re import findall
+from unrealircd_rpc_py.connections.sync.framing import FrameReader
+
+
+def old_read(sock: socket.socket) -> bytes:
+    response = b""
+    chunk = b""
+    pattern = b'\n$'
+
+    while True:
+        chunk = sock.recv(4096)
+        response += chunk
+        if findall(pattern, chunk):
+            break
+
+    return response
+
+
+def new_read(sock: socket.socket, recv_size: int) -> bytearray:
+    return FrameReader(sock, recv_size).read_frame()
+
+
+def payload(size: int) -> bytes:
+    entry = (b'{"name":"Guest12345","id":"001ABCDEF","hostname":'
+             b'"192.168.1.10","ip":"192.168.1.10","details":'
+             b'"Guest12345!guest@192.168.1.10"},')
+    body = entry * (size // len(entry))
+    return b'{"jsonrpc":"2.0","id":1,"result":{"list":[' + body[:-1] + b']}}\n'
+
+
+def measure(data: bytes, reader) -> float:
+    server, client = socket.socketpair()
+    sender = threading.Thread(target=server.sendall, args=(data,))
+    start = time.perf_counter()
+    sender.start()
+    received = reader(client)
+    elapsed = time.perf_counter() - start
+    sender.join()
+    server.close()
+    client.close()
+    assert len(received) >= len(data) - 1
+    return elapsed
+
+
+def main() -> None:
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1, 4, 16]
+
+    for size in sizes:
+        data = payload(size * 1024 * 1024)
+        print(f'{size:4d} MB: old loop {measure(data, old_read):8.3f}s | '
+              f'FrameReader 4 KiB '
+              f'{measure(data, lambda s: new_read(s, 4096)):6.3f}s | '
+              f'FrameReader 64 KiB '
+              f'{measure(data, lambda s: new_read(s, 65536)):6.3f}s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,190 @@
+"""
+Local stand-in for the UnrealIRCd JSON-RPC server, used by the benchmarks.
+
+It answers every method with a small canned result, except server.get
+which returns what the connections need to detect the ircd version.
+A result_fn returning NO_REPLY leaves the request unanswered.
+"""
+import asyncio
+import json
+import os
+import socketserver
+import ssl
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Optional
+
+SERVER_GET = {
+    'server': {
+        'name': 'irc.standin.local',
+        'id': '001',
+        'server': {
+            'features': {'software': 'UnrealIRCd-6.2.2'}
+        }
+    }
+}
+
+NO_REPLY = object()
+"""Returned by a result_fn to leave the request unanswered"""
+
+
+def default_result(method: str, params: dict) -> Any:
+    if method == 'server.get':
+        return SERVER_GET
+    return {'method': method, 'params': params}
+
+
+def answer(request: Any,
+           result_fn: Callable[[str, dict], Any] = default_result) -> Any:
+    """Build the JSON-RPC reply (single or batch) for a decoded request"""
+    if isinstance(request, list):
+        return [answer(req, result_fn) for req in request]
+
+    return {
+        'jsonrpc': '2.0',
+        'method': request.get('method'),
+        'id': request.get('id'),
+        'result': result_fn(request.get('method'), request.get('params', {}))
+    }
+
+
+def unanswered(reply: Any) -> bool:
+    """Whether a reply built by answer holds a NO_REPLY result"""
+    replies = reply if isinstance(reply, list) else [reply]
+    return any(item['result'] is NO_REPLY for item in replies)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Write the headers and the body in one segment
+    wbufsize = -1
+    disable_nagle_algorithm = True
+    result_fn: Callable[[str, dict], Any] = staticmethod(default_result)
+
+    def _send(self, body: bytes) -> None:
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        self._send(b'{}')
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get('Content-Length', 0))
+        request = json.loads(self.rfile.read(length))
+        self._send(json.dumps(answer(request, self.result_fn)).encode())
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def start_http_server(
+        result_fn: Optional[Callable[[str, dict], Any]] = None
+) -> tuple[ThreadingHTTPServer, str]:
+    """Start the stand-in http server in a daemon thread
+
+    Returns:
+        tuple: The server and the url to give to the connection
+    """
+    handler = type('Handler', (_Handler,), {})
+    if result_fn is not None:
+        handler.result_fn = staticmethod(result_fn)
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    return server, f'http://127.0.0.1:{server.server_address[1]}/api'
+
+
+class _UnixHandler(socketserver.StreamRequestHandler):
+    result_fn: Callable[[str, dict], Any] = staticmethod(default_result)
+
+    def handle(self) -> None:
+        # One JSON request per line, as long as the client keeps the
+        # connection open
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            reply = answer(json.loads(line), self.result_fn)
+            if unanswered(reply):
+                continue
+            self.wfile.write(json.dumps(reply).encode() + b'\n')
+
+
+def start_unix_server(
+        result_fn: Optional[Callable[[str, dict], Any]] = None
+) -> tuple[socketserver.ThreadingUnixStreamServer, str]:
+    """Start the stand-in unix socket server in a daemon thread
+
+    Returns:
+        tuple: The server and the path to the socket file
+    """
+    handler = type('UnixHandler', (_UnixHandler,), {})
+    if result_fn is not None:
+        handler.result_fn = staticmethod(result_fn)
+
+    path = os.path.join(tempfile.mkdtemp(), 'rpc.socket')
+    server = socketserver.ThreadingUnixStreamServer(path, handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    return server, path
+
+
+def start_websocket_server(
+        certfile: str,
+        result_fn: Optional[Callable[[str, dict], Any]] = None
+) -> tuple[asyncio.AbstractEventLoop, int]:
+    """Start the stand-in websocket server (wss) in a daemon thread.
+
+    Each request is answered in its own task and result_fn runs in a
+    thread, so a slow result does not delay the other replies.
+
+    Args:
+        certfile (str): PEM file with the certificate and its key
+        result_fn (Callable, optional): Build the result of a request
+
+    Returns:
+        tuple: The event loop of the server and its port
+    """
+    from websockets.asyncio.server import serve
+    from websockets.exceptions import ConnectionClosed
+
+    result_fn = result_fn or default_result
+    sslctx = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    sslctx.load_cert_chain(certfile)
+    started: list = []
+    ready = threading.Event()
+
+    async def reply(websocket, message) -> None:
+        request = json.loads(message)
+        response = await asyncio.to_thread(answer, request, result_fn)
+        if not unanswered(response):
+            await websocket.send(json.dumps(response))
+
+    async def handler(websocket) -> None:
+        tasks = set()
+        try:
+            async for message in websocket:
+                task = asyncio.create_task(reply(websocket, message))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except ConnectionClosed:
+            pass
+
+    async def main() -> None:
+        async with serve(handler, '127.0.0.1', 0, ssl=sslctx) as server:
+            port = next(iter(server.sockets)).getsockname()[1]
+            started.append((asyncio.get_running_loop(), port))
+            ready.set()
+            await asyncio.Future()
+
+    threading.Thread(target=asyncio.run, args=(main(),),
+                     daemon=True).start()
+    ready.wait()
+
+    return started[0]
@@ -0,0 +1,35 @@
+import os
+import sys
+
+# The stand-in servers of the benchmarks
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'benchmarks')
+)
+
+from standin import default_result, start_unix_server  # noqa: E402
+from unrealircd_rpc_py.ConnectionFactory import ConnectionFactory  # noqa: E402
+
+CERTFILE = os.path.join(os.path.dirname(__file__), 'standin.pem')
+"""Self-signed certificate and key of the stand-in websocket server"""
+
+
+class CountingResults:
+    """Result of the stand-in, counting the queries of each method"""
+
+    def __init__(self):
+        self.calls = {}
+
+    def __call__(self, method, params):
+        self.calls[method] = self.calls.get(method, 0) + 1
+        if method == 'user.get':
+            return {'client': {'name': params['nick'], 'id': '001AAAAAA'}}
+        if method == 'user.list':
+            return {'list': [{'name': 'adator', 'id': '001AAAAAA'}]}
+        return default_result(method, params)
+
+
+def connection(results, **params):
+    server, path = start_unix_server(results)
+    conn = ConnectionFactory(50).get('unixsocket')
+    conn.setup({'path_to_socket_file': path, **params})
+    return server, conn
@@ -0,0 +1,79 @@
+import asyncio
+import time
+
+import pytest
+
+from conftest import CERTFILE
+from standin import NO_REPLY, default_result, start_websocket_server
+from unrealircd_rpc_py.connections.live.live_http import LiveWebsocket
+from unrealircd_rpc_py.objects.Definition import LiveRPCResult
+
+
+def result(method, params):
+    if method == 'never.reply':
+        return NO_REPLY
+    # The first queries are answered last
+    time.sleep(params.get('delay', 0))
+    return default_result(method, params)
+
+
+@pytest.fixture(scope='module')
+def server_port():
+    _, port = start_websocket_server(CERTFILE, result)
+    return port
+
+
+@pytest.fixture
+def live(server_port, monkeypatch):
+    # The stand-in only speaks websocket
+    monkeypatch.setattr(LiveWebsocket, 'establish_first_connection',
+                        lambda self: LiveRPCResult())
+    live = LiveWebsocket(50)
+    live.setup({'url': f'https://127.0.0.1:{server_port}/api',
+                'username': 'user', 'password': 'pass', 'timeout': 0.5})
+    return live
+
+
+def run(live, queries):
+    """Run the queries in one event loop, the one of the websocket"""
+    async def main():
+        try:
+            # A lost reply fails the test instead of hanging it
+            return await asyncio.wait_for(queries(), 10)
+        finally:
+            await live.close()
+
+    return asyncio.run(main())
+
+
+def test_concurrent_queries_get_their_own_reply(live):
+    async def queries():
+        # Every caller uses the same id
+        return await asyncio.gather(*(
+            live.query('stats.get', {'n': number, 'delay': 0.02 * number},
+                       query_id=7)
+            for number in range(10, 0, -1)
+        ))
+
+    responses = run(live, queries)
+
+    for number, response in zip(range(10, 0, -1), responses):
+        assert response.error.code == 0
+        assert response.result.params.n == number
+        assert response.id == 7
+
+
+def test_reply_timeout(live):
+    async def queries():
+        started = time.monotonic()
+        response = await live.query('never.reply')
+        elapsed = time.monotonic() - started
+        return response, elapsed, await live.query('stats.get')
+
+    response, elapsed, after = run(live, queries)
+
+    assert response.error.code == -1
+    assert 0.5 <= elapsed < 3
+    # The websocket still works for the other queries
+    assert after.error.code == 0
+    assert after.result.method == 'stats.get'
@@ -0,0 +1,89 @@
+import json
+import os
+import socketserver
+import tempfile
+import threading
+import time
+
+from standin import NO_REPLY, answer, default_result, start_unix_server
+from unrealircd_rpc_py.ConnectionFactory import ConnectionFactory
+
+
+def persistent_connection(result_fn, **params):
+    server, path = start_unix_server(result_fn)
+    conn = ConnectionFactory(50).get('unixsocket')
+    conn.setup({'path_to_socket_file': path, 'persistent': True, **params})
+    return server, conn
+
+
+def test_concurrent_queries_get_their_own_reply():
+    server, conn = persistent_connection(default_result, pool_size=2)
+    results = {}
+
+    def run(number):
+        # Every caller uses the same id
+        results[number] = conn.query('stats.get', {'n': number}, 7)
+
+    threads = [threading.Thread(target=run, args=(number,))
+               for number in range(32)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+
+    assert len(results) == 32
+    for number, response in results.items():
+        assert response['result']['params'] == {'n': number}
+        assert response['id'] == 7
+
+    conn.close()
+    server.shutdown()
+
+
+def test_reply_timeout():
+    def result(method, params):
+        return NO_REPLY if method == 'stats.get' else default_result(
+            method, params)
+
+    server, conn = persistent_connection(result, timeout=0.3)
+
+    started = time.monotonic()
+    assert conn.query('stats.get') is None
+    assert time.monotonic() - started < 3
+
+    # The connection still works for the other queries
+    assert conn.query('server.get')['result']['server']['id'] == '001'
+
+    conn.close()
+    server.shutdown()
+
+
+def test_reply_received_slowly_is_not_a_timeout():
+    class TrickleHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for line in self.rfile:
+                reply = json.dumps(answer(json.loads(line))).encode()
+                # The reply takes longer than the timeout, but something
+                # is received every 0.2s
+                for start in range(0, len(reply), 20):
+                    self.wfile.write(reply[start:start + 20])
+                    self.wfile.flush()
+                    time.sleep(0.2 if start < 120 else 0)
+                self.wfile.write(b'\n')
+
+    path = os.path.join(tempfile.mkdtemp(), 'rpc.socket')
+    server = socketserver.ThreadingUnixStreamServer(path, TrickleHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    conn = ConnectionFactory(50).get('unixsocket')
+    conn.setup({'path_to_socket_file': path, 'persistent': True,
+                'timeout': 0.5})
+
+    started = time.monotonic()
+    response = conn.query('user.list', {'object_detail_level': 2})
+    assert time.monotonic() - started > 0.5
+    assert response['result']['params'] == {'object_detail_level': 2}
+
+    conn.close()
+    server.shutdown()
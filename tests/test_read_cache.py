@@ -0,0 +1,38 @@
+from conftest import CountingResults, connection
+
+BAN = {'query_type': 'gline', 'name': '*@192.168.1.10', 'reason': 'Flood',
+       'expire_at': None, 'duration_sting': '1d', 'set_by': 'admin'}
+
+
+def test_read_cache_dropped_by_writes():
+    results = CountingResults()
+    server, conn = connection(results, read_cache_ttl=60)
+
+    conn.User.get('adator')
+    conn.User.get('adator')
+    assert results.calls['user.get'] == 1
+
+    conn.User.set_nick('adator', 'adator_')
+    conn.User.get('adator')
+    assert results.calls['user.get'] == 2
+
+    server.shutdown()
+
+
+def test_read_cache_dropped_by_batch_writes():
+    results = CountingResults()
+    server, conn = connection(results, read_cache_ttl=60)
+
+    conn.Stats.get()
+    conn.Stats.get()
+    assert results.calls['stats.get'] == 1
+
+    assert conn.Server_ban.add_many([BAN])[0].error.code == 0
+    conn.Stats.get()
+    assert results.calls['stats.get'] == 2
+
+    assert conn.Server_ban.del_many([BAN])[0].error.code == 0
+    conn.Stats.get()
+    assert results.calls['stats.get'] == 3
+
+    server.shutdown()
@@ -0,0 +1,38 @@
+import time
+
+from conftest import CountingResults, connection
+from unrealircd_rpc_py.utils.snapshot_cache import SnapshotCache
+
+
+def test_snapshots_not_kept_with_ttl_0():
+    results = CountingResults()
+    server, conn = connection(results)
+
+    for level in (0, 2, 4):
+        conn.User.list_(level)
+
+    assert results.calls['user.list'] == 3
+    assert conn.Snapshots.stats()['size'] == 0
+    # The last listing is still given by DB_USER
+    assert [user.name for user in conn.User.DB_USER] == ['adator']
+
+    server.shutdown()
+
+
+def test_snapshot_refresh_updates_latest():
+    cache = SnapshotCache(ttl=0.05, stale_ttl=10)
+    loads = []
+
+    def loader():
+        loads.append(len(loads) + 1)
+        return [loads[-1]]
+
+    assert cache.get(('user.list', 2), loader) == [1]
+    time.sleep(0.1)
+    # Stale: the old listing is returned and refreshed in the background
+    assert cache.get(('user.list', 2), loader) == [1]
+
+    deadline = time.monotonic() + 5
+    while cache.stats()['refreshes'] == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert cache.latest('user.list') == [2]
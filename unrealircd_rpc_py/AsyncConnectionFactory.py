@@ -0,0 +1,31 @@
+"""
+Docstring for unrealircd_rpc_py.AsyncConnectionFactory
+"""
+from unrealircd_rpc_py.exceptions.rpc_exceptions import RpcProtocolError
+from unrealircd_rpc_py.connections.aio.async_unixsocket import (
+    AsyncUnixSocketConnection
+)
+from unrealircd_rpc_py.connections.aio.async_http import AsyncHttpConnection
+from unrealircd_rpc_py.connections.aio.IAsyncConnection import (
+    IAsyncConnection
+)
+from typing import Literal
+
+
+class AsyncConnectionFactory:
+
+    def __init__(self, debug_level: int = 20):
+        self.debug_level = debug_level
+
+    def get(self, connection: Literal['unixsocket', 'http']
+            ) -> IAsyncConnection:
+        match connection:
+            case 'unixsocket':
+                return AsyncUnixSocketConnection(self.debug_level)
+            case 'http':
+                return AsyncHttpConnection(self.debug_level)
+            case _:
+                raise RpcProtocolError(
+                    f'({connection}) is an invalid method! choose http '
+                    f'or unixsocket instead!'
+                )
@@ -2,3 +2,4 @@
 # from .Loader import Loader
 from .ConnectionFactory import ConnectionFactory  # noqa: F401
 from .LiveConnectionFactory import LiveConnectionFactory  # noqa: F401
+from .AsyncConnectionFactory import AsyncConnectionFactory  # noqa: F401
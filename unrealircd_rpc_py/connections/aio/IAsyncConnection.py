@@ -0,0 +1,199 @@
+from logging import Logger
+from typing import Optional
+from abc import ABC, abstractmethod
+from unrealircd_rpc_py.connections.aio.async_module import AsyncModule
+from unrealircd_rpc_py.exceptions.rpc_exceptions import RpcConnectionError
+from unrealircd_rpc_py.objects.Channel import Channel
+from unrealircd_rpc_py.objects.Log import Log
+from unrealircd_rpc_py.objects.Name_ban import NameBan
+from unrealircd_rpc_py.objects.Rpc import Rpc
+from unrealircd_rpc_py.objects.Server import Server
+from unrealircd_rpc_py.objects.Server_ban import ServerBan
+from unrealircd_rpc_py.objects.Server_ban_exeption import ServerBanException
+from unrealircd_rpc_py.objects.Spamfilter import Spamfilter
+from unrealircd_rpc_py.objects.Stats import Stats
+from unrealircd_rpc_py.objects.User import User
+from unrealircd_rpc_py.objects.Whowas import Whowas
+from unrealircd_rpc_py.objects.Message import Message
+from unrealircd_rpc_py.objects.Connthrottle import ConnThrottle
+from unrealircd_rpc_py.objects.Security_group import SecurityGroup
+
+
+class IAsyncConnection(ABC):
+    """Connection running on asyncio.
+
+    The object modules are the same as the sync connections, but all
+    their methods must be awaited:
+
+    ```python
+        client = await conn.User.get('adator')
+    ```
+    """
+
+    @abstractmethod
+    def __init__(self):
+        super().__init__()
+        self.Logs: Optional[Logger] = None
+        self.unrealircd_version: Optional[tuple] = None
+        self.is_setup: bool = False
+
+        # Create Stats Instance
+        self.Stats: AsyncModule = AsyncModule(self, Stats)
+        """The Stats module instance"""
+
+        # Create Rpc Instance
+        self.Rpc: AsyncModule = AsyncModule(self, Rpc)
+        """The Rpc module instance"""
+
+        # Create Whowas Instance
+        self.Whowas: AsyncModule = AsyncModule(self, Whowas)
+        """The Whowas module instance"""
+
+        # Create Server_ban_exception Instance
+        self.Server_ban_exception: AsyncModule = AsyncModule(
+            self, ServerBanException
+        )
+        """The ServerBanException module instance"""
+
+        # Create Server_ban Instance
+        self.Server_ban: AsyncModule = AsyncModule(self, ServerBan)
+        """The ServerBan module instance"""
+
+        # Create Server Instance
+        self.Server: AsyncModule = AsyncModule(self, Server)
+        """The Server module instance"""
+
+        # Create User Instance
+        self.User: AsyncModule = AsyncModule(self, User)
+        """The User module instance"""
+
+        # Create Name_ban Instance
+        self.Name_ban: AsyncModule = AsyncModule(self, NameBan)
+        """The Name_ban module instance"""
+
+        # Create Channel Instance
+        self.Channel: AsyncModule = AsyncModule(self, Channel)
+        """The Channel module instance"""
+
+        # Create Spamfilter Instance
+        self.Spamfilter: AsyncModule = AsyncModule(self, Spamfilter)
+        """The Spamfilter module instance"""
+
+        # Create Log Instance
+        self.Log: AsyncModule = AsyncModule(self, Log)
+        """Allow you to subscribe and unsubscribe to log events
+        (real-time streaming of JSON logs)
+        (Requires unrealIRCd 6.1.8 or higher)"""
+
+        # Create Message Instance
+        self.Message: AsyncModule = AsyncModule(self, Message)
+        """Allow you to send a messages to users.
+        (Require unrealIRCD 6.2.2 or higher)"""
+
+        # Create Connthrottle Instance
+        self.Connthrottle: AsyncModule = AsyncModule(self, ConnThrottle)
+        """Allow you to control the Connthrottle module.
+        (Require unrealIRCD 6.2.2 or higher)"""
+
+        # Create Security Group Instance
+        self.SecurityGroup: AsyncModule = AsyncModule(self, SecurityGroup)
+        """Allow you to control the security group module.
+        (Require unrealIRCD 6.2.2 or higher)"""
+
+    @abstractmethod
+    async def setup(self, params: dict) -> None:
+        """Setup the connection by providing credentials or
+        The path to the socket file. The params are the same as the sync
+        connections.
+
+        Exemple Method WebSocket (http):
+        ```python
+            await conn.setup({
+                'url': 'https://your.rpc.link:PORT/api',
+                'username': 'Your-rpc-username',
+                'password': 'Your-rpc-password'
+            })
+        ```
+
+        Optional keys for the http method:
+            pool_size (int): Maximum number of connections open at the
+                same time. Defaults to 10.
+
+        Exemple Method UnixSocket (unixsocket):
+        ```python
+            await conn.setup({
+                'path_to_socket_file': '/path/to/unrealircd/data/rpc.socket'
+            })
+        ```
+
+        Args:
+            params (dict): The params
+
+        Raises:
+            RpcConnectionError: RCP Connection Error related to credentials.
+            RpcSetupError: When Connect method is called before setup method.
+            RpcInvalidUrlFormat: When the url format is not valid.
+        """
+        raise NotImplementedError()
+
+    async def connect(self) -> None:
+        """Get the version of the server"""
+        if not self.is_setup:
+            self.Logs.critical('You must call "setup" method before anything.')
+            raise RpcConnectionError('The "setup" method must be executed '
+                                     'before "connect" method.',
+                                     -1)
+
+        _server = await self.Server.get()
+        _version = _server.server.features.software
+        try:
+            # UnrealIRCd-6.2.1
+            _version = _version.split('-')[1].split('.')
+            self.unrealircd_version = tuple(map(lambda x: int(x), _version))
+        except (KeyError, IndexError, AttributeError, ValueError):
+            self.Logs.warning('Impossible to define the server version!')
+
+    @abstractmethod
+    async def query(self,
+                    method: str,
+                    param: Optional[dict] = None,
+                    query_id: int = 123,
+                    jsonrpc: str = '2.0'
+                    ) -> Optional[dict]:
+        """This method will use to run the queries
+
+        Args:
+            method (str): The method to send to unrealircd
+            param (dict, optional): the paramaters to send to unrealircd.
+                Defaults to None.
+            query_id (int, optional): id of the request. Defaults to 123.
+            jsonrpc (str, optional): jsonrpc. Defaults to '2.0'.
+
+        Returns:
+            dict: The response from the server
+            None: no response from the server
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def query_batch(self,
+                          queries: list[tuple[str, Optional[dict]]],
+                          jsonrpc: str = '2.0'
+                          ) -> list[dict]:
+        """Send many queries to the server in one JSON-RPC batch request.
+        The responses are matched to the queries using their ids.
+
+        Args:
+            queries (list[tuple[str, Optional[dict]]]): The queries to
+                send as (method, param) tuples
+            jsonrpc (str, optional): jsonrpc. Defaults to '2.0'.
+
+        Returns:
+            list[dict]: One response per query, in the order of the queries
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def close(self) -> None:
+        """Close the connections to the server"""
+        raise NotImplementedError()
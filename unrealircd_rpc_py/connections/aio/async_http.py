@@ -0,0 +1,178 @@
+import asyncio
+import logging
+from itertools import count
+from typing import Any, Literal, Optional
+import unrealircd_rpc_py.objects.Definition as Dfn
+import unrealircd_rpc_py.utils.utils as utils
+from unrealircd_rpc_py.utils import json_codec
+from unrealircd_rpc_py.connections.aio.IAsyncConnection import (
+    IAsyncConnection
+)
+from unrealircd_rpc_py.connections.aio.http_client import AsyncHttpClient
+from unrealircd_rpc_py.exceptions.rpc_exceptions import (
+    RpcConnectionError, RpcSetupError, RpcInvalidUrlFormat
+)
+
+
+class AsyncHttpConnection(IAsyncConnection):
+    """HTTP connection running on asyncio streams.
+
+    The connections to the server are kept alive and shared by all the
+    coroutines, up to `pool_size` requests are sent at the same time.
+    """
+
+    def __init__(self,
+                 debug_level: Literal[10, 20, 30, 40, 50] = 20) -> None:
+        super().__init__()
+        self.debug_level = debug_level
+        self.Logs: logging.Logger = utils.start_log_system(
+            name='unrealircd-rpc-py', debug_level=debug_level
+        )
+        self.url: Optional[str] = None
+        self.username: Optional[str] = None
+        self.password: Optional[str] = None
+        self.pool_size: int = 10
+        self.timeout: float = 10
+
+        self.__ids = count(utils.generate_query_id())
+        self.__client: Optional[AsyncHttpClient] = None
+
+    async def setup(self, params: dict) -> None:
+        self.url = params.get('url', None)
+        self.username = params.get('username', None)
+        self.password = params.get('password', None)
+        self.pool_size = params.get('pool_size', 10)
+        self.timeout = params.get('timeout', 10)
+        self.is_setup = True
+
+        if utils.check_url(self.url) is None:
+            self.Logs.critical(
+                'You must provide the url in this format:'
+                'https://your.rpcjson.link:port/api'
+            )
+            raise RpcInvalidUrlFormat(
+                'You must provide the url in this format: '
+                'https://your.rpcjson.link:port/api'
+            )
+
+        self.__client = AsyncHttpClient(
+            self.url, self.username, self.password,
+            self.pool_size, self.timeout
+        )
+
+        try:
+            response = await self.__client.get()
+        except (OSError, asyncio.TimeoutError) as err:
+            self.Logs.error(f"Connexion failed to the server: {err}")
+            raise RpcConnectionError(f"Connexion failed to the server: {err}")
+
+        if response.status_code >= 300:
+            self.Logs.error(
+                f"Connexion failed to the server: {response.text.strip()} "
+                f"({response.status_code})"
+            )
+            raise RpcConnectionError(
+                f"{response.text.strip()} ({response.status_code})"
+            )
+
+        await self.connect()
+
+    async def query(self,
+                    method: str,
+                    param: Optional[dict] = None,
+                    query_id: int = 123,
+                    jsonrpc: str = '2.0'
+                    ) -> Optional[dict]:
+        version_error = utils.check_method_version(
+            method, self.unrealircd_version, query_id, jsonrpc
+        )
+        if version_error is not None:
+            return version_error
+
+        get_id = next(self.__ids) if query_id == 123 else query_id
+
+        request = {
+            "jsonrpc": jsonrpc,
+            "method": method,
+            "params": {} if param is None else param,
+            "id": get_id
+        }
+
+        response = await self.send_to_method(json_codec.dumps(request))
+
+        if not isinstance(response, dict):
+            self.Logs.error(f"Impossible to load response: {response}")
+            return None
+
+        return response
+
+    async def query_batch(self,
+                          queries: list[tuple[str, Optional[dict]]],
+                          jsonrpc: str = '2.0'
+                          ) -> list[dict]:
+        batch: list[dict] = []
+        responses: list[Optional[dict]] = []
+
+        for method, param in queries:
+            get_id = next(self.__ids)
+            version_error = utils.check_method_version(
+                method, self.unrealircd_version, get_id, jsonrpc
+            )
+            responses.append(version_error)
+            if version_error is None:
+                batch.append({
+                    "jsonrpc": jsonrpc,
+                    "method": method,
+                    "params": {} if param is None else param,
+                    "id": get_id
+                })
+
+        if not batch:
+            return responses
+
+        decoded = await self.send_to_method(json_codec.dumps(batch))
+        matched = iter(utils.match_batch_responses(batch, decoded))
+
+        return [next(matched) if r is None else r for r in responses]
+
+    async def send_to_method(self, request: str) -> Optional[Any]:
+        """Post the request and decode the reply
+
+        Returns:
+            Any: The decoded reply, None if no reply
+        """
+        if not self.is_setup or self.__client is None:
+            self.Logs.critical('You must call "setup" method before anything.')
+            raise RpcSetupError(
+                'You must call "setup" method before anything.'
+            )
+
+        try:
+            response = await self.__client.post(request.encode())
+
+            if response.status_code != 200:
+                self.Logs.error(
+                    f"Status code {response.status_code} | {response.reason}"
+                )
+                return Dfn.RPCResult(
+                    error=Dfn.RPCErrorModel(
+                        response.status_code, f"{response.text}"
+                    )
+                ).to_dict()
+
+            return json_codec.loads(response.content)
+
+        except asyncio.TimeoutError:
+            self.Logs.error(f"Timeout after {self.timeout}s")
+            self.Logs.error(f"Initial request: {request}")
+        except (OSError, asyncio.IncompleteReadError) as ce:
+            self.Logs.error(f"Connection Error : {ce}")
+            self.Logs.error(f"Initial request: {request}")
+        except json_codec.JSONDecodeError as jsonerror:
+            self.Logs.error(f"jsonError {jsonerror}")
+            self.Logs.error(f"Initial request: {request}")
+
+    async def close(self) -> None:
+        """Close the kept-alive connections"""
+        if self.__client is not None:
+            await self.__client.close()
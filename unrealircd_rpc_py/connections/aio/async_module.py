@@ -0,0 +1,161 @@
+"""
+Awaitable versions of the object modules (User, Channel, Server_ban...).
+
+The object modules build the request, call the connection once and parse
+the response, all synchronously. To avoid writing every module twice,
+an AsyncModule runs the method of the sync module with a
+RecordingConnection: the first run stops at the query and gives back
+what must be sent, the query is awaited on the async connection, then
+the method is run again and gets the response from the recorder.
+
+The list queries streamed on a sync connection (query_stream, used by
+list_columns) are sent as plain queries, the recorder iterates over the
+list of the whole response.
+"""
+from functools import update_wrapper
+from inspect import isgeneratorfunction
+from typing import TYPE_CHECKING, Any, Callable, Iterator, Optional
+from unrealircd_rpc_py.utils.snapshot_cache import SnapshotCache
+
+if TYPE_CHECKING:
+    from unrealircd_rpc_py.connections.aio.IAsyncConnection import (
+        IAsyncConnection
+    )
+
+
+class QueryPending(BaseException):
+    """Raised by the RecordingConnection to stop the sync method at its
+    query. It derives from BaseException so the broad
+    `except Exception` of the modules let it go through."""
+
+    def __init__(self, method_name: str, args: tuple, kwargs: dict) -> None:
+        super().__init__(method_name)
+        self.method_name = method_name
+        self.args = args
+        self.kwargs = kwargs
+
+    async def send(self, connection: 'IAsyncConnection') -> Any:
+        """Run the recorded query on the async connection"""
+        return await getattr(connection, self.method_name)(
+            *self.args, **self.kwargs
+        )
+
+
+class RecordedStream:
+    """The JsonListStream of a response already received"""
+
+    def __init__(self, response: Optional[dict],
+                 path: tuple[str, ...] = ('result', 'list')) -> None:
+        self.path = path
+        self.response: dict[str, Any] = response if isinstance(
+            response, dict) else {
+            'error': {'code': -1, 'message': 'No response from the server'}
+        }
+
+    @property
+    def error(self) -> Optional[dict]:
+        return self.response.get('error', None)
+
+    def __iter__(self) -> Iterator[Any]:
+        value: Any = self.response
+        for key in self.path:
+            value = value.get(key) if isinstance(value, dict) else None
+        yield from value if isinstance(value, list) else ()
+
+
+class RecordingConnection:
+    """Connection given to the sync modules by AsyncModule.
+
+    It answers the queries with the responses already received, in order,
+    and raises QueryPending for the next one. Everything else is read from
+    the async connection (Logs, unrealircd_version...).
+    """
+
+    def __init__(self, connection: 'IAsyncConnection') -> None:
+        self.connection = connection
+        self.responses: list[Any] = []
+        self.__position = 0
+
+        # The sync modules query through it, nothing is kept (ttl=0)
+        self.Snapshots = SnapshotCache()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.connection, name)
+
+    def rewind(self) -> None:
+        self.__position = 0
+
+    def query(self, *args, **kwargs) -> Optional[dict]:
+        return self.__answer('query', args, kwargs)
+
+    def query_cached(self, *args, **kwargs) -> Optional[dict]:
+        # The responses are not cached on the async connections
+        return self.__answer('query', args, kwargs)
+
+    def query_write(self, *args, **kwargs) -> Optional[dict]:
+        return self.__answer('query', args, kwargs)
+
+    def query_batch(self, *args, **kwargs) -> list[dict]:
+        return self.__answer('query_batch', args, kwargs)
+
+    def query_batch_write(self, *args, **kwargs) -> list[dict]:
+        return self.__answer('query_batch', args, kwargs)
+
+    def query_stream(self, method: str, param: Optional[dict] = None,
+                     jsonrpc: str = '2.0') -> RecordedStream:
+        # The whole response is received by the async connection
+        return RecordedStream(self.__answer(
+            'query', (method, param), {'jsonrpc': jsonrpc}
+        ))
+
+    def __answer(self, method_name: str, args: tuple, kwargs: dict) -> Any:
+        if self.__position < len(self.responses):
+            self.__position += 1
+            return self.responses[self.__position - 1]
+
+        raise QueryPending(method_name, args, kwargs)
+
+
+class AsyncModule:
+    """Expose the methods of a sync object module as coroutines
+
+    ```python
+        client = await conn.User.get('adator')
+    ```
+    """
+
+    def __init__(self, connection: 'IAsyncConnection',
+                 module_class: type) -> None:
+        self.Connection = connection
+        self.module_class = module_class
+
+    def __getattr__(self, name: str) -> Callable:
+        attribute = getattr(self.module_class, name)
+
+        # The iterators (iter_) stream the response on a sync connection
+        if (name.startswith('_') or not callable(attribute)
+                or isgeneratorfunction(attribute)):
+            raise AttributeError(
+                f"'{self.module_class.__name__}' has no awaitable "
+                f"method '{name}'"
+            )
+
+        async def method(*args, **kwargs) -> Any:
+            recorder = RecordingConnection(self.Connection)
+            module = self.module_class(recorder)
+
+            while True:
+                try:
+                    return getattr(module, name)(*args, **kwargs)
+                except QueryPending as pending:
+                    recorder.responses.append(
+                        await pending.send(self.Connection)
+                    )
+                    recorder.rewind()
+
+        update_wrapper(method, attribute)
+
+        # Cache the coroutine function for the next calls
+        setattr(self, name, method)
+
+        return method
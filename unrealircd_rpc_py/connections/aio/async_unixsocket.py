@@ -0,0 +1,222 @@
+import asyncio
+import logging
+from itertools import count
+from typing import Any, Literal, Optional
+import unrealircd_rpc_py.utils.utils as utils
+from unrealircd_rpc_py.utils import json_codec
+from unrealircd_rpc_py.connections.aio.IAsyncConnection import (
+    IAsyncConnection
+)
+from unrealircd_rpc_py.exceptions.rpc_exceptions import (
+    RpcConnectionError, RpcSetupError
+)
+
+STREAM_LIMIT = 1 << 30
+"""Biggest reply line accepted from the server"""
+
+
+class AsyncUnixSocketConnection(IAsyncConnection):
+    """Unix socket connection running on asyncio streams.
+
+    One socket is kept open and all the requests are written on it
+    without waiting for the previous replies. A reader task gives each
+    reply to the waiting caller using the JSON-RPC id.
+    """
+
+    def __init__(self,
+                 debug_level: Literal[10, 20, 30, 40, 50] = 20) -> None:
+        super().__init__()
+        self.debug_level = debug_level
+        self.Logs: logging.Logger = utils.start_log_system(
+            name='unrealircd-rpc-py', debug_level=debug_level
+        )
+        self.path_to_socket_file: Optional[str] = None
+        self.timeout: float = 10
+
+        self.__ids = count(1)
+        self.__pending: dict[int, asyncio.Future] = {}
+        self.__writer: Optional[asyncio.StreamWriter] = None
+        self.__reader_task: Optional[asyncio.Task] = None
+        self.__connect_lock: Optional[asyncio.Lock] = None
+
+    async def setup(self, params: dict) -> None:
+        self.path_to_socket_file = params.get('path_to_socket_file', None)
+        self.timeout = params.get('timeout', 10)
+        self.is_setup = True
+
+        if not utils.check_unix_socket_file(self.path_to_socket_file):
+            error_msg = ('The Path to your socket file is empty or wrong? '
+                         'please be sure that you are providing the correct '
+                         'socket path')
+            self.Logs.error(error_msg)
+            raise RpcConnectionError(error_msg)
+
+        await self.connect()
+
+    async def query(self,
+                    method: str,
+                    param: Optional[dict] = None,
+                    query_id: int = 123,
+                    jsonrpc: str = '2.0'
+                    ) -> Optional[dict]:
+        version_error = utils.check_method_version(
+            method, self.unrealircd_version, query_id, jsonrpc
+        )
+        if version_error is not None:
+            return version_error
+
+        get_id = next(self.__ids) if query_id == 123 else query_id
+
+        request = {
+            "jsonrpc": jsonrpc,
+            "method": method,
+            "params": {} if param is None else param,
+            "id": get_id
+        }
+
+        response = await self.send_to_method(
+            json_codec.dumps(request), [get_id]
+        )
+
+        if not isinstance(response, dict):
+            self.Logs.error(f"Impossible to load response: {response}")
+            return None
+
+        return response
+
+    async def query_batch(self,
+                          queries: list[tuple[str, Optional[dict]]],
+                          jsonrpc: str = '2.0'
+                          ) -> list[dict]:
+        batch: list[dict] = []
+        responses: list[Optional[dict]] = []
+
+        for method, param in queries:
+            get_id = next(self.__ids)
+            version_error = utils.check_method_version(
+                method, self.unrealircd_version, get_id, jsonrpc
+            )
+            responses.append(version_error)
+            if version_error is None:
+                batch.append({
+                    "jsonrpc": jsonrpc,
+                    "method": method,
+                    "params": {} if param is None else param,
+                    "id": get_id
+                })
+
+        if not batch:
+            return responses
+
+        decoded = await self.send_to_method(
+            json_codec.dumps(batch), [request['id'] for request in batch]
+        )
+        matched = iter(utils.match_batch_responses(batch, decoded))
+
+        return [next(matched) if r is None else r for r in responses]
+
+    async def send_to_method(self, request: str,
+                             ids: list[int]) -> Optional[Any]:
+        """Write the request and wait for its reply
+
+        Args:
+            request (str): The JSON request (single or batch)
+            ids (list[int]): The ids of the request. For a batch, the reply
+                is matched using any of the ids.
+
+        Returns:
+            Any: The decoded reply, None if no reply
+        """
+        if not self.is_setup:
+            self.Logs.critical('You must call "setup" method before anything.')
+            raise RpcSetupError(
+                'You must call "setup" method before anything.'
+            )
+
+        waiter = asyncio.get_running_loop().create_future()
+        for query_id in ids:
+            self.__pending[query_id] = waiter
+
+        try:
+            writer = await self.__get_writer()
+            writer.write(f'{request}\r\n'.encode())
+            await writer.drain()
+
+            return await asyncio.wait_for(waiter, self.timeout)
+
+        except asyncio.TimeoutError:
+            self.Logs.critical(
+                f'No reply from the server after {self.timeout}s'
+            )
+        except OSError as oserr:
+            self.Logs.critical(f'System Error: {oserr}')
+        finally:
+            for query_id in ids:
+                self.__pending.pop(query_id, None)
+
+    async def close(self) -> None:
+        """Close the socket, the waiting callers get None"""
+        writer, self.__writer = self.__writer, None
+        if writer is not None:
+            writer.close()
+        if self.__reader_task is not None:
+            await self.__reader_task
+            self.__reader_task = None
+
+    async def __get_writer(self) -> asyncio.StreamWriter:
+        """Open the socket on first use, or after it has been closed"""
+        if self.__connect_lock is None:
+            self.__connect_lock = asyncio.Lock()
+
+        async with self.__connect_lock:
+            if self.__writer is None or self.__writer.is_closing():
+                reader, self.__writer = await asyncio.open_unix_connection(
+                    self.path_to_socket_file, limit=STREAM_LIMIT
+                )
+                self.__reader_task = asyncio.create_task(
+                    self.__read_loop(reader, self.__writer)
+                )
+
+        return self.__writer
+
+    async def __read_loop(self, reader: asyncio.StreamReader,
+                          writer: asyncio.StreamWriter) -> None:
+        """Route every reply line to the caller waiting for its id"""
+        try:
+            while line := await reader.readline():
+                if not line.strip():
+                    continue
+
+                try:
+                    response = json_codec.loads(line)
+                except json_codec.JSONDecodeError as jsonerror:
+                    self.Logs.error(f'Impossible to load response: '
+                                    f'{jsonerror}')
+                    continue
+
+                self.__dispatch(response)
+
+        except (OSError, ValueError) as err:
+            if self.__writer is writer:
+                self.Logs.error(f'UnixSocket closed: {err}')
+
+        finally:
+            if self.__writer is writer:
+                self.__writer = None
+            writer.close()
+            for waiter in self.__pending.values():
+                if not waiter.done():
+                    waiter.set_result(None)
+
+    def __dispatch(self, response: Any) -> None:
+        replies = response if isinstance(response, list) else [response]
+
+        for reply in replies:
+            if not isinstance(reply, dict):
+                continue
+            waiter = self.__pending.get(reply.get('id'))
+            if waiter is not None and not waiter.done():
+                waiter.set_result(response)
+                return
+
+        self.Logs.warning('Reply received without waiting caller')
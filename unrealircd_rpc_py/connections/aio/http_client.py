@@ -0,0 +1,178 @@
+import asyncio
+import ssl
+from base64 import b64encode
+from typing import Optional
+from urllib.parse import urlsplit
+
+
+class HttpResponse:
+    """The status and the body of an HTTP response"""
+
+    __slots__ = ('status_code', 'reason', 'content')
+
+    def __init__(self, status_code: int, reason: str, content: bytes) -> None:
+        self.status_code = status_code
+        self.reason = reason
+        self.content = content
+
+    @property
+    def text(self) -> str:
+        return self.content.decode('utf-8', errors='replace')
+
+
+class _RequestNotSent(ConnectionError):
+    """The request could not be written, the server did not get it"""
+
+
+class AsyncHttpClient:
+    """Minimal HTTP/1.1 client running on asyncio streams.
+
+    Only what the JSON-RPC API needs is supported: GET and POST with
+    basic authentication, bodies sent with Content-Length and replies
+    using Content-Length or chunked transfer encoding.
+
+    The connections are kept alive and reused. At most `pool_size`
+    requests run at the same time, the other ones wait for a free
+    connection.
+    """
+
+    def __init__(self, url: str, username: Optional[str],
+                 password: Optional[str], pool_size: int = 10,
+                 timeout: float = 10) -> None:
+        parts = urlsplit(url)
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == 'https' else 80)
+        self.path = parts.path or '/'
+        self.timeout = timeout
+
+        self.__ssl: Optional[ssl.SSLContext] = None
+        if parts.scheme == 'https':
+            self.__ssl = ssl.create_default_context()
+            self.__ssl.check_hostname = False
+            self.__ssl.verify_mode = ssl.CERT_NONE
+
+        credentials = b64encode(f'{username}:{password}'.encode()).decode()
+        self.__headers = (
+            f'Host: {self.host}:{self.port}\r\n'
+            f'Authorization: Basic {credentials}\r\n'
+            'Content-Type: application/json\r\n'
+            'Connection: keep-alive\r\n'
+        )
+
+        self.__slots = asyncio.Semaphore(pool_size)
+        self.__idle: list[tuple[asyncio.StreamReader,
+                                asyncio.StreamWriter]] = []
+
+    async def get(self) -> HttpResponse:
+        return await self.request('GET')
+
+    async def post(self, body: bytes) -> HttpResponse:
+        return await self.request('POST', body)
+
+    async def request(self, method: str, body: bytes = b'') -> HttpResponse:
+        """Send the request on a kept-alive connection, or on a new one
+
+        Raises:
+            OSError: The connection failed
+            asyncio.TimeoutError: No reply after `timeout` seconds
+        """
+        async with self.__slots:
+            head = (
+                f'{method} {self.path} HTTP/1.1\r\n{self.__headers}'
+                f'Content-Length: {len(body)}\r\n\r\n'
+            ).encode()
+
+            # A kept-alive connection may have been closed by the server
+            # meanwhile. The request is sent again on another connection
+            # only if the server could not get it: nothing was written, or
+            # a GET. The JSON-RPC writes (kill, set_nick...) must not run
+            # twice.
+            while self.__idle:
+                stream = self.__idle.pop()
+                try:
+                    return await asyncio.wait_for(
+                        self.__exchange(stream, head + body), self.timeout
+                    )
+                except BaseException as err:
+                    stream[1].close()
+                    if not self.__can_retry(method, err):
+                        raise
+
+            stream = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port, ssl=self.__ssl),
+                self.timeout
+            )
+            try:
+                return await asyncio.wait_for(
+                    self.__exchange(stream, head + body), self.timeout
+                )
+            except BaseException:
+                stream[1].close()
+                raise
+
+    @staticmethod
+    def __can_retry(method: str, err: BaseException) -> bool:
+        if isinstance(err, _RequestNotSent):
+            return True
+        # A timeout is not retried, the server is slow, not gone
+        if method != 'GET' or isinstance(err, asyncio.TimeoutError):
+            return False
+        return isinstance(err, (OSError, asyncio.IncompleteReadError))
+
+    async def close(self) -> None:
+        """Close the kept-alive connections"""
+        idle, self.__idle = self.__idle, []
+        for _, writer in idle:
+            writer.close()
+
+    async def __exchange(self, stream: tuple[asyncio.StreamReader,
+                                             asyncio.StreamWriter],
+                         data: bytes) -> HttpResponse:
+        reader, writer = stream
+        if reader.at_eof() or writer.is_closing():
+            # Closed by the server while it was idle
+            raise _RequestNotSent('Connection closed')
+
+        try:
+            writer.write(data)
+            await writer.drain()
+        except OSError as err:
+            raise _RequestNotSent(str(err)) from err
+
+        status_line = await reader.readuntil(b'\r\n')
+        _, status_code, *reason = status_line.decode().split(' ', 2)
+
+        headers: dict[str, str] = {}
+        while (line := await reader.readuntil(b'\r\n')) != b'\r\n':
+            name, _, value = line.decode().partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        keep_alive = headers.get('connection', '').lower() != 'close'
+
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            content = bytearray()
+            while True:
+                size_line = await reader.readuntil(b'\r\n')
+                size = int(size_line.split(b';')[0], 16)
+                if size == 0:
+                    break
+                content += await reader.readexactly(size)
+                await reader.readexactly(2)
+            # Trailer headers, if any
+            while await reader.readuntil(b'\r\n') != b'\r\n':
+                pass
+            content = bytes(content)
+        elif 'content-length' in headers:
+            content = await reader.readexactly(int(headers['content-length']))
+        else:
+            content = await reader.read()
+            keep_alive = False
+
+        if keep_alive:
+            self.__idle.append(stream)
+        else:
+            writer.close()
+
+        return HttpResponse(
+            int(status_code), reason[0].strip() if reason else '', content
+        )
@@ -1,7 +1,11 @@
+import asyncio
 from logging import Logger
-from typing import Optional
+from typing import AsyncIterator, Optional
 from abc import ABC, abstractmethod
 import unrealircd_rpc_py.objects.Definition as Dfn
+from unrealircd_rpc_py.connections.live.event_queue import (
+    EventQueue, OverflowPolicy
+)
 
 
 class ILiveConnection(ABC):
@@ -10,6 +14,7 @@ class ILiveConnection(ABC):
     def __init__(self):
         super().__init__()
         self.Logs: Logger
+        self.Queue: Optional[EventQueue]
 
     @abstractmethod
     def setup(self, params: dict) -> None:
@@ -35,6 +40,38 @@ class ILiveConnection(ABC):
                 'callback_method_or_function_name': 'callback_method_name'
             }
         ```
+
+        Optional keys for both methods:
+            The callback keys, when the events are read with events().
+            read_cache (ReadCache): The read cache of a connection
+                (conn.ReadCache), its responses touched by the received
+                log events are dropped before the callback is called.
+            reconnect (bool): Subscribe again when the connection is lost,
+                with an exponential backoff, and backfill the missed events
+                from log.list (given with the method 'log.list').
+                Defaults to False.
+            reconnect_delay (float): First delay of the backoff (seconds).
+                Defaults to 1.
+            reconnect_max_delay (float): Longest delay of the backoff
+                (seconds). Defaults to 60.
+            callback_executor (str): Run a sync callback on a 'thread' or a
+                'process' pool instead of the event loop (self.Executor).
+            callback_workers (int): Workers of the pool, each one runs its
+                callbacks in order. Defaults to 4.
+            callback_order_key (str | Callable): The events of one key run
+                in order: 'nick', a field of the events or a function of
+                the event. Defaults to 'event_id'.
+            batch_size (int): Give the callback lists of up to batch_size
+                events (self.Batcher).
+            batch_max_wait_ms (float): Longest wait of the first event of a
+                batch (ms). Defaults to 50.
+            event_format (str): What the callback gets for each event:
+                'namespace' (LiveRPCResult), 'dict' (the decoded line) or
+                'raw' (RawLiveEvent, the line not decoded). The errors stay
+                LiveRPCResult. Defaults to 'namespace'.
+            timeout (float): Longest wait for the reply of a query on the
+                websocket (seconds). Defaults to 10.
+
         Args:
             params (dict): The params
 
@@ -62,6 +99,54 @@ class ILiveConnection(ABC):
         """Unsubscribe from the rpc server stream"""
         raise NotImplementedError()
 
+    async def events(self, sources: Optional[list] = None,
+                     max_size: int = 1024,
+                     overflow: OverflowPolicy = 'block'
+                     ) -> AsyncIterator[Dfn.LiveRPCResult]:
+        """Subscribe to the rpc server stream and iterate over its events,
+        in place of the callback. A reader task fills a bounded queue
+        (self.Queue, see its stats()); leaving the loop unsubscribes.
+
+        ```python
+            async for event in liverpc.events(['all'], 10000, 'drop_oldest'):
+                print(event.result.msg)
+        ```
+
+        Args:
+            sources (list, optional): The sources to subscribe.
+                Defaults to ["!debug","all"].
+            max_size (int, optional): Events queued at most.
+                Defaults to 1024.
+            overflow (str, optional): When the queue is full: 'block' the
+                reader, 'drop_oldest' or 'drop_newest' event.
+                Defaults to 'block'.
+
+        Yields:
+            LiveRPCResult: What the callback would get: the reply of the
+                subscription, the events and the errors
+        """
+        queue = self.Queue = EventQueue(max_size, overflow)
+        stream = asyncio.create_task(self.subscribe(sources))
+        stream.add_done_callback(lambda _: queue.close())
+
+        try:
+            async for event in queue:
+                yield event
+
+        finally:
+            # The reader must not stay blocked on the abandoned queue, it
+            # reads the reply of log.unsubscribe
+            self.Queue = None
+            queue.close()
+            if not stream.done():
+                await self.unsubscribe()
+                stream.cancel()
+            await asyncio.gather(stream, return_exceptions=True)
+
+    async def close(self) -> None:
+        """Close the connection kept open between the queries, if any"""
+        return None
+
     @abstractmethod
     async def send_to_method(self) -> Dfn.LiveRPCResult:
         """Send to the methode"""
@@ -0,0 +1,216 @@
+"""
+Runs a synchronous live callback on a thread pool or a process pool, so
+a slow callback (DB writes...) does not stop the event loop reading the
+stream.
+
+The events are spread over `workers` lanes by key (the nick, the event_id
+or any function of the event), each lane runs its callbacks one at a time
+in order: the events of one key keep their order, the keys run in
+parallel.
+
+```python
+    liverpc.setup({..., 'callback_executor': 'thread',
+                   'callback_workers': 8, 'callback_order_key': 'nick'})
+
+    liverpc.Executor.stats()
+    # {'calls': 1200, 'errors': 0, 'pending': 3, 'exec_avg_ms': 4.1, ...}
+```
+
+With 'process' the callback must be a module level function, the events
+are pickled to the workers.
+"""
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import (
+    Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+)
+from logging import Logger
+from typing import Any, Callable, Hashable, Literal, Optional, Union
+from unrealircd_rpc_py.connections.live.raw_event import event_dict
+from unrealircd_rpc_py.objects.Definition import LiveRPCResult
+
+ExecutorKind = Literal['thread', 'process']
+
+OrderKey = Union[str, Callable[[LiveRPCResult], Hashable]]
+
+MAX_PENDING = 1024
+"""Callbacks submitted and not done at most, the stream waits past it"""
+
+LATENCY_SAMPLES = 1024
+"""Last latencies kept for the percentiles"""
+
+
+def _timed(callback: Callable[[LiveRPCResult], Any],
+           event: LiveRPCResult) -> float:
+    """Run the callback in the worker, return its duration"""
+    start = time.perf_counter()
+    callback(event)
+    return time.perf_counter() - start
+
+
+def event_key(event: LiveRPCResult, order_key: OrderKey) -> Hashable:
+    """The ordering key of an event: 'nick' (the client of the event), or
+    a field of the event ('event_id', 'subsystem'...), or the result of a
+    function of the event. The batches of events (see EventBatcher) run
+    in order on one lane."""
+    if isinstance(event, list):
+        return None
+
+    if callable(order_key):
+        return order_key(event)
+
+    data = event_dict(event) or {}
+    if order_key == 'nick':
+        client = data.get('client')
+        return client.get('name') if isinstance(client, dict) else None
+    return data.get(order_key)
+
+
+def setup_executor(params: dict,
+                   callback: Optional[Callable[[LiveRPCResult], Any]],
+                   logs: Logger) -> Optional['CallbackExecutor']:
+    """The executor of the setup params callback_executor ('thread' or
+    'process'), callback_workers and callback_order_key. None if
+    callback_executor is not set or the callback is a coroutine function,
+    it runs on the event loop."""
+    kind = params.get('callback_executor', None)
+    if kind is None or callback is None:
+        return None
+
+    if asyncio.iscoroutinefunction(callback):
+        logs.warning('callback_executor ignored, the callback is async')
+        return None
+
+    return CallbackExecutor(
+        callback, kind,
+        workers=params.get('callback_workers', 4),
+        order_key=params.get('callback_order_key', 'event_id'),
+        logs=logs
+    )
+
+
+class CallbackExecutor:
+    """Runs a sync callback on a pool, in order per key"""
+
+    def __init__(self, callback: Callable[[LiveRPCResult], Any],
+                 kind: ExecutorKind = 'thread', workers: int = 4,
+                 order_key: OrderKey = 'event_id',
+                 max_pending: int = MAX_PENDING,
+                 logs: Optional[Logger] = None) -> None:
+        """
+        Args:
+            callback (Callable): The sync callback
+            kind (str, optional): 'thread' or 'process'.
+                Defaults to 'thread'.
+            workers (int, optional): Lanes, each one runs its callbacks in
+                order. Defaults to 4.
+            order_key (str | Callable, optional): 'nick', a field of the
+                events or a function of the event. Defaults to 'event_id'.
+            max_pending (int, optional): Callbacks not done at most before
+                submit waits. Defaults to MAX_PENDING.
+            logs (Logger, optional): Where the callback errors go.
+
+        Raises:
+            ValueError: Unknown kind
+        """
+        if kind not in ('thread', 'process'):
+            raise ValueError(f"Unknown callback executor: {kind} "
+                             f"('thread' or 'process')")
+
+        pool = ThreadPoolExecutor if kind == 'thread' else \
+            ProcessPoolExecutor
+        self.callback = callback
+        self.kind = kind
+        self.order_key = order_key
+        self.Logs = logs
+        self.__lanes: list[Executor] = [pool(max_workers=1)
+                                        for _ in range(max(1, workers))]
+        self.__max_pending = max_pending
+        self.__slots: Optional[asyncio.Semaphore] = None
+        self.__loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.__lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+        self.pending = 0
+        self.__exec_total = 0.0
+        self.__exec_max = 0.0
+        self.__latencies: deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self.__latency_max = 0.0
+
+    async def submit(self, event: LiveRPCResult) -> None:
+        """Queue the callback of an event on its lane, wait only when
+        max_pending callbacks are not done"""
+        loop = asyncio.get_running_loop()
+        if self.__loop is not loop:
+            self.__loop = loop
+            self.__slots = asyncio.Semaphore(self.__max_pending)
+
+        slots = self.__slots
+        await slots.acquire()
+
+        lane = self.__lanes[
+            hash(event_key(event, self.order_key)) % len(self.__lanes)
+        ]
+        with self.__lock:
+            self.pending += 1
+        submitted = time.perf_counter()
+
+        def done(future: Future) -> None:
+            self.__done(future, submitted)
+            try:
+                loop.call_soon_threadsafe(slots.release)
+            except RuntimeError:
+                # The event loop of the stream is closed
+                pass
+
+        lane.submit(_timed, self.callback, event).add_done_callback(done)
+
+    def stats(self) -> dict[str, Union[int, float]]:
+        """The counters and the durations (ms) of the callbacks: exec is
+        the run of the callback, latency adds the wait on its lane"""
+        with self.__lock:
+            done = self.calls - self.errors
+            latencies = sorted(self.__latencies)
+
+        def percentile(rank: float) -> float:
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1,
+                                 int(len(latencies) * rank))] * 1000
+
+        return {
+            'calls': self.calls,
+            'errors': self.errors,
+            'pending': self.pending,
+            'exec_avg_ms': self.__exec_total / done * 1000 if done else 0.0,
+            'exec_max_ms': self.__exec_max * 1000,
+            'latency_p50_ms': percentile(0.5),
+            'latency_p95_ms': percentile(0.95),
+            'latency_max_ms': self.__latency_max * 1000
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the workers, after the pending callbacks if wait"""
+        for lane in self.__lanes:
+            lane.shutdown(wait=wait)
+
+    def __done(self, future: Future, submitted: float) -> None:
+        latency = time.perf_counter() - submitted
+        error = future.exception()
+        with self.__lock:
+            self.calls += 1
+            self.pending -= 1
+            self.__latencies.append(latency)
+            self.__latency_max = max(self.__latency_max, latency)
+            if error is None:
+                duration = future.result()
+                self.__exec_total += duration
+                self.__exec_max = max(self.__exec_max, duration)
+            else:
+                self.errors += 1
+
+        if error is not None and self.Logs is not None:
+            self.Logs.error(f'Callback Error: {error}')
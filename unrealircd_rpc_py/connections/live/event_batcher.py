@@ -0,0 +1,114 @@
+"""
+Gives the live events to the callback by batches: a list of up to
+`max_size` events, or of the events received during `max_wait_ms` after
+the first one of the batch.
+
+```python
+    def callback(events: list[LiveRPCResult]) -> None:
+        db.bulk_insert([event.result.to_dict() for event in events])
+
+    liverpc.setup({..., 'batch_size': 500, 'batch_max_wait_ms': 100})
+```
+
+The errors and the closure of the stream (log.unsubscribe) flush the
+batch at once, they come last in it.
+"""
+import asyncio
+from logging import Logger
+from typing import Any, Callable, Optional
+from unrealircd_rpc_py.objects.Definition import LiveRPCResult
+
+BatchHandler = Callable[[list[LiveRPCResult]], Any]
+
+
+def setup_batcher(params: dict, handler: BatchHandler,
+                  logs: Optional[Logger] = None) -> Optional['EventBatcher']:
+    """The batcher of the setup params batch_size and batch_max_wait_ms,
+    None if batch_size is not set"""
+    max_size = params.get('batch_size', None)
+    if not max_size:
+        return None
+
+    return EventBatcher(handler, max_size,
+                        params.get('batch_max_wait_ms', 50), logs)
+
+
+class EventBatcher:
+    """Collects the events, hands them to the handler as lists in order"""
+
+    def __init__(self, handler: BatchHandler, max_size: int = 100,
+                 max_wait_ms: float = 50,
+                 logs: Optional[Logger] = None) -> None:
+        """
+        Args:
+            handler (Callable): Called with each batch (sync or async)
+            max_size (int, optional): Events of a full batch.
+                Defaults to 100.
+            max_wait_ms (float, optional): Longest wait of the first event
+                of a batch (ms). Defaults to 50.
+            logs (Logger, optional): Where the errors of the handler on
+                the expired batches go.
+        """
+        self.handler = handler
+        self.max_size = max_size
+        self.max_wait = max_wait_ms / 1000
+        self.Logs = logs
+        self.__batch: list[LiveRPCResult] = []
+        self.__timer: Optional[asyncio.TimerHandle] = None
+        self.__loop: Optional[asyncio.AbstractEventLoop] = None
+        self.__lock: Optional[asyncio.Lock] = None
+
+        self.batches = 0
+        self.events = 0
+
+    async def add(self, event: LiveRPCResult) -> None:
+        loop = asyncio.get_running_loop()
+        if self.__loop is not loop:
+            self.__loop = loop
+            self.__lock = asyncio.Lock()
+
+        self.__batch.append(event)
+        # The errors and the closure are LiveRPCResult in all the formats
+        if len(self.__batch) >= self.max_size or (
+                isinstance(event, LiveRPCResult)
+                and (event.error.code != 0
+                     or event.method == 'log.unsubscribe')):
+            await self.flush()
+        elif self.__timer is None:
+            self.__timer = loop.call_later(self.max_wait, self.__expire)
+
+    async def flush(self) -> None:
+        """Hand the events collected to the handler"""
+        if self.__timer is not None:
+            self.__timer.cancel()
+            self.__timer = None
+
+        batch, self.__batch = self.__batch, []
+        if not batch:
+            return
+
+        # The batches reach the handler in order
+        async with self.__lock:
+            self.batches += 1
+            self.events += len(batch)
+            result = self.handler(batch)
+            if asyncio.iscoroutine(result):
+                await result
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'batches': self.batches,
+            'events': self.events,
+            'pending': len(self.__batch)
+        }
+
+    def __expire(self) -> None:
+        self.__timer = None
+        self.__loop.create_task(self.__flush_expired())
+
+    async def __flush_expired(self) -> None:
+        try:
+            await self.flush()
+        except Exception as err:
+            if self.Logs is not None:
+                self.Logs.error(f'Batch callback Error: {err}')
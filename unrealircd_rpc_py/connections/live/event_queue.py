@@ -0,0 +1,157 @@
+"""
+Bounded queue between the reader of a live connection and the consumer of
+`live.events()`.
+
+When the queue is full the overflow policy decides:
+
+    - block: the reader waits, the socket is no longer read
+    - drop_oldest: the oldest queued event is dropped for the new one
+    - drop_newest: the new event is dropped
+
+Once closed the queue takes no more events: put returns False, the
+blocked puts included.
+
+```python
+    async for event in live.events(max_size=10000, overflow='drop_oldest'):
+        ...
+        live.Queue.stats()  # {'depth': 12, 'max_depth': 9800, 'dropped': 3..}
+```
+"""
+import asyncio
+from typing import Any, Literal
+
+OverflowPolicy = Literal['block', 'drop_oldest', 'drop_newest']
+
+OVERFLOW_POLICIES = ('block', 'drop_oldest', 'drop_newest')
+
+_END = object()
+"""Queued by close, the iteration stops on it"""
+
+
+class EventQueue:
+    """Bounded queue of live events with an overflow policy and counters,
+    created in the event loop of its consumer"""
+
+    def __init__(self, max_size: int = 1024,
+                 overflow: OverflowPolicy = 'block') -> None:
+        """
+        Args:
+            max_size (int, optional): Events kept at most. Defaults to 1024.
+            overflow (str, optional): 'block', 'drop_oldest' or
+                'drop_newest'. Defaults to 'block'.
+
+        Raises:
+            ValueError: Unknown overflow policy
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow} "
+                             f"(one of {', '.join(OVERFLOW_POLICIES)})")
+
+        self.max_size = max_size
+        self.overflow = overflow
+        self.__queue: asyncio.Queue = asyncio.Queue(max_size)
+        self.__loop = asyncio.get_running_loop()
+        self.__closed = False
+        self.__putters: set[asyncio.Task] = set()
+
+        self.received = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.max_depth = 0
+
+    @property
+    def depth(self) -> int:
+        """Events waiting for the consumer"""
+        return self.__queue.qsize()
+
+    async def put(self, event: Any) -> bool:
+        """Queue an event following the overflow policy
+
+        Returns:
+            bool: False if the event was dropped or the queue is closed
+        """
+        if asyncio.get_running_loop() is not self.__loop:
+            # From another thread (e.g. unsubscribe)
+            return await asyncio.wrap_future(
+                asyncio.run_coroutine_threadsafe(self.put(event),
+                                                 self.__loop)
+            )
+
+        self.received += 1
+        queue = self.__queue
+
+        if self.__closed:
+            self.dropped += 1
+            return False
+
+        if not queue.full():
+            queue.put_nowait(event)
+        elif self.overflow == 'block':
+            if not await self.__wait_put(event):
+                return False
+        else:
+            self.dropped += 1
+            if self.overflow == 'drop_newest':
+                return False
+            queue.get_nowait()
+            queue.put_nowait(event)
+
+        if queue.qsize() > self.max_depth:
+            self.max_depth = queue.qsize()
+        return True
+
+    def close(self) -> None:
+        """End the iteration once the queued events are consumed, the
+        blocked and the later puts are dropped"""
+        if self.__closed:
+            return
+
+        self.__closed = True
+        for putter in self.__putters:
+            putter.cancel()
+        if not self.__queue.full():
+            self.__queue.put_nowait(_END)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'depth': self.depth,
+            'max_size': self.max_size,
+            'max_depth': self.max_depth,
+            'received': self.received,
+            'delivered': self.delivered,
+            'dropped': self.dropped
+        }
+
+    async def __wait_put(self, event: Any) -> bool:
+        """Wait for a free slot, False if the queue is closed meanwhile"""
+        putter = self.__loop.create_task(self.__queue.put(event))
+        self.__putters.add(putter)
+        try:
+            await putter
+            return True
+
+        except asyncio.CancelledError:
+            if not self.__closed:
+                raise
+            self.dropped += 1
+            return False
+
+        finally:
+            self.__putters.discard(putter)
+
+    def __aiter__(self) -> 'EventQueue':
+        return self
+
+    async def __anext__(self) -> Any:
+        if self.__closed and self.__queue.empty():
+            raise StopAsyncIteration
+
+        event = await self.__queue.get()
+        if event is _END:
+            raise StopAsyncIteration
+
+        self.delivered += 1
+        return event
+
+    def __len__(self) -> int:
+        return self.depth
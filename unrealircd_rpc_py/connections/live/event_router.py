@@ -0,0 +1,273 @@
+"""
+Routes the live log events to handlers by subsystem, event_id, level or a
+glob pattern on 'subsystem.event_id', in place of one callback testing
+each event.
+
+```python
+    router = EventRouter()
+
+    @router.route(event_id='LOCAL_CLIENT_CONNECT', queue_size=10000,
+                  concurrency=8)
+    async def on_connect(event: LiveRPCResult) -> None:
+        ...
+
+    @router.route(subsystem='join')
+    def on_join(event: LiveRPCResult) -> None:
+        ...
+
+    @router.route(pattern='tkl.TKL_ADD*', level='info')
+    def on_tkl(event: LiveRPCResult) -> None:
+        ...
+
+    router.set_default(print)       # The replies, the errors, the rest
+
+    liverpc.setup({..., 'callback_object_instance': router,
+                   'callback_method_or_function_name': 'dispatch'})
+```
+
+The routes of each (subsystem, event_id, level) are computed once, on the
+first event, then read from the dispatch table.
+
+A route without queue runs its handler in dispatch, before the next event.
+With queue_size or concurrency > 1 it gets its own queue (see EventQueue)
+and `concurrency` tasks running the handler: a slow or busy route does
+not hold the others.
+"""
+import asyncio
+import fnmatch
+from typing import Any, Callable, Literal, Optional, TypeVar
+from unrealircd_rpc_py.connections.live.event_queue import (
+    EventQueue, OverflowPolicy
+)
+from unrealircd_rpc_py.connections.live.raw_event import (
+    event_dict, event_failed
+)
+from unrealircd_rpc_py.objects.Definition import LiveRPCResult
+from unrealircd_rpc_py.utils import utils
+
+Handler = Callable[[LiveRPCResult], Any]
+H = TypeVar('H', bound=Handler)
+
+DEFAULT_QUEUE_SIZE = 1024
+"""Queue of a route with concurrency and no queue_size"""
+
+EventKey = tuple[Optional[str], Optional[str], Optional[str]]
+"""(subsystem, event_id, level)"""
+
+
+class Route:
+    """A handler and the events it gets: all the criteria given match"""
+
+    def __init__(self, handler: Handler,
+                 subsystem: Optional[str] = None,
+                 event_id: Optional[str] = None,
+                 level: Optional[str] = None,
+                 pattern: Optional[str] = None,
+                 queue_size: int = 0,
+                 concurrency: int = 1,
+                 overflow: OverflowPolicy = 'block') -> None:
+        self.handler = handler
+        self.name = getattr(handler, '__name__', repr(handler))
+        self.subsystem = subsystem
+        self.event_id = event_id
+        self.level = level
+        self.pattern = pattern
+        self.concurrency = max(1, concurrency)
+        self.queue_size = queue_size or (
+            DEFAULT_QUEUE_SIZE if self.concurrency > 1 else 0
+        )
+        self.overflow = overflow
+
+        self.Queue: Optional[EventQueue] = None
+        self.__workers: list[asyncio.Task] = []
+        self.__loop: Optional[asyncio.AbstractEventLoop] = None
+        self.handled = 0
+        self.errors = 0
+
+    def matches(self, subsystem: Optional[str], event_id: Optional[str],
+                level: Optional[str]) -> bool:
+        if self.subsystem is not None and subsystem != self.subsystem:
+            return False
+        if self.event_id is not None and event_id != self.event_id:
+            return False
+        if self.level is not None and level != self.level:
+            return False
+        if self.pattern is not None and not fnmatch.fnmatchcase(
+                f'{subsystem}.{event_id}', self.pattern):
+            return False
+        return True
+
+    async def deliver(self, event: LiveRPCResult,
+                      logs: Any = None) -> None:
+        """Run the handler, or queue the event for the workers"""
+        if not self.queue_size:
+            await self.__handle(event, logs)
+            return
+
+        if self.__loop is not asyncio.get_running_loop():
+            self.__start(logs)
+        await self.Queue.put(event)
+
+    def stop(self) -> None:
+        """Stop the workers, the queued events are dropped"""
+        for worker in self.__workers:
+            loop = worker.get_loop()
+            if not loop.is_closed():
+                # The workers may run in the loop of another thread
+                loop.call_soon_threadsafe(worker.cancel)
+        self.__workers = []
+        self.__loop = None
+
+    def stats(self) -> dict[str, int]:
+        stats = {'handled': self.handled, 'errors': self.errors}
+        if self.Queue is not None:
+            stats.update(self.Queue.stats())
+        return stats
+
+    def __start(self, logs: Any) -> None:
+        """The queue and the workers, in the running loop"""
+        self.stop()
+        self.__loop = asyncio.get_running_loop()
+        self.Queue = EventQueue(self.queue_size, self.overflow)
+        self.__workers = [
+            self.__loop.create_task(self.__work(self.Queue, logs))
+            for _ in range(self.concurrency)
+        ]
+
+    async def __work(self, queue: EventQueue, logs: Any) -> None:
+        async for event in queue:
+            await self.__handle(event, logs)
+
+    async def __handle(self, event: LiveRPCResult, logs: Any) -> None:
+        try:
+            result = self.handler(event)
+            if asyncio.iscoroutine(result):
+                await result
+            self.handled += 1
+
+        except Exception as err:
+            self.errors += 1
+            if logs is not None:
+                logs.error(f'Route {self.name} Error: {err}')
+
+    def __repr__(self) -> str:
+        criteria = ', '.join(
+            f'{name}={value!r}' for name, value in (
+                ('subsystem', self.subsystem), ('event_id', self.event_id),
+                ('level', self.level), ('pattern', self.pattern)
+            ) if value is not None
+        )
+        return f'Route({self.name}, {criteria})'
+
+
+class EventRouter:
+    """Dispatch the live events to the routes matching them"""
+
+    def __init__(self, debug_level: Literal[10, 20, 30, 40, 50] = 20
+                 ) -> None:
+        self.Logs = utils.start_log_system(
+            'unrealircd-liverpc-py', debug_level
+        )
+        self.routes: list[Route] = []
+        self.default: Optional[Route] = None
+        self.__table: dict[EventKey, tuple[Route, ...]] = {}
+
+    def route(self, subsystem: Optional[str] = None,
+              event_id: Optional[str] = None,
+              level: Optional[str] = None,
+              pattern: Optional[str] = None,
+              queue_size: int = 0,
+              concurrency: int = 1,
+              overflow: OverflowPolicy = 'block') -> Callable[[H], H]:
+        """Decorator registering a handler, see add_route"""
+        def register(handler: H) -> H:
+            self.add_route(handler, subsystem, event_id, level, pattern,
+                           queue_size, concurrency, overflow)
+            return handler
+        return register
+
+    def add_route(self, handler: Handler,
+                  subsystem: Optional[str] = None,
+                  event_id: Optional[str] = None,
+                  level: Optional[str] = None,
+                  pattern: Optional[str] = None,
+                  queue_size: int = 0,
+                  concurrency: int = 1,
+                  overflow: OverflowPolicy = 'block') -> Route:
+        """Register a handler (sync or async) of the events matching all
+        the criteria given
+
+        Args:
+            handler (Callable): Called with the LiveRPCResult
+            subsystem (str, optional): e.g. 'connect'
+            event_id (str, optional): e.g. 'LOCAL_CLIENT_CONNECT'
+            level (str, optional): e.g. 'info'
+            pattern (str, optional): Glob on 'subsystem.event_id',
+                e.g. 'connect.*_CLIENT_*'
+            queue_size (int, optional): Events queued for the route,
+                0 runs the handler in dispatch. Defaults to 0.
+            concurrency (int, optional): Tasks running the handler, the
+                route gets a queue of DEFAULT_QUEUE_SIZE if it has none.
+                Defaults to 1.
+            overflow (str, optional): Policy of the full queue, see
+                EventQueue. Defaults to 'block'.
+
+        Returns:
+            Route: The route
+        """
+        route = Route(handler, subsystem, event_id, level, pattern,
+                      queue_size, concurrency, overflow)
+        self.routes.append(route)
+        self.__table.clear()
+        return route
+
+    def set_default(self, handler: Handler) -> Route:
+        """The handler of the events no route matches: the replies, the
+        errors and the log events left"""
+        self.default = Route(handler)
+        return self.default
+
+    def remove_route(self, route: Route) -> None:
+        route.stop()
+        self.routes.remove(route)
+        self.__table.clear()
+
+    def routes_for(self, subsystem: Optional[str], event_id: Optional[str],
+                   level: Optional[str]) -> tuple[Route, ...]:
+        """The routes of a log event, from the dispatch table"""
+        key = (subsystem, event_id, level)
+        routes = self.__table.get(key)
+        if routes is None:
+            routes = self.__table[key] = tuple(
+                route for route in self.routes
+                if route.matches(subsystem, event_id, level)
+            )
+        return routes
+
+    async def dispatch(self, event: LiveRPCResult) -> None:
+        """The callback of the live connection, in any event_format"""
+        data = event_dict(event)
+        routes: tuple[Route, ...] = ()
+        if not event_failed(event) and data is not None and \
+                'event_id' in data:
+            routes = self.routes_for(data.get('subsystem'),
+                                     data.get('event_id'),
+                                     data.get('level'))
+
+        if not routes:
+            if self.default is not None:
+                await self.default.deliver(event, self.Logs)
+            return
+
+        for route in routes:
+            await route.deliver(event, self.Logs)
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """The counters of each route (and of its queue), by name"""
+        routes = self.routes + ([self.default] if self.default else [])
+        return {route.name: route.stats() for route in routes}
+
+    def stop(self) -> None:
+        """Stop the workers of the routes with a queue"""
+        for route in self.routes:
+            route.stop()
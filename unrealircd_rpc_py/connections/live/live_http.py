@@ -1,24 +1,48 @@
-import json
 import base64
 import ssl
-import time
-import random
 import asyncio
 import requests
 import urllib3
-from typing import TYPE_CHECKING, Literal, Optional, Any
+from concurrent.futures import Future
+from itertools import count
+from typing import TYPE_CHECKING, Callable, Literal, Optional, Any, Union
 from requests.auth import HTTPBasicAuth
 from websockets.asyncio import client
-from websockets import InvalidURI, InvalidHandshake
+from websockets.protocol import State
+from websockets import ConnectionClosed, InvalidURI, InvalidHandshake
 from unrealircd_rpc_py.objects.Definition import LiveRPCResult, RPCErrorModel
 from unrealircd_rpc_py.connections.live.ILiveConnection import ILiveConnection
+from unrealircd_rpc_py.connections.live.callback_executor import (
+    CallbackExecutor, setup_executor
+)
+from unrealircd_rpc_py.connections.live.event_batcher import (
+    EventBatcher, setup_batcher
+)
+from unrealircd_rpc_py.connections.live.event_queue import EventQueue
+from unrealircd_rpc_py.connections.live.raw_event import (
+    EventFormat, RawLiveEvent, check_event_format, make_event
+)
+from unrealircd_rpc_py.connections.live.reconnect import (
+    Backoff, EventTracker, log_entries, setup_reconnect
+)
 from unrealircd_rpc_py.exceptions.rpc_exceptions import (
     RpcConnectionError, RpcInvalidUrlFormat, RpcSetupError
 )
-from unrealircd_rpc_py.utils import utils
+from unrealircd_rpc_py.utils import json_codec, utils
 
 if TYPE_CHECKING:
     from logging import Logger
+    from websockets.asyncio.client import ClientConnection
+    from unrealircd_rpc_py.utils.read_cache import ReadCache
+
+EVENTS_QUEUE_SIZE = 1024
+REPLY_TIMEOUT = 10
+"""Seconds a query waits for its reply (setup key timeout)"""
+"""Events read ahead of the callback, the websocket is no longer read when
+the queue is full"""
+
+_BACKFILL = object()
+"""Queued after the reply of a new subscription: backfill the gap"""
 
 
 class LiveWebsocket(ILiveConnection):
@@ -39,6 +63,35 @@ class LiveWebsocket(ILiveConnection):
         self.password = ''
         self.request: str = ''
         self.connected: bool = True
+        self.timeout: float = REPLY_TIMEOUT
+        self.read_cache: Optional['ReadCache'] = None
+        self.event_format: EventFormat = 'namespace'
+        self.to_run: Optional[Callable[[LiveRPCResult], Any]] = None
+        self.Queue: Optional[EventQueue] = None
+        """The queue of live.events() while it is iterated"""
+        self.Executor: Optional[CallbackExecutor] = None
+        """The pool running a sync callback (setup key callback_executor)"""
+        self.Batcher: Optional[EventBatcher] = None
+        """Batches of events for the callback (setup key batch_size)"""
+
+        # One websocket for the subscription and the queries, the replies
+        # are matched to the requests by id
+        self.__websocket: Optional['ClientConnection'] = None
+        self.__loop: Optional[asyncio.AbstractEventLoop] = None
+        self.__lock: Optional[asyncio.Lock] = None
+        self.__reader: Optional[asyncio.Task] = None
+        self.__pending: dict[Any, tuple[asyncio.Future, bool]] = {}
+        # The ids on the wire, unique on the websocket
+        self.__ids = count(1)
+        self.__stream_end: Optional[Future] = None
+        self.__sslctx: Optional[ssl.SSLContext] = None
+
+        # Reconnect mode
+        self.__sources: list = []
+        self.__backoff: Optional[Backoff] = None
+        self.__tracker: Optional[EventTracker] = None
+        self.__backfill: bool = False
+        self.__backfill_since: Optional[str] = None
 
     def setup(self, params: dict) -> None:
         self.url = params.get('url', None)
@@ -50,6 +103,12 @@ class LiveWebsocket(ILiveConnection):
         callback_method_or_function_name = params.get(
             'callback_method_or_function_name', None
         )
+        self.read_cache = params.get('read_cache', None)
+        self.event_format = check_event_format(
+            params.get('event_format', 'namespace')
+        )
+        self.timeout = params.get('timeout', REPLY_TIMEOUT)
+        self.__backoff, self.__tracker = setup_reconnect(params)
         self.is_setup = True
 
         test = self.establish_first_connection()
@@ -68,7 +127,7 @@ class LiveWebsocket(ILiveConnection):
             )
             self.to_run = getattr(
                 callback_object_instance, callback_method_or_function_name
-            )
+            ) if callback_method_or_function_name is not None else None
             self.Logs.debug("Connexion Established using Live Websocket!")
 
         except AttributeError as atterr:
@@ -79,6 +138,8 @@ class LiveWebsocket(ILiveConnection):
             self.Logs.critical(iuf)
             raise RpcInvalidUrlFormat(f'RpcInvalidUrlFormat: {iuf}')
 
+        self.Executor = setup_executor(params, self.to_run, self.Logs)
+        self.Batcher = setup_batcher(params, self.__call_callback, self.Logs)
         self.connect()
 
     def connect(self) -> None:
@@ -128,23 +189,110 @@ class LiveWebsocket(ILiveConnection):
 
     async def subscribe(self, sources: Optional[list] = None
                         ) -> LiveRPCResult:
-        """Subscribe to the rpc server stream"""
+        """Subscribe to the rpc server stream, the log events are given to
+        the callback until unsubscribe is called or the websocket is lost.
+
+        In reconnect mode a lost websocket is reported once to the
+        callback, then the subscription is made again with the same
+        sources and the missed events are backfilled from log.list.
+
+        Returns:
+            LiveRPCResult: The closure of the stream, or the error
+        """
         self.connected = True
         sources = ["!debug", "all"] if sources is None else sources
-        response = await self.query(
-            'log.subscribe',
-            param={"sources": sources}
+        self.__sources = sources
+
+        try:
+            response = await self.__stream(sources)
+            while (self.__backoff is not None and self.connected
+                   and response.error.code == -1):
+                delay = self.__backoff.next_delay()
+                self.Logs.warning(f"Stream lost, subscribing again in "
+                                  f"{delay:.1f}s")
+                await asyncio.sleep(delay)
+                response = await self.__stream(sources, retry=True)
+
+            return response
+
+        except asyncio.CancelledError:
+            self.Logs.info("Websocket task cancelled, closing connection")
+            error = LiveRPCResult(
+                result=False,
+                error=RPCErrorModel(
+                    code=-1,
+                    message="Websocket task cancelled, closing connection")
+            )
+            await self.__run_callback(error)
+            return error
+
+    async def __stream(self, sources: list, retry: bool = False
+                       ) -> LiveRPCResult:
+        """Subscribe and wait for the end of the stream
+
+        Args:
+            sources (list): The sources
+            retry (bool, optional): A new subscription after the stream was
+                lost: the gap is backfilled, and the failed attempts are
+                not reported to the callback. Defaults to False.
+        """
+        stream_end = self.__stream_end = Future()
+        if retry and self.__tracker is not None:
+            self.__backfill = True
+            self.__backfill_since = self.__tracker.last_timestamp
+
+        response = await self.__request(
+            'log.subscribe', {"sources": sources}, notify=True
         )
         # print(f"First Subscribe response: {response}")
         if response.method is None:
             response.method = 'log.subscribe'
 
-        return response
+        if response.error.code != 0:
+            self.__backfill = False
+            if not stream_end.done() and not retry:
+                await self.__run_callback(response)
+            self.__end_stream(response)
+            return response
+
+        if self.__backoff is not None:
+            self.__backoff.reset()
+        if self.__tracker is not None:
+            self.__tracker.start()
+
+        return await asyncio.wrap_future(stream_end)
 
     async def unsubscribe(self) -> LiveRPCResult:
-        """Unsubscribe from the rpc server stream"""
+        """Unsubscribe from the rpc server stream, on the websocket of the
+        subscription"""
+        owner = self.__owner_loop()
+        if owner is not None:
+            # The callback gets the closure in the loop of the subscription
+            return await asyncio.wrap_future(
+                asyncio.run_coroutine_threadsafe(self.unsubscribe(), owner)
+            )
 
         response = await self.query(method='log.unsubscribe')
+        self.connected = False
+
+        if response.error.code == 0:
+            unsubscribe_response = {
+                "msg": "WebSocket normal closure",
+                "level": "info",
+                "subsystem": "disconnect",
+                "event_id": "UNSUBSCRIBE_FROM_STREAM",
+                "timestamp": utils.get_timestamp(),
+                "log_source": "_"
+            }
+            response = LiveRPCResult(
+                method='log.unsubscribe',
+                result=utils.dict_to_lazy_namespace(unsubscribe_response),
+                error=RPCErrorModel(
+                    code=0, message="Websocket Normal Closure!"
+                )
+            )
+
+        await self.__run_callback(response)
 
         await self.query(
             method='log.send',
@@ -155,8 +303,8 @@ class LiveWebsocket(ILiveConnection):
                    "event_id": "REMOTE_CLIENT_DISCONNECT"}
         )
 
-        if response.method is None:
-            response.method = 'log.unsubscribe'
+        # Last, subscribe returns and its event loop may stop
+        self.__end_stream(response)
 
         return response
 
@@ -165,10 +313,40 @@ class LiveWebsocket(ILiveConnection):
                     param: Optional[dict] = None, query_id: int = 123,
                     jsonrpc: str = '2.0'
                     ) -> LiveRPCResult:
+        """Send a request on the websocket and wait for its reply, the log
+        events received meanwhile still go to the callback"""
+        return await self.__request(method, param, query_id, jsonrpc)
+
+    async def send_to_method(self) -> LiveRPCResult:
+        """Send the last request (self.request) on the websocket"""
+        request = json_codec.loads(self.request)
+        query_id = request.get('id', 123)
+        request['id'] = next(self.__ids)
+        return await self.__send(json_codec.dumps(request), request['id'],
+                                 query_id=query_id)
+
+    async def close(self) -> None:
+        """Close the websocket, the next query opens a new one"""
+        owner = self.__owner_loop()
+        if owner is not None:
+            await asyncio.wrap_future(
+                asyncio.run_coroutine_threadsafe(self.close(), owner)
+            )
+            return
+
+        websocket, self.__websocket = self.__websocket, None
+        if websocket is not None:
+            await websocket.close()
+        if self.__reader is not None:
+            await asyncio.gather(self.__reader, return_exceptions=True)
 
+    async def __request(self, method: str, param: Optional[dict] = None,
+                        query_id: int = 123, jsonrpc: str = '2.0',
+                        notify: bool = False) -> LiveRPCResult:
         get_param = {} if param is None else param
-        get_id = int(time.time()) + random.randint(1, 6000) if (
-                query_id == 123) else query_id
+        # The id on the wire always comes from the counter, a caller id
+        # could be the one of another request in flight
+        get_id = next(self.__ids)
 
         response = {
             "jsonrpc": jsonrpc,
@@ -177,118 +355,268 @@ class LiveWebsocket(ILiveConnection):
             "id": get_id
         }
 
-        self.request = json.dumps(response)
+        self.request = json_codec.dumps(response)
 
-        response = await self.send_to_method()
+        return await self.__send(self.request, get_id, notify, query_id)
 
-        return response
+    async def __send(self, request: str, request_id: Any,
+                     notify: bool = False,
+                     query_id: int = 123) -> LiveRPCResult:
+        """Send a request on the websocket and wait for the reply with the
+        same id, at most self.timeout seconds
+
+        Args:
+            request (str): The JSON request
+            request_id (Any): The id of the request on the wire
+            notify (bool, optional): Give the reply to the callback too,
+                before the events received after it. Defaults to False.
+            query_id (int, optional): The id of the caller, set on the
+                reply. Defaults to 123.
+        """
+        owner = self.__owner_loop()
+        if owner is not None:
+            # The websocket belongs to the event loop of another thread
+            # (the subscription), the request is sent from there
+            return await asyncio.wrap_future(
+                asyncio.run_coroutine_threadsafe(
+                    self.__send(request, request_id, notify, query_id),
+                    owner
+                )
+            )
 
-    async def send_to_method(self) -> LiveRPCResult:
-        """Connect using websockets"""
         try:
-            api_login = f'{self.username}:{self.password}'
-            credentials = base64.b64encode(api_login.encode()).decode()
+            websocket = await self.__get_websocket()
+            reply = asyncio.get_running_loop().create_future()
+            self.__pending[request_id] = (reply, notify)
+            try:
+                await websocket.send(request)
+                response = await asyncio.wait_for(reply, self.timeout)
+            finally:
+                self.__pending.pop(request_id, None)
+
+            response.id = query_id
+            return response
+
+        except asyncio.TimeoutError:
+            message = f'No reply after {self.timeout} seconds'
+            self.Logs.error(f"Websocket Error: {message}")
+            self.Logs.error(f"Initial request: {request}")
+            return LiveRPCResult(
+                result=False, error=RPCErrorModel(code=-1, message=message)
+            )
 
-            headers = {'Authorization': f"Basic {credentials}"}
+        except (KeyError, InvalidURI, InvalidHandshake, ConnectionClosed,
+                OSError, TypeError, Exception) as err:
+            self.Logs.error(f"Websocket Error: {err}")
+            self.Logs.error(f"Initial request: {request}")
+            return LiveRPCResult(
+                result=False,
+                error=RPCErrorModel(code=-1, message=str(err))
+            )
 
+    def __owner_loop(self) -> Optional[asyncio.AbstractEventLoop]:
+        """The running event loop of another thread owning the websocket"""
+        owner = self.__loop
+        if owner is None or owner is asyncio.get_running_loop():
+            return None
+        return owner if owner.is_running() else None
+
+    async def __get_websocket(self) -> 'ClientConnection':
+        """The websocket, opened on first use or after it was lost"""
+        loop = asyncio.get_running_loop()
+        if self.__loop is not loop:
+            # First use, or the loop of the previous websocket is gone
+            self.__websocket = None
+            self.__loop = loop
+            self.__lock = asyncio.Lock()
+
+        async with self.__lock:
+            websocket = self.__websocket
+            if websocket is None or websocket.state is not State.OPEN:
+                websocket = await client.connect(
+                    uri=f'wss://{self.host}:{self.port}/',
+                    additional_headers=self.__headers(),
+                    ssl=self.__ssl_context()
+                )
+                self.__websocket = websocket
+                events: asyncio.Queue = asyncio.Queue(EVENTS_QUEUE_SIZE)
+                dispatcher = loop.create_task(self.__dispatch(events))
+                self.__reader = loop.create_task(
+                    self.__read(websocket, events, dispatcher)
+                )
+                self.Logs.debug("Websocket opened")
+
+        return websocket
+
+    def __headers(self) -> dict[str, str]:
+        api_login = f'{self.username}:{self.password}'
+        credentials = base64.b64encode(api_login.encode()).decode()
+        return {'Authorization': f"Basic {credentials}"}
+
+    def __ssl_context(self) -> ssl.SSLContext:
+        """The SSL context, built once for all the websockets"""
+        if self.__sslctx is None:
             sslctx = ssl.create_default_context()
             sslctx.check_hostname = False
             sslctx.verify_mode = ssl.CERT_NONE
+            self.__sslctx = sslctx
+        return self.__sslctx
+
+    async def __read(self, websocket: 'ClientConnection',
+                     events: asyncio.Queue, dispatcher: asyncio.Task
+                     ) -> None:
+        """Read the websocket: the replies go to the pending requests by
+        id, the log events to the queue of the callback"""
+        reason = 'Websocket closed'
+        raw = (self.event_format == 'raw' and self.__tracker is None
+               and self.read_cache is None)
+        try:
+            while True:
+                # The raw events are kept as received, not decoded
+                srv_response = await websocket.recv(False if raw else None)
+                if raw and not self.__pending:
+                    await events.put(RawLiveEvent(srv_response))
+                    continue
+
+                decoded_response: dict[str, Any] = json_codec.loads(
+                    srv_response
+                )
+                result = decoded_response.get('result', None)
+
+                pending = self.__pending.get(decoded_response.get('id'))
+                if pending is not None:
+                    reply, notify = pending
+                    final_response = make_event('namespace',
+                                                decoded_response)
+                    if notify:
+                        await events.put(final_response if (
+                            self.event_format == 'namespace'
+                        ) else make_event(self.event_format,
+                                          decoded_response, srv_response))
+                        if self.__backfill and final_response.error.code == 0:
+                            self.__backfill = False
+                            await events.put(_BACKFILL)
+                    if not reply.done():
+                        reply.set_result(final_response)
+                    continue
+
+                if self.__tracker is not None and self.__tracker.seen(result):
+                    # Already given by the backfill
+                    continue
+
+                if self.read_cache is not None:
+                    self.read_cache.apply_event(result)
+
+                await events.put(make_event(self.event_format,
+                                            decoded_response, srv_response))
+
+        except ConnectionClosed as closed:
+            reason = f'Websocket closed: {closed}'
+
+        except (KeyError, TypeError, json_codec.JSONDecodeError,
+                Exception) as err:
+            self.Logs.error(f"Websocket Error: {err}")
+            reason = str(err)
+            await websocket.close()
 
-            ws_uri = f'wss://{self.host}:{self.port}/'
-            method = json.loads(self.request).get('method')
-            final_response: LiveRPCResult = LiveRPCResult()
-
-            async with client.connect(
-                    uri=ws_uri, additional_headers=headers, ssl=sslctx
-            ) as ws:
-                await ws.send(self.request)
-                while self.connected:
-                    srv_response = await ws.recv()
-                    decoded_response: dict[str, Any] = json.loads(
-                        json.loads(json.dumps(srv_response))
-                    )
-                    error = decoded_response.get(
-                        'error', RPCErrorModel().to_dict()
-                    )
-                    response_method = decoded_response.get('method', None)
-                    result = decoded_response.get('result', None)
-                    final_response = LiveRPCResult(
-                        method=response_method,
-                        error=RPCErrorModel(**error),
-                        result=utils.dict_to_namespace(result)
-                    )
-
-                    if method == 'log.unsubscribe':
-                        self.connected = False
-                        unsubscribe_response = {
-                            "msg": "WebSocket normal closure",
-                            "level": "info",
-                            "subsystem": "disconnect",
-                            "event_id": "UNSUBSCRIBE_FROM_STREAM",
-                            "timestamp": utils.get_timestamp(),
-                            "log_source": "_"
-                        }
-                        final_response = LiveRPCResult(
-                            method=response_method,
-                            result=utils.dict_to_namespace(
-                                unsubscribe_response
-                            ),
-                            error=RPCErrorModel(
-                                code=0, message="Websocket Normal Closure!"
-                            )
-                        )
-
-                    # support callbacks async et sync
-                    result = self.to_run(final_response)
-                    if asyncio.iscoroutine(result):
-                        await result
-
-            return final_response
-
-        except asyncio.CancelledError:
-            self.Logs.info("Websocket task cancelled, closing connection")
-            error = LiveRPCResult(
-                result=False,
-                error=RPCErrorModel(
-                    code=-1,
-                    message="Websocket task cancelled, closing connection")
-            )
-            result = self.to_run(error)
-            if asyncio.iscoroutine(result):
-                await result
-
-            return error
+        finally:
+            if self.__websocket is websocket:
+                self.__websocket = None
 
-        except AttributeError as ae:
-            self.Logs.critical(
-                f"Attribute Error: {ae.__str__()} Check your "
-                f"callback function or method"
+            lost = LiveRPCResult(
+                result=False, error=RPCErrorModel(code=-1, message=reason)
             )
-            error = LiveRPCResult(
-                result=False,
-                error=RPCErrorModel(
-                    code=-1,
-                    message="Attribute Error, Check your callback "
-                            "function or method!"
+            for reply, _ in list(self.__pending.values()):
+                if not reply.done():
+                    reply.set_result(LiveRPCResult(
+                        result=False,
+                        error=RPCErrorModel(code=-1, message=reason)
+                    ))
+
+        stream_end = self.__stream_end
+        streaming = stream_end is not None and not stream_end.done()
+        if streaming:
+            # The stream stopped without unsubscribe
+            self.Logs.error(reason)
+            await events.put(lost)
+
+        await events.put(None)
+        await dispatcher
+        if streaming:
+            self.__end_stream(lost)
+
+    async def __dispatch(self, events: asyncio.Queue) -> None:
+        """Give the events to the callback in the order they came, apart
+        from the reader so the callback can await a query"""
+        while True:
+            response = await events.get()
+            if response is None:
+                break
+
+            try:
+                if response is _BACKFILL:
+                    await self.__run_backfill()
+                else:
+                    await self.__run_callback(response)
+
+            except AttributeError as ae:
+                self.Logs.critical(
+                    f"Attribute Error: {ae.__str__()} Check your "
+                    f"callback function or method"
                 )
-            )
-            result = self.to_run(error)
-            if asyncio.iscoroutine(result):
-                await result
-
-            return error
 
-        except (KeyError, InvalidURI, InvalidHandshake, OSError, TypeError,
-                json.decoder.JSONDecodeError, TimeoutError, Exception) as err:
-            self.Logs.error(f"Websocket Error: {err}")
-            self.Logs.error(f"Initial request: {self.request}")
-            error = LiveRPCResult(
-                result=False,
-                error=RPCErrorModel(code=-1, message=err)
+            except Exception as err:
+                self.Logs.error(f"Callback Error: {err}")
+
+    async def __run_backfill(self) -> None:
+        """Give to the callback the events of log.list missed while the
+        stream was lost, tagged with the method 'log.list'"""
+        response = await self.query('log.list', {'sources': self.__sources})
+        if response.error.code != 0:
+            self.Logs.error(f"Backfill failed: {response.error.message} "
+                            f"({response.error.code})")
+            return
+
+        missed = self.__tracker.missed(log_entries(response),
+                                       self.__backfill_since)
+        self.Logs.info(f"Backfill: {len(missed)} missed events")
+        for entry in missed:
+            event = make_event(
+                self.event_format,
+                {"jsonrpc": "2.0", "method": "log.list", "result": entry}
             )
-            result = self.to_run(error)
-            if asyncio.iscoroutine(result):
-                await result
-
-            return error
+            if self.read_cache is not None:
+                self.read_cache.apply_event(entry)
+            await self.__run_callback(event)
+
+    def __end_stream(self, response: LiveRPCResult) -> None:
+        stream_end = self.__stream_end
+        if stream_end is not None and not stream_end.done():
+            stream_end.set_result(response)
+
+    async def __run_callback(self, response: LiveRPCResult) -> None:
+        if self.Queue is not None:
+            # live.events()
+            await self.Queue.put(response)
+            return
+
+        if self.to_run is None:
+            return
+
+        if self.Batcher is not None:
+            await self.Batcher.add(response)
+            return
+
+        await self.__call_callback(response)
+
+    async def __call_callback(
+            self, response: Union[LiveRPCResult, list[LiveRPCResult]]
+    ) -> None:
+        """Call the callback with an event or a batch of events"""
+        if self.Executor is not None:
+            await self.Executor.submit(response)
+            return
+
+        result = self.to_run(response)
+        if asyncio.iscoroutine(result):
+            await result
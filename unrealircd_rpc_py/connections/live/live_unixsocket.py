@@ -1,17 +1,34 @@
-import json
 import time
 import random
 import asyncio
-from typing import TYPE_CHECKING, Literal, Optional
+import contextlib
+from typing import TYPE_CHECKING, Any, Callable, Literal, Optional, Union
 from unrealircd_rpc_py.objects.Definition import LiveRPCResult, RPCErrorModel
 from unrealircd_rpc_py.connections.live.ILiveConnection import ILiveConnection
+from unrealircd_rpc_py.connections.live.callback_executor import (
+    CallbackExecutor, setup_executor
+)
+from unrealircd_rpc_py.connections.live.event_batcher import (
+    EventBatcher, setup_batcher
+)
+from unrealircd_rpc_py.connections.live.event_queue import EventQueue
+from unrealircd_rpc_py.connections.live.raw_event import (
+    EventFormat, RawLiveEvent, check_event_format, make_event
+)
+from unrealircd_rpc_py.connections.live.reconnect import (
+    Backoff, EventTracker, log_entries, setup_reconnect
+)
 from unrealircd_rpc_py.exceptions.rpc_exceptions import (
     RpcConnectionError, RpcUnixSocketFileNotFoundError
 )
-from unrealircd_rpc_py.utils import utils
+from unrealircd_rpc_py.utils import json_codec, utils
 
 if TYPE_CHECKING:
     from logging import Logger
+    from unrealircd_rpc_py.utils.read_cache import ReadCache
+
+BACKFILL_READ_LIMIT = 64 * 1024 * 1024
+"""Longest reply of log.list read by the backfill (bytes)"""
 
 
 class LiveUnixSocket(ILiveConnection):
@@ -32,6 +49,22 @@ class LiveUnixSocket(ILiveConnection):
         self.request: str = ''
         self.connected: bool = True
         self.is_setup: bool = False
+        self.read_cache: Optional['ReadCache'] = None
+        self.event_format: EventFormat = 'namespace'
+        self.to_run: Optional[Callable[[LiveRPCResult], Any]] = None
+        self.Queue: Optional[EventQueue] = None
+        """The queue of live.events() while it is iterated"""
+        self.Executor: Optional[CallbackExecutor] = None
+        """The pool running a sync callback (setup key callback_executor)"""
+        self.Batcher: Optional[EventBatcher] = None
+        """Batches of events for the callback (setup key batch_size)"""
+
+        # Reconnect mode
+        self.__sources: list = []
+        self.__backoff: Optional[Backoff] = None
+        self.__tracker: Optional[EventTracker] = None
+        self.__backfill: bool = False
+        self.__backfill_since: Optional[str] = None
 
     def setup(self, params: dict) -> None:
         """Setup the Live connection
@@ -49,6 +82,11 @@ class LiveUnixSocket(ILiveConnection):
         callback_method_or_function_name = params.get(
             'callback_method_or_function_name', None
         )
+        self.read_cache = params.get('read_cache', None)
+        self.event_format = check_event_format(
+            params.get('event_format', 'namespace')
+        )
+        self.__backoff, self.__tracker = setup_reconnect(params)
         self.is_setup = True
 
         try:
@@ -56,7 +94,7 @@ class LiveUnixSocket(ILiveConnection):
                 self.path_to_socket_file = path_to_socket_file
                 self.to_run = getattr(
                     callback_object_instance, callback_method_or_function_name
-                )
+                ) if callback_method_or_function_name is not None else None
                 self.Logs.debug(
                     "Connexion Established using Live UnixSocket!"
                 )
@@ -69,6 +107,8 @@ class LiveUnixSocket(ILiveConnection):
             self.Logs.critical(f'RpcUnixSocketFileNotFoundError: {err}')
             raise
 
+        self.Executor = setup_executor(params, self.to_run, self.Logs)
+        self.Batcher = setup_batcher(params, self.__call_callback, self.Logs)
         self.connect()
 
     def connect(self) -> None:
@@ -86,16 +126,46 @@ class LiveUnixSocket(ILiveConnection):
         for debug messages
         see: https://www.unrealircd.org/docs/List_of_all_log_messages
 
+        In reconnect mode a lost connection is reported once to the
+        callback, then the subscription is made again with the same sources
+        and the missed events are backfilled from log.list.
+
         Args:
             sources (list, optional): The ressources you want to subscribe.
                 Defaults to ["!debug","all"].
         """
         self.connected = True
         sources = ["!debug", "all"] if sources is None else sources
-        response = await self.query(
-            method='log.subscribe', param={"sources": sources}
-        )
-        return response
+        self.__sources = sources
+        if self.__tracker is not None:
+            self.__tracker.start()
+
+        while True:
+            try:
+                response = await self.query(
+                    method='log.subscribe', param={"sources": sources}
+                )
+            except OSError as err:
+                if self.__backoff is None:
+                    raise
+                # The server is not there (yet)
+                self.Logs.debug(f'UnixSocket Error: {err}')
+                response = LiveRPCResult(
+                    result=False,
+                    error=RPCErrorModel(code=-1, message=err.__str__())
+                )
+
+            if (self.__backoff is None or not self.connected
+                    or response.error.code != -1):
+                return response
+
+            delay = self.__backoff.next_delay()
+            self.Logs.warning(f"Stream lost, subscribing again in "
+                              f"{delay:.1f}s")
+            await asyncio.sleep(delay)
+
+            self.__backfill = True
+            self.__backfill_since = self.__tracker.last_timestamp
 
     async def unsubscribe(self) -> LiveRPCResult:
         """Run a del timer to trigger an event and then
@@ -154,7 +224,7 @@ class LiveUnixSocket(ILiveConnection):
             "id": get_id
         }
 
-        self.request = json.dumps(response)
+        self.request = json_codec.dumps(response)
 
         response = await self.send_to_method()
 
@@ -173,16 +243,23 @@ class LiveUnixSocket(ILiveConnection):
             await writer.drain()
 
             # Get the method
-            method = json.loads(self.request).get('method')
+            method = json_codec.loads(self.request).get('method')
 
             # Init batch variable
             batch = b''
             final_response: LiveRPCResult = LiveRPCResult()
+            # Raw lines once the reply is received, if nothing needs the
+            # events decoded
+            raw_lines = False
 
             while self.connected:
                 # Recieve the data from the rpc server, decode it
                 # and split it
                 response = await reader.readline()
+                if not response:
+                    raise ConnectionResetError(
+                        'Connection closed by the server'
+                    )
                 if response[-1:] != b"\n":
                     # If END not recieved then fill the batch and go to next
                     # itteration
@@ -194,7 +271,7 @@ class LiveUnixSocket(ILiveConnection):
                     batch += response
 
                 # Decode and split the response
-                response = batch.decode().split("\n")
+                response = batch.split(b"\n")
 
                 if method == 'log.unsubscribe':
                     self.connected = False
@@ -208,36 +285,60 @@ class LiveUnixSocket(ILiveConnection):
                     }
                     final_response = LiveRPCResult(
                         method=method,
-                        result=utils.dict_to_namespace(unsubscribe_response),
+                        result=utils.dict_to_lazy_namespace(
+                            unsubscribe_response
+                        ),
                         error=RPCErrorModel(
                             code=0, message="UnixSocket normal closure!"
                         )
                     )
 
                     # support callbacks async et sync
-                    await self.to_run(final_response) if (
-                        asyncio.iscoroutinefunction(self.to_run)
-                    ) else self.to_run(final_response)
+                    await self.__run_callback(final_response)
                     break
 
                 for bdata in response:
-                    if bdata:
-                        decoded_response = json.loads(bdata)
-                        error = decoded_response.get(
-                            'error', RPCErrorModel().to_dict()
-                        )
-                        result = decoded_response.get('result', None)
-                        response_method = decoded_response.get('method', None)
-                        final_response = LiveRPCResult(
-                            method=response_method,
-                            error=RPCErrorModel(**error),
-                            result=utils.dict_to_namespace(result)
+                    if not bdata:
+                        continue
+
+                    if raw_lines:
+                        await self.__run_callback(RawLiveEvent(bdata))
+                        continue
+
+                    decoded_response = json_codec.loads(bdata)
+                    result = decoded_response.get('result', None)
+                    is_reply = 'id' in decoded_response
+                    if (not is_reply and self.__tracker is not None
+                            and self.__tracker.seen(result)):
+                        # Already given by the backfill
+                        continue
+
+                    if self.event_format == 'namespace' or is_reply:
+                        final_response = make_event(
+                            'namespace', decoded_response
                         )
+                    event = final_response if (
+                        self.event_format == 'namespace'
+                    ) else make_event(
+                        self.event_format, decoded_response, bdata
+                    )
+
+                    if self.read_cache is not None:
+                        self.read_cache.apply_event(result)
 
-                        # support callbacks async et sync
-                        await self.to_run(final_response) if (
-                            asyncio.iscoroutinefunction(self.to_run)
-                        ) else self.to_run(final_response)
+                    # support callbacks async et sync
+                    await self.__run_callback(event)
+
+                    if is_reply:
+                        raw_lines = (self.event_format == 'raw'
+                                     and self.read_cache is None
+                                     and self.__tracker is None)
+                        if final_response.error.code == 0:
+                            if self.__backoff is not None:
+                                self.__backoff.reset()
+                            if self.__backfill:
+                                self.__backfill = False
+                                await self.__run_backfill()
 
                 # Clean batch variable
                 batch = b''
@@ -250,24 +351,97 @@ class LiveUnixSocket(ILiveConnection):
                 result=False,
                 error=RPCErrorModel(code=-1, message=attrerr.__str__())
             )
-            await self.to_run(error) if (
-                asyncio.iscoroutinefunction(self.to_run)
-            ) else self.to_run(error)
+            await self.__run_callback(error)
             return error
 
-        except (TimeoutError, OSError, json.decoder.JSONDecodeError,
+        except (TimeoutError, OSError, json_codec.JSONDecodeError,
                 TypeError, Exception) as err:
             self.Logs.critical(f'UnixSocket Error: {err}')
             error = LiveRPCResult(
                 result=False,
                 error=RPCErrorModel(code=-1, message=err.__str__())
             )
-            await self.to_run(error) if (
-                asyncio.iscoroutinefunction(self.to_run)
-            ) else self.to_run(error)
+            await self.__run_callback(error)
             return error
 
         finally:
-            await writer.drain()
+            # The connection may be reset already, keep the result above
+            with contextlib.suppress(OSError):
+                await writer.drain()
             writer.close()
-            await writer.wait_closed()
+            with contextlib.suppress(OSError):
+                await writer.wait_closed()
+
+    async def __run_callback(self, response: LiveRPCResult) -> None:
+        if self.Queue is not None:
+            # live.events()
+            await self.Queue.put(response)
+            return
+
+        if self.to_run is None:
+            return
+
+        if self.Batcher is not None:
+            await self.Batcher.add(response)
+            return
+
+        await self.__call_callback(response)
+
+    async def __call_callback(
+            self, response: Union[LiveRPCResult, list[LiveRPCResult]]
+    ) -> None:
+        """Call the callback with an event or a batch of events"""
+        if self.Executor is not None:
+            await self.Executor.submit(response)
+            return
+
+        result = self.to_run(response)
+        if asyncio.iscoroutine(result):
+            await result
+
+    async def __run_backfill(self) -> None:
+        """Give to the callback the events of log.list missed while the
+        stream was lost, tagged with the method 'log.list'"""
+        try:
+            reader, writer = await asyncio.open_unix_connection(
+                self.path_to_socket_file, limit=BACKFILL_READ_LIMIT
+            )
+            try:
+                request = {"jsonrpc": "2.0", "method": "log.list",
+                           "params": {"sources": self.__sources},
+                           "id": int(time.time()) + random.randint(1, 6000)}
+                writer.write(f'{json_codec.dumps(request)}\r\n'.encode())
+                await writer.drain()
+                decoded_response = json_codec.loads(await reader.readline())
+            finally:
+                writer.close()
+                await writer.wait_closed()
+
+        except (OSError, ValueError, json_codec.JSONDecodeError) as err:
+            self.Logs.error(f'Backfill failed: {err}')
+            return
+
+        error = decoded_response.get('error', RPCErrorModel().to_dict())
+        response = LiveRPCResult(
+            method='log.list',
+            error=RPCErrorModel(**error),
+            result=utils.dict_to_lazy_namespace(
+                decoded_response.get('result', None)
+            )
+        )
+        if response.error.code != 0:
+            self.Logs.error(f"Backfill failed: {response.error.message} "
+                            f"({response.error.code})")
+            return
+
+        missed = self.__tracker.missed(log_entries(response),
+                                       self.__backfill_since)
+        self.Logs.info(f"Backfill: {len(missed)} missed events")
+        for entry in missed:
+            event = make_event(
+                self.event_format,
+                {"jsonrpc": "2.0", "method": "log.list", "result": entry}
+            )
+            if self.read_cache is not None:
+                self.read_cache.apply_event(entry)
+            await self.__run_callback(event)
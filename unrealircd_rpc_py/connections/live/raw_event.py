@@ -0,0 +1,132 @@
+"""
+Formats of the events given to the live callback (setup key
+event_format):
+
+    - namespace: LiveRPCResult, its result wrapped in a LazyNamespace
+      (default)
+    - dict: the decoded JSON line, as a plain dict
+    - raw: RawLiveEvent, the line as received, not decoded; its method and
+      error are peeked in the bytes
+
+```python
+    def forward(event) -> None:
+        if isinstance(event, RawLiveEvent):
+            producer.send('unrealircd', event.line)
+        else:
+            print(event)                # LiveRPCResult: connection errors
+
+    liverpc.setup({..., 'event_format': 'raw'})
+```
+
+The errors of the connection and the closure of the stream are given as
+LiveRPCResult in all the formats.
+"""
+import re
+from typing import Any, Literal, Optional, Union
+from unrealircd_rpc_py.objects.Definition import LiveRPCResult, RPCErrorModel
+from unrealircd_rpc_py.utils import json_codec
+from unrealircd_rpc_py.utils.namespace import LazyNamespace
+
+EventFormat = Literal['namespace', 'dict', 'raw']
+
+EVENT_FORMATS = ('namespace', 'dict', 'raw')
+
+_METHOD = re.compile(rb'"method"\s*:\s*"([^"]*)"')
+
+_ERROR = re.compile(rb'\s*\{[^{]*"error"\s*:\s*\{')
+"""A top-level "error" member, before any nested object (the result of
+a log event may hold "error" as a value, e.g. "level": "error")"""
+
+
+class RawLiveEvent:
+    """A line of the live stream, not decoded"""
+
+    __slots__ = ('line',)
+
+    def __init__(self, line: Union[bytes, str]) -> None:
+        self.line = line if isinstance(line, bytes) else line.encode()
+
+    @property
+    def method(self) -> Optional[str]:
+        """The first "method" member of the line, found without decoding"""
+        match = _METHOD.search(self.line)
+        return match.group(1).decode() if match else None
+
+    @property
+    def error(self) -> bool:
+        """The line holds a top-level "error" member, found without
+        decoding"""
+        return _ERROR.match(self.line) is not None
+
+    def to_dict(self) -> dict:
+        """Decode the line"""
+        return json_codec.loads(self.line)
+
+    def __bytes__(self) -> bytes:
+        return self.line
+
+    def __repr__(self) -> str:
+        return f'RawLiveEvent({self.line!r})'
+
+
+def check_event_format(event_format: str) -> str:
+    """
+    Raises:
+        ValueError: Unknown event format
+    """
+    if event_format not in EVENT_FORMATS:
+        raise ValueError(f"Unknown event_format: {event_format} "
+                         f"(one of {', '.join(EVENT_FORMATS)})")
+    return event_format
+
+
+def make_event(event_format: EventFormat, decoded: dict,
+               line: Optional[bytes] = None) -> Any:
+    """What the callback gets for a line of the stream
+
+    Args:
+        event_format (str): 'namespace', 'dict' or 'raw'
+        decoded (dict): The decoded line
+        line (bytes, optional): The line, encoded from decoded if None
+    """
+    if event_format == 'dict':
+        return decoded
+
+    if event_format == 'raw':
+        return RawLiveEvent(
+            line if line is not None else json_codec.dumps_bytes(decoded)
+        )
+
+    error = decoded.get('error', RPCErrorModel().to_dict())
+    return LiveRPCResult(
+        method=decoded.get('method', None),
+        error=RPCErrorModel(**error),
+        result=LazyNamespace.wrap(decoded.get('result', None))
+    )
+
+
+def event_dict(event: Any) -> Optional[dict]:
+    """The log event (the result) of what the callback got, in any format,
+    None if it is not a log event
+
+    :param event: A LiveRPCResult, a RawLiveEvent, the decoded line, the
+        result (LazyNamespace) or the dict of the log event itself
+    """
+    if isinstance(event, RawLiveEvent):
+        event = event.to_dict()
+    if isinstance(event, dict) and 'jsonrpc' in event:
+        event = event.get('result', None)
+    if isinstance(event, LiveRPCResult):
+        event = event.result
+    if isinstance(event, LazyNamespace):
+        event = event.to_dict()
+    return event if isinstance(event, dict) else None
+
+
+def event_failed(event: Any) -> bool:
+    """The callback got an error, in any format"""
+    if isinstance(event, LiveRPCResult):
+        return event.error.code != 0
+    if isinstance(event, RawLiveEvent):
+        return event.error
+    return isinstance(event, dict) and 'error' in event
@@ -0,0 +1,121 @@
+"""
+Helpers of the reconnect mode of the live connections:
+
+    - Backoff: the delays between the attempts, exponential with jitter
+    - EventTracker: the last log events seen, to backfill the gap with
+      log.list after a reconnection and drop the events received twice
+"""
+import random
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Iterable, Optional
+from unrealircd_rpc_py.objects.Definition import LiveRPCResult
+from unrealircd_rpc_py.utils.namespace import LazyNamespace
+
+
+def utc_timestamp() -> str:
+    """Now, in the format of the timestamps of the log events
+    (2025-01-31T12:00:00.000Z)"""
+    now = datetime.now(timezone.utc)
+    return now.strftime('%Y-%m-%dT%H:%M:%S.') + \
+        f'{now.microsecond // 1000:03d}Z'
+
+
+def setup_reconnect(params: dict
+                    ) -> tuple[Optional['Backoff'], Optional['EventTracker']]:
+    """The backoff and the event tracker of the reconnect mode, from the
+    setup params: reconnect (bool), reconnect_delay and reconnect_max_delay
+    (seconds). (None, None) if the reconnect mode is off."""
+    if not params.get('reconnect', False):
+        return None, None
+
+    return Backoff(params.get('reconnect_delay', 1.0),
+                   params.get('reconnect_max_delay', 60.0)), EventTracker()
+
+
+def log_entries(response: LiveRPCResult) -> list[dict]:
+    """The entries of a log.list reply"""
+    result = response.result
+    if isinstance(result, LazyNamespace):
+        result = result.to_dict()
+    if isinstance(result, dict):
+        result = result.get('list')
+    return result if isinstance(result, list) else []
+
+
+class Backoff:
+    """Exponential backoff with jitter: the n-th delay is drawn between
+    the half and the whole of min(max_delay, base_delay * factor ** n)"""
+
+    def __init__(self, base_delay: float = 1.0, max_delay: float = 60.0,
+                 factor: float = 2.0) -> None:
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.factor = factor
+        self.attempts = 0
+
+    def next_delay(self) -> float:
+        ceiling = min(self.max_delay,
+                      self.base_delay * self.factor ** self.attempts)
+        self.attempts += 1
+        return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+    def reset(self) -> None:
+        self.attempts = 0
+
+
+class EventTracker:
+    """The last log events seen: the timestamp of the latest one, and the
+    keys of the last `size` ones to recognize the overlap between the
+    backfill and the live stream"""
+
+    def __init__(self, size: int = 1024) -> None:
+        self.last_timestamp: Optional[str] = None
+        self.__keys: deque[tuple] = deque(maxlen=size)
+        self.__seen: set[tuple] = set()
+
+    def start(self) -> None:
+        """Mark the subscription, the backfill does not go before it"""
+        if self.last_timestamp is None:
+            self.last_timestamp = utc_timestamp()
+
+    def seen(self, event: Any) -> bool:
+        """Record an event (a log.event result or a log.list entry)
+
+        Returns:
+            bool: True if the event was already seen
+        """
+        if not isinstance(event, dict):
+            return False
+
+        key = self.__key(event)
+        if key in self.__seen:
+            return True
+
+        if len(self.__keys) == self.__keys.maxlen:
+            self.__seen.discard(self.__keys[0])
+        self.__keys.append(key)
+        self.__seen.add(key)
+
+        timestamp = event.get('timestamp')
+        if timestamp and (self.last_timestamp is None
+                          or timestamp > self.last_timestamp):
+            self.last_timestamp = timestamp
+        return False
+
+    def missed(self, entries: Iterable[dict], since: Optional[str]
+               ) -> list[dict]:
+        """The entries of log.list not seen yet from `since` (the last
+        timestamp seen before the connection was lost), oldest first; they
+        are recorded as seen"""
+        recent = sorted(
+            (entry for entry in entries if isinstance(entry, dict)
+             and (since is None or (entry.get('timestamp') or '') >= since)),
+            key=lambda entry: entry.get('timestamp') or ''
+        )
+        return [entry for entry in recent if not self.seen(entry)]
+
+    @staticmethod
+    def __key(event: dict) -> tuple:
+        return (event.get('timestamp'), event.get('log_source'),
+                event.get('event_id'), event.get('msg'))
@@ -1,5 +1,6 @@
+from concurrent.futures import Executor, ThreadPoolExecutor
 from logging import Logger
-from typing import Optional
+from typing import Any, Callable, Iterable, Optional
 from abc import ABC, abstractmethod
 from unrealircd_rpc_py.objects.Channel import Channel
 from unrealircd_rpc_py.objects.Log import Log
@@ -15,6 +16,9 @@ from unrealircd_rpc_py.objects.Whowas import Whowas
 from unrealircd_rpc_py.objects.Message import Message
 from unrealircd_rpc_py.objects.Connthrottle import ConnThrottle
 from unrealircd_rpc_py.objects.Security_group import SecurityGroup
+from unrealircd_rpc_py.utils.json_stream import JsonListStream
+from unrealircd_rpc_py.utils.read_cache import ReadCache
+from unrealircd_rpc_py.utils.snapshot_cache import SnapshotCache
 
 
 class IConnection(ABC):
@@ -25,6 +29,14 @@ class IConnection(ABC):
         self.Logs: Optional[Logger] = None
         self.unrealircd_version: Optional[tuple] = None
 
+        # Last listings of the modules (User.list_, Channel.list_...)
+        self.Snapshots: SnapshotCache = SnapshotCache(logs=self.Logs)
+        """The snapshot cache of the listings, see setup"""
+
+        # Responses of the get methods (User.get, Channel.get...)
+        self.ReadCache: ReadCache = ReadCache()
+        """The read cache of the get methods, see setup"""
+
         # Create Stats Instance
         self.Stats: Stats = Stats(self)
         """The Stats module instance"""
@@ -102,12 +114,48 @@ class IConnection(ABC):
             }
         ```
 
+        Optional keys for the http method:
+            keep_alive (bool): Reuse the connections to the server
+                instead of opening a new one per query. Defaults to False.
+            pool_size (int): Maximum number of kept-alive connections
+                shared by all the threads. Defaults to 10.
+
         Exemple Method UnixSocket (unixsocket):
         ```python
             {
                 'path_to_socket_file': '/path/to/unrealircd/data/rpc.socket'
             }
         ```
+
+        Optional keys for the unixsocket method:
+            persistent (bool): Keep the sockets open and pipeline the
+                requests on them. Defaults to False.
+            pool_size (int): Number of sockets kept open. Defaults to 1.
+            recv_size (int): Number of bytes read from the socket at once.
+                Defaults to 65536.
+            timeout (float): Seconds without receiving anything from the
+                server before a query gives up. Defaults to 10.
+
+        Optional keys for both methods (snapshot cache of the list_
+        methods and Rpc.info, see IConnection.Snapshots):
+            snapshot_ttl (float): Seconds during which a listing is
+                returned without querying the server. Defaults to 0
+                (always query).
+            snapshot_stale_ttl (float): Seconds after snapshot_ttl during
+                which the old listing is still returned while a new one
+                is fetched in the background. Defaults to 0.
+            snapshot_max_size (int): Number of listings kept.
+                Defaults to 16.
+
+        Optional keys for both methods (read cache of User.get,
+        Channel.get, Server.get, Stats.get, Server_ban.get and
+        Spamfilter.get, see IConnection.ReadCache):
+            read_cache_ttl (float | dict): Seconds a response is kept, per
+                method ({'user.get': 2, 'stats.get': 5}) or one value for
+                all of them. Defaults to 0 (always query).
+            read_cache_max_size (int): Number of responses kept.
+                Defaults to 1024.
+
         Args:
             params (dict): The params
 
@@ -140,9 +188,197 @@ class IConnection(ABC):
         """
         raise NotImplementedError()
 
+    @abstractmethod
+    def query_batch(self,
+                    queries: list[tuple[str, Optional[dict]]],
+                    jsonrpc: str = '2.0'
+                    ) -> list[dict]:
+        """Send many queries to the server in one JSON-RPC batch request.
+        The responses are matched to the queries using their ids.
+
+        ```python
+            conn.query_batch([
+                ('user.get', {'nick': 'adator'}),
+                ('channel.get', {'channel': '#jsonrpc'})
+            ])
+        ```
+
+        Args:
+            queries (list[tuple[str, Optional[dict]]]): The queries to
+                send as (method, param) tuples
+            jsonrpc (str, optional): jsonrpc. Defaults to '2.0'.
+
+        Returns:
+            list[dict]: One response per query, in the order of the queries
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def query_stream(self,
+                     method: str,
+                     param: Optional[dict] = None,
+                     jsonrpc: str = '2.0'
+                     ) -> JsonListStream:
+        """Run a list query (user.list, channel.list, log.list...) and
+        decode the entries of result.list one at a time while the response
+        is received, instead of holding the whole response in memory.
+
+        ```python
+            stream = conn.query_stream('user.list',
+                                       {'object_detail_level': 4})
+            for client in stream:
+                print(client['name'])
+
+            if stream.error:
+                print(stream.error['message'])
+        ```
+
+        Args:
+            method (str): The method to send to unrealircd
+            param (dict, optional): the paramaters to send to unrealircd.
+                Defaults to None.
+            jsonrpc (str, optional): jsonrpc. Defaults to '2.0'.
+
+        Returns:
+            JsonListStream: Iterable over the entries of the list
+        """
+        raise NotImplementedError()
+
+    def query_cached(self,
+                     method: str,
+                     param: Optional[dict] = None
+                     ) -> Optional[dict]:
+        """Run the query through the read cache: the response is reused
+        during the TTL of the method (read_cache_ttl) unless a live event
+        touched it, see ReadCache.
+
+        Args:
+            method (str): The method to send to unrealircd
+            param (dict, optional): the paramaters to send to unrealircd.
+                Defaults to None.
+
+        Returns:
+            dict: The response from the server
+            None: no response from the server
+        """
+        return self.ReadCache.get(
+            method, param, lambda: self.query(method, param)
+        )
+
+    def query_write(self,
+                    method: str,
+                    param: Optional[dict] = None
+                    ) -> Optional[dict]:
+        """Run a query changing the network (user.set_nick, server_ban.add
+        ...): once it succeeds, the responses of the read cache it touched
+        are dropped, see ReadCache.apply_write.
+
+        Args:
+            method (str): The method to send to unrealircd
+            param (dict, optional): the paramaters to send to unrealircd.
+                Defaults to None.
+
+        Returns:
+            dict: The response from the server
+            None: no response from the server
+        """
+        response = self.query(method, param)
+        self.ReadCache.apply_write(method, param, response)
+        return response
+
+    def query_batch_write(self,
+                          queries: list[tuple[str, Optional[dict]]]
+                          ) -> list[dict]:
+        """Run query_batch with queries changing the network
+        (server_ban.add...): the responses of the read cache touched by
+        each query that succeeds are dropped, see ReadCache.apply_write.
+
+        Args:
+            queries (list[tuple[str, Optional[dict]]]): The queries to
+                send as (method, param) tuples
+
+        Returns:
+            list[dict]: One response per query, in the order of the queries
+        """
+        responses = self.query_batch(queries)
+        for (method, param), response in zip(queries, responses):
+            self.ReadCache.apply_write(method, param, response)
+        return responses
+
+    def query_many(self,
+                   queries: list[tuple[str, Optional[dict]]],
+                   max_workers: int = 10,
+                   executor: Optional[Executor] = None
+                   ) -> list[Optional[dict]]:
+        """Run the queries at the same time, one request per query, on a
+        bounded pool of threads. Unlike query_batch, each query is a
+        separate request so it works with any server and the requests are
+        spread over the pooled connections.
+
+        ```python
+            conn.query_many([
+                ('user.get', {'nick': 'adator'}),
+                ('user.get', {'nick': 'Bob'})
+            ])
+        ```
+
+        Args:
+            queries (list[tuple[str, Optional[dict]]]): The queries to
+                send as (method, param) tuples
+            max_workers (int, optional): Maximum number of queries running
+                at the same time. Defaults to 10.
+            executor (Executor, optional): Use this executor instead of a
+                temporary thread pool. Defaults to None.
+
+        Returns:
+            list[Optional[dict]]: One response per query, in the order of
+                the queries
+        """
+        return self.run_many(
+            lambda query: self.query(*query), queries, max_workers, executor
+        )
+
+    def run_many(self,
+                 function: Callable[[Any], Any],
+                 arguments: Iterable[Any],
+                 max_workers: int = 10,
+                 executor: Optional[Executor] = None
+                 ) -> list[Any]:
+        """Call the function with each argument on a bounded pool of
+        threads and gather the results.
+
+        ```python
+            clients = conn.run_many(conn.User.get, ['adator', 'Bob'])
+        ```
+
+        Args:
+            function (Callable): Any method of the modules (or a function
+                using this connection)
+            arguments (Iterable): One argument per call
+            max_workers (int, optional): Maximum number of calls running
+                at the same time. Defaults to 10.
+            executor (Executor, optional): Use this executor instead of a
+                temporary thread pool. Defaults to None.
+
+        Returns:
+            list[Any]: One result per argument, in the order of the arguments
+        """
+        arguments = list(arguments)
+        if not arguments:
+            return []
+
+        if executor is not None:
+            return list(executor.map(function, arguments))
+
+        with ThreadPoolExecutor(
+            max_workers=min(max_workers, len(arguments)),
+            thread_name_prefix='unrealircd-rpc-py'
+        ) as pool:
+            return list(pool.map(function, arguments))
+
     @abstractmethod
     def get_response(self) -> Optional[dict]:
-        """Get the response from the API call
+        """Get the last response received by the current thread
 
         Returns:
             Optional[dict]: The response
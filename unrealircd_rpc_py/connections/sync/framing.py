@@ -0,0 +1,65 @@
+import socket
+from typing import Optional
+
+DEFAULT_RECV_SIZE = 65536
+"""Default number of bytes read from the socket at once"""
+
+
+class FrameReader:
+    """Read newline terminated frames (one JSON-RPC reply per line) from a
+    socket.
+
+    The received bytes are appended to one growing bytearray using a
+    preallocated receive buffer, and only the newly received bytes are
+    searched for the end of the frame, so reading a reply of N bytes
+    costs O(N) whatever the number of chunks.
+    """
+
+    def __init__(self, sock: socket.socket,
+                 recv_size: int = DEFAULT_RECV_SIZE) -> None:
+        self.sock = sock
+        self.recv_size = recv_size
+        # Bytes received so far, tells a waiting caller the server is busy
+        # sending
+        self.received = 0
+
+        self.__buffer = bytearray()
+        self.__chunk = memoryview(bytearray(recv_size))
+        self.__scanned = 0
+
+    def read_frame(self) -> Optional[bytearray]:
+        """Read the next frame
+
+        Returns:
+            bytearray: The frame without its line terminator, or what was
+                received before the server closed the connection.
+            None: The connection is closed and nothing was received.
+        """
+        buffer = self.__buffer
+
+        while True:
+            end = buffer.find(b'\n', self.__scanned)
+
+            if end != -1:
+                self.__scanned = 0
+
+                if end == len(buffer) - 1:
+                    # Most common case: the buffer holds exactly one frame
+                    self.__buffer = bytearray()
+                    del buffer[-1]
+                    return buffer
+
+                frame = buffer[:end]
+                del buffer[:end + 1]
+                return frame
+
+            self.__scanned = len(buffer)
+
+            received = self.sock.recv_into(self.__chunk)
+            if not received:
+                self.__buffer = bytearray()
+                self.__scanned = 0
+                return buffer or None
+
+            self.received += received
+            buffer += self.__chunk[:received]
@@ -1,15 +1,14 @@
-import json
 import logging
-import random
-import time
+import ssl
+import threading
 import requests
 import urllib3
 import unrealircd_rpc_py.objects.Definition as Dfn
 import unrealircd_rpc_py.utils.utils as utils
-from types import SimpleNamespace
-from typing import Optional
+from unrealircd_rpc_py.utils import json_codec
+from typing import Iterator, Optional, Union
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
-from unrealircd_rpc_py.connections.sync import __version_required__
 from unrealircd_rpc_py.exceptions.rpc_exceptions import (
     RpcConnectionError, RpcSetupError, RpcInvalidUrlFormat
 )
@@ -28,6 +27,29 @@ from unrealircd_rpc_py.objects.Message import Message
 from unrealircd_rpc_py.objects.Connthrottle import ConnThrottle
 from unrealircd_rpc_py.objects.Security_group import SecurityGroup
 from unrealircd_rpc_py.connections.sync.IConnection import IConnection
+from unrealircd_rpc_py.connections.sync.framing import DEFAULT_RECV_SIZE
+from unrealircd_rpc_py.utils.json_stream import JsonListStream
+from unrealircd_rpc_py.utils.read_cache import (
+    DEFAULT_MAX_SIZE as READ_CACHE_MAX_SIZE, ReadCache
+)
+from unrealircd_rpc_py.utils.snapshot_cache import (
+    DEFAULT_MAX_SIZE, SnapshotCache
+)
+from unrealircd_rpc_py.utils.namespace import LazyNamespace
+
+
+class TlsHttpAdapter(HTTPAdapter):
+    """HTTPAdapter that shares one SSL context between all the pooled
+    connections instead of building a new one for every connection."""
+
+    def __init__(self, ssl_context: ssl.SSLContext, **kwargs) -> None:
+        self.ssl_context = ssl_context
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, connections: int, maxsize: int,
+                         block: bool = False, **pool_kwargs) -> None:
+        pool_kwargs['ssl_context'] = self.ssl_context
+        super().init_poolmanager(connections, maxsize, block, **pool_kwargs)
 
 
 class HttpConnection(IConnection):
@@ -43,8 +65,21 @@ class HttpConnection(IConnection):
         self.__password = None
         self.unrealircd_version: Optional[tuple] = None
 
+        # Last listings of the modules (User.list_, Channel.list_...)
+        self.Snapshots: SnapshotCache = SnapshotCache(logs=self.Logs)
+        """The snapshot cache of the listings, see setup"""
+
+        # Responses of the get methods (User.get, Channel.get...)
+        self.ReadCache: ReadCache = ReadCache()
+        """The read cache of the get methods, see setup"""
+
         self.is_setup: bool = False
 
+        # Keep-alive session (only when setup with keep_alive=True)
+        self.keep_alive: bool = False
+        self.pool_size: int = 10
+        self.__session: Optional[requests.Session] = None
+
         # Create User Instance
         self.User: User = User(self)
         """The User module instance"""
@@ -108,16 +143,30 @@ class HttpConnection(IConnection):
         """Allow you to control the security group module.
         (Require unrealIRCD 6.2.2 or higher)"""
 
-        # Option 2 with Namespacescs
-        self.__response: Optional[dict] = {}
-        self.__response_np: Optional[SimpleNamespace] = SimpleNamespace()
+        # Last response of each thread, for get_response / get_response_np
+        self.__last = threading.local()
 
     def setup(self, params: dict) -> None:
         self.url = params.get('url', None)
         self.username = params.get('username', None)
         self.password = params.get('password', None)
+        self.keep_alive = params.get('keep_alive', False)
+        self.pool_size = params.get('pool_size', 10)
+
+        self.Snapshots.configure(
+            ttl=params.get('snapshot_ttl', 0),
+            stale_ttl=params.get('snapshot_stale_ttl', 0),
+            max_size=params.get('snapshot_max_size', DEFAULT_MAX_SIZE)
+        )
+        self.ReadCache.configure(
+            ttls=params.get('read_cache_ttl', 0),
+            max_size=params.get('read_cache_max_size', READ_CACHE_MAX_SIZE)
+        )
         self.is_setup = True
 
+        if self.keep_alive:
+            self.__session = self.__create_session()
+
         test = self.establish_first_connection()
         if test.error.code != 0:
             self.Logs.error(
@@ -169,32 +218,15 @@ class HttpConnection(IConnection):
         """
         # data = '{"jsonrpc": "2.0", "method": "stats.get", "params": {},
         # "id": 123}'
-        _method_impacted_by_version = [key for key in __version_required__]
-        _method = method.split('.')[0]
-        if _method in _method_impacted_by_version:
-            _req_ver = __version_required__.get(_method, None)
-            if not utils.is_version_ircd_ok(
-                    self.unrealircd_version,
-                    _req_ver
-            ):
-                return {
-                    "jsonrpc": jsonrpc,
-                    "method": method,
-                    "error": {
-                        'message': f'This object {_method} is not '
-                                   f'available for this ircd version. '
-                                   f'must be {_req_ver} or higher',
-                        'code': -1},
-                    "id": query_id}
+        version_error = utils.check_method_version(
+            method, self.unrealircd_version, query_id, jsonrpc
+        )
+        if version_error is not None:
+            return version_error
 
         get_method = method
         get_param = {} if param is None else param
-
-        if query_id == 123:
-            rand = random.randint(1, 6000)
-            get_id = int(time.time()) + rand
-        else:
-            get_id = query_id
+        get_id = utils.generate_query_id() if query_id == 123 else query_id
 
         response = {
             "jsonrpc": jsonrpc,
@@ -203,17 +235,93 @@ class HttpConnection(IConnection):
             "id": get_id
         }
 
-        request = json.dumps(response)
+        request = json_codec.dumps(response)
         response_str = self.send_to_method(request)
-        self.__set_responses(response_str)
-        response = self.get_response()
-
-        if response is None:
-            return None
+        response = self.__decode_response(response_str)
+        self.__last.response = response
 
         return response
 
-    def send_to_method(self, request: dict) -> Optional[str]:
+    def query_stream(self,
+                     method: str,
+                     param: Optional[dict] = None,
+                     jsonrpc: str = '2.0'
+                     ) -> JsonListStream:
+        """Run a list query and decode the entries of result.list while
+        the response is received
+
+        Args:
+            method (str): The method to send to unrealircd (ex. user.list)
+            param (dict, optional): the paramaters to send to unrealircd.
+                Defaults to None.
+            jsonrpc (str, optional): jsonrpc. Defaults to '2.0'.
+
+        Returns:
+            JsonListStream: Iterable over the entries of the list
+        """
+        query_id = utils.generate_query_id()
+        version_error = utils.check_method_version(
+            method, self.unrealircd_version, query_id, jsonrpc
+        )
+        if version_error is not None:
+            return JsonListStream([json_codec.dumps_bytes(version_error)])
+
+        request = json_codec.dumps({
+            "jsonrpc": jsonrpc,
+            "method": method,
+            "params": {} if param is None else param,
+            "id": query_id
+        })
+
+        return JsonListStream(self.__stream_to_method(request))
+
+    def query_batch(self,
+                    queries: list[tuple[str, Optional[dict]]],
+                    jsonrpc: str = '2.0'
+                    ) -> list[dict]:
+        """Send many queries to the server in one JSON-RPC batch request
+
+        Args:
+            queries (list[tuple[str, Optional[dict]]]): The queries to
+                send as (method, param) tuples
+            jsonrpc (str, optional): jsonrpc. Defaults to '2.0'.
+
+        Returns:
+            list[dict]: One response per query, in the order of the queries
+        """
+        batch: list[dict] = []
+        responses: list[Optional[dict]] = []
+        first_id = utils.generate_query_id()
+
+        for index, (method, param) in enumerate(queries):
+            get_id = first_id + index
+            version_error = utils.check_method_version(
+                method, self.unrealircd_version, get_id, jsonrpc
+            )
+            responses.append(version_error)
+            if version_error is None:
+                batch.append({
+                    "jsonrpc": jsonrpc,
+                    "method": method,
+                    "params": {} if param is None else param,
+                    "id": get_id
+                })
+
+        if not batch:
+            return responses
+
+        decoded = None
+        response_str = self.send_to_method(json_codec.dumps(batch))
+        try:
+            decoded = json_codec.loads(response_str) if response_str else None
+        except json_codec.JSONDecodeError as jsonerror:
+            self.Logs.error(f"Impossible to load batch response: {jsonerror}")
+
+        matched = iter(utils.match_batch_responses(batch, decoded))
+
+        return [next(matched) if r is None else r for r in responses]
+
+    def send_to_method(self, request: dict) -> Optional[Union[str, bytes]]:
         """Use requests module"""
         try:
             if not self.is_setup:
@@ -236,12 +344,16 @@ class HttpConnection(IConnection):
 
             urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
-            credentials = HTTPBasicAuth(self.username, self.password)
             jsonrequest = request
 
-            response = requests.post(
-                url=url, auth=credentials, data=jsonrequest, verify=verify
-            )
+            if self.__session is not None:
+                response = self.__session.post(url=url, data=jsonrequest)
+            else:
+                credentials = HTTPBasicAuth(self.username, self.password)
+                response = requests.post(
+                    url=url, auth=credentials, data=jsonrequest,
+                    verify=verify
+                )
 
             if response.status_code != 200:
                 self.Logs.error(
@@ -252,9 +364,10 @@ class HttpConnection(IConnection):
                         response.status_code, f"{response.text}"
                     )
                 )
-                return str(err.to_dict())
+                return err.to_json()
 
-            return response.text
+            # Decoded by the JSON codec without a str copy
+            return response.content
 
         except KeyError as ke:
             self.Logs.error(f"KeyError : {ke}")
@@ -267,13 +380,50 @@ class HttpConnection(IConnection):
             self.Logs.error(f"Initial request: {request}")
             if 'connection aborted.' in str(ce).lower().strip():
                 raise RpcConnectionError(">> Connection Aborted! <<")
-        except json.decoder.JSONDecodeError as jsonerror:
+        except json_codec.JSONDecodeError as jsonerror:
             self.Logs.error(f"jsonError {jsonerror}")
             self.Logs.error(f"Initial request: {request}")
         except Exception as err:
             self.Logs.error(f"General Error {err}")
             self.Logs.error(f"Initial request: {request}")
 
+    def __stream_to_method(self, request: str) -> Iterator[bytes]:
+        """Post the request and yield the response as it is received"""
+        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+        try:
+            if self.__session is not None:
+                response = self.__session.post(
+                    url=self.url, data=request, stream=True
+                )
+            else:
+                credentials = HTTPBasicAuth(self.username, self.password)
+                response = requests.post(
+                    url=self.url, auth=credentials, data=request,
+                    verify=False, stream=True
+                )
+        except requests.RequestException as err:
+            self.Logs.error(f"Connection Error : {err}")
+            self.Logs.error(f"Initial request: {request}")
+            err = Dfn.RPCResult(error=Dfn.RPCErrorModel(-1, f"{err}"))
+            yield err.to_json().encode()
+            return
+
+        with response:
+            if response.status_code != 200:
+                self.Logs.error(
+                    f"Status code {response.status_code} | {response.reason}"
+                )
+                err = Dfn.RPCResult(
+                    error=Dfn.RPCErrorModel(
+                        response.status_code, f"{response.text}"
+                    )
+                )
+                yield err.to_json().encode()
+                return
+
+            yield from response.iter_content(chunk_size=DEFAULT_RECV_SIZE)
+
     def establish_first_connection(self) -> Dfn.RPCResult:
         if not self.is_setup:
             self.Logs.critical(
@@ -300,8 +450,11 @@ class HttpConnection(IConnection):
 
         urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
-        credentials = HTTPBasicAuth(self.username, self.password)
-        response = requests.get(url=url, auth=credentials, verify=verify)
+        if self.__session is not None:
+            response = self.__session.get(url=url)
+        else:
+            credentials = HTTPBasicAuth(self.username, self.password)
+            response = requests.get(url=url, auth=credentials, verify=verify)
 
         if response.status_code >= 300:
             return Dfn.RPCResult(
@@ -312,31 +465,64 @@ class HttpConnection(IConnection):
         else:
             return Dfn.RPCResult()
 
-    def __set_responses(self, response: str):
-        """Set response as dict and as simple name space"""
-        # Set dict response
-        self.__response_np: Optional[SimpleNamespace] = None
-        self.__response: Optional[dict] = None
+    def close(self) -> None:
+        """Close the keep-alive session and all its pooled connections."""
+        if self.__session is not None:
+            self.__session.close()
+            self.__session = None
+
+    def __create_session(self) -> requests.Session:
+        """Create the keep-alive session.
 
+        The session holds up to `pool_size` open connections to the
+        server, all of them sharing the same SSL context. When all the
+        connections are busy, the other threads wait for a free one.
+
+        Returns:
+            requests.Session: The session
+        """
+        sslctx = ssl.create_default_context()
+        sslctx.check_hostname = False
+        sslctx.verify_mode = ssl.CERT_NONE
+
+        adapter = TlsHttpAdapter(
+            ssl_context=sslctx,
+            pool_connections=1,
+            pool_maxsize=self.pool_size,
+            pool_block=True
+        )
+
+        session = requests.Session()
+        session.auth = HTTPBasicAuth(self.username, self.password)
+        session.verify = False
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+
+        return session
+
+    def __decode_response(self, response: Optional[Union[str, bytes]]
+                          ) -> Optional[dict]:
+        """Decode the response of one query. Nothing is shared between the
+        calls so many threads can query the same connection."""
         if not response:
             self.Logs.error(f"Impossible to load response: {response}")
-            return
+            return None
 
-        self.__response = json.loads(response)
+        decoded = json_codec.loads(response)
 
-        if not isinstance(self.__response, dict):
-            self.__response = None
-            self.__response_np = None
+        if not isinstance(decoded, dict):
             self.Logs.error(f"Impossible to load response: {response}")
+            return None
 
-        # Set response name space
-        self.__response_np = utils.dict_to_namespace(self.__response)
+        return decoded
 
-    def get_response_np(self) -> Optional[SimpleNamespace]:
-        return self.__response_np
+    def get_response_np(self) -> Optional[LazyNamespace]:
+        """The last response received by the current thread, as namespace"""
+        return utils.dict_to_lazy_namespace(self.get_response())
 
     def get_response(self) -> Optional[dict]:
-        return self.__response
+        """The last response received by the current thread"""
+        return getattr(self.__last, 'response', None)
 
     @property
     def url(self) -> str:
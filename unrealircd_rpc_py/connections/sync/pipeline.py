@@ -0,0 +1,200 @@
+import logging
+import socket
+import threading
+from itertools import count
+from typing import Any, Optional
+from unrealircd_rpc_py.utils import json_codec
+from unrealircd_rpc_py.connections.sync.framing import (
+    DEFAULT_RECV_SIZE, FrameReader
+)
+from unrealircd_rpc_py.exceptions.rpc_exceptions import RpcConnectionError
+
+
+class PendingReply:
+    """A request waiting for its reply"""
+
+    __slots__ = ('event', 'response')
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.response: Optional[Any] = None
+
+
+class UnixSocketPipeline:
+    """One long-lived connection to the UnrealIRCd unix socket.
+
+    Many requests can be written back to back without waiting for the
+    previous replies. A reader thread decodes each reply line and gives
+    it back to the waiting caller using the JSON-RPC id.
+
+    Like the timeout of a socket, a caller gives up when nothing was
+    received for timeout seconds, a large reply may take longer.
+    """
+
+    def __init__(self, path_to_socket_file: str, logs: logging.Logger,
+                 timeout: float = 10,
+                 recv_size: int = DEFAULT_RECV_SIZE) -> None:
+        self.path_to_socket_file = path_to_socket_file
+        self.Logs = logs
+        self.timeout = timeout
+        self.recv_size = recv_size
+
+        self.__sock: Optional[socket.socket] = None
+        self.__reader: Optional[FrameReader] = None
+        self.__write_lock = threading.Lock()
+        self.__pending: dict[int, PendingReply] = {}
+        self.__pending_lock = threading.Lock()
+
+    @property
+    def connected(self) -> bool:
+        return self.__sock is not None
+
+    def connect(self) -> None:
+        """Open the socket and start the reader thread"""
+        sock = socket.socket(
+            socket.AddressFamily.AF_UNIX, socket.SocketKind.SOCK_STREAM
+        )
+        sock.connect(self.path_to_socket_file)
+        self.__sock = sock
+        self.__reader = FrameReader(sock, self.recv_size)
+
+        threading.Thread(
+            target=self.__read_loop, args=(sock, self.__reader),
+            name='unrealircd-rpc-py-pipeline', daemon=True
+        ).start()
+
+    def close(self) -> None:
+        """Close the socket, the waiting callers get None"""
+        with self.__write_lock:
+            sock, self.__sock = self.__sock, None
+
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            sock.close()
+
+    def request(self, request: str, ids: list[int]) -> Optional[Any]:
+        """Write the request and wait for its reply
+
+        Args:
+            request (str): The JSON request (single or batch)
+            ids (list[int]): The ids of the request. For a batch, the reply
+                is matched using any of the ids.
+
+        Returns:
+            Any: The decoded reply, None if no reply
+        """
+        waiter = PendingReply()
+        with self.__pending_lock:
+            for query_id in ids:
+                self.__pending[query_id] = waiter
+
+        try:
+            with self.__write_lock:
+                if self.__sock is None:
+                    self.connect()
+                self.__sock.sendall(f'{request}\r\n'.encode())
+
+            received = self.__received()
+            while not waiter.event.wait(self.timeout):
+                if self.__received() == received:
+                    raise TimeoutError(
+                        f'Nothing received from the server for '
+                        f'{self.timeout}s'
+                    )
+                received = self.__received()
+
+            return waiter.response
+
+        except (OSError, TimeoutError) as err:
+            self.Logs.critical(f'UnixSocket Pipeline Error: {err}')
+            return None
+
+        finally:
+            with self.__pending_lock:
+                for query_id in ids:
+                    self.__pending.pop(query_id, None)
+
+    def __received(self) -> int:
+        reader = self.__reader
+        return -1 if reader is None else reader.received
+
+    def __read_loop(self, sock: socket.socket, reader: FrameReader) -> None:
+        """Route every reply line to the caller waiting for its id"""
+        try:
+            while (line := reader.read_frame()) is not None:
+                if not line.strip():
+                    continue
+
+                try:
+                    response = json_codec.loads(line)
+                except json_codec.JSONDecodeError as jsonerror:
+                    self.Logs.error(f'Impossible to load response: '
+                                    f'{jsonerror}')
+                    continue
+
+                self.__dispatch(response)
+
+        except OSError as oserr:
+            if self.__sock is sock:
+                self.Logs.error(f'UnixSocket Pipeline closed: {oserr}')
+
+        finally:
+            with self.__write_lock:
+                if self.__sock is sock:
+                    self.__sock = None
+            self.__release_all()
+
+    def __dispatch(self, response: Any) -> None:
+        replies = response if isinstance(response, list) else [response]
+
+        with self.__pending_lock:
+            for reply in replies:
+                if not isinstance(reply, dict):
+                    continue
+                waiter = self.__pending.get(reply.get('id'))
+                if waiter is not None:
+                    waiter.response = response
+                    waiter.event.set()
+                    return
+
+        self.Logs.warning('Reply received without waiting caller')
+
+    def __release_all(self) -> None:
+        """Wake up the callers of a closed connection"""
+        with self.__pending_lock:
+            for waiter in self.__pending.values():
+                waiter.event.set()
+
+
+class UnixSocketPipelinePool:
+    """A fixed number of pipelines used in turn by the callers"""
+
+    def __init__(self, path_to_socket_file: str, logs: logging.Logger,
+                 pool_size: int = 1, timeout: float = 10,
+                 recv_size: int = DEFAULT_RECV_SIZE) -> None:
+        if pool_size < 1:
+            raise RpcConnectionError('The pool size must be at least 1')
+
+        self.pipelines = [
+            UnixSocketPipeline(path_to_socket_file, logs, timeout, recv_size)
+            for _ in range(pool_size)
+        ]
+        self.__ids = count(1)
+        self.__ids_lock = threading.Lock()
+        self.__turn = count()
+
+    def next_ids(self, number: int = 1) -> list[int]:
+        """Reserve request ids that are unique on this pool"""
+        with self.__ids_lock:
+            return [next(self.__ids) for _ in range(number)]
+
+    def request(self, request: str, ids: list[int]) -> Optional[Any]:
+        pipeline = self.pipelines[next(self.__turn) % len(self.pipelines)]
+        return pipeline.request(request, ids)
+
+    def close(self) -> None:
+        for pipeline in self.pipelines:
+            pipeline.close()
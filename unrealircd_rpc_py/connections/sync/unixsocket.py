@@ -1,14 +1,10 @@
-import json
 import logging
-import random
 import socket
-import time
+import threading
 import unrealircd_rpc_py.objects.Definition as Dfn
 import unrealircd_rpc_py.utils.utils as utils
-from types import SimpleNamespace
-from typing import Optional
-from re import findall
-from unrealircd_rpc_py.connections.sync import __version_required__
+from unrealircd_rpc_py.utils import json_codec
+from typing import Any, Iterator, Optional, Union
 from unrealircd_rpc_py.exceptions.rpc_exceptions import (
     RpcConnectionError, RpcSetupError, RpcUnixSocketFileNotFoundError
 )
@@ -27,6 +23,20 @@ from unrealircd_rpc_py.objects.Message import Message
 from unrealircd_rpc_py.objects.Connthrottle import ConnThrottle
 from unrealircd_rpc_py.objects.Security_group import SecurityGroup
 from unrealircd_rpc_py.connections.sync.IConnection import IConnection
+from unrealircd_rpc_py.utils.namespace import LazyNamespace
+from unrealircd_rpc_py.connections.sync.framing import (
+    DEFAULT_RECV_SIZE, FrameReader
+)
+from unrealircd_rpc_py.connections.sync.pipeline import (
+    UnixSocketPipelinePool
+)
+from unrealircd_rpc_py.utils.json_stream import JsonListStream
+from unrealircd_rpc_py.utils.read_cache import (
+    DEFAULT_MAX_SIZE as READ_CACHE_MAX_SIZE, ReadCache
+)
+from unrealircd_rpc_py.utils.snapshot_cache import (
+    DEFAULT_MAX_SIZE, SnapshotCache
+)
 
 
 class UnixSocketConnection(IConnection):
@@ -40,8 +50,23 @@ class UnixSocketConnection(IConnection):
 
         self.__path_to_socket_file = None
 
+        # Last listings of the modules (User.list_, Channel.list_...)
+        self.Snapshots: SnapshotCache = SnapshotCache(logs=self.Logs)
+        """The snapshot cache of the listings, see setup"""
+
+        # Responses of the get methods (User.get, Channel.get...)
+        self.ReadCache: ReadCache = ReadCache()
+        """The read cache of the get methods, see setup"""
+
         self.is_setup: bool = False
 
+        # Long-lived sockets (only when setup with persistent=True)
+        self.persistent: bool = False
+        self.pool_size: int = 1
+        self.recv_size: int = DEFAULT_RECV_SIZE
+        self.timeout: float = 10
+        self.__pipelines: Optional[UnixSocketPipelinePool] = None
+
         # Create User Instance
         self.User: User = User(self)
         """The User module instance"""
@@ -105,14 +130,33 @@ class UnixSocketConnection(IConnection):
         """Allow you to control the security group module.
         (Require unrealIRCD 6.2.2 or higher)"""
 
-        # Option 2 with Namespacescs
-        self.__response: Optional[dict] = {}
-        self.__response_np: Optional[SimpleNamespace] = SimpleNamespace()
+        # Last response of each thread, for get_response / get_response_np
+        self.__last = threading.local()
 
     def setup(self, params: dict) -> None:
         self.path_to_socket_file = params.get('path_to_socket_file', None)
+        self.persistent = params.get('persistent', False)
+        self.pool_size = params.get('pool_size', 1)
+        self.recv_size = params.get('recv_size', DEFAULT_RECV_SIZE)
+        self.timeout = params.get('timeout', 10)
+
+        self.Snapshots.configure(
+            ttl=params.get('snapshot_ttl', 0),
+            stale_ttl=params.get('snapshot_stale_ttl', 0),
+            max_size=params.get('snapshot_max_size', DEFAULT_MAX_SIZE)
+        )
+        self.ReadCache.configure(
+            ttls=params.get('read_cache_ttl', 0),
+            max_size=params.get('read_cache_max_size', READ_CACHE_MAX_SIZE)
+        )
         self.is_setup = True
 
+        if self.persistent:
+            self.__pipelines = UnixSocketPipelinePool(
+                self.path_to_socket_file, self.Logs, self.pool_size,
+                timeout=self.timeout, recv_size=self.recv_size
+            )
+
         test = self.establish_first_connection()
         if test.error.code != 0:
             self.Logs.error(
@@ -162,32 +206,19 @@ class UnixSocketConnection(IConnection):
 
         # data = '{"jsonrpc": "2.0", "method": "stats.get", "params": {},
         # "id": 123}'
-        _method_impacted_by_version = [key for key in __version_required__]
-        _method = method.split('.')[0]
-        _ircd_ver = self.unrealircd_version
-
-        if _method in _method_impacted_by_version:
-            _req_ver = __version_required__.get(_method, None)
-            if not utils.is_version_ircd_ok(_ircd_ver, _req_ver):
-                return {
-                    "jsonrpc": jsonrpc,
-                    "method": method,
-                    "error": {
-                        'message': f'This object {_method} is not available '
-                                   f'for this ircd version. '
-                                   f'must be {_req_ver} or higher',
-                        'code': -1},
-                    "id": query_id
-                }
+        version_error = utils.check_method_version(
+            method, self.unrealircd_version, query_id, jsonrpc
+        )
+        if version_error is not None:
+            return version_error
 
         get_method = method
         get_param = {} if param is None else param
-
-        if query_id == 123:
-            rand = random.randint(1, 6000)
-            get_id = int(time.time()) + rand
-        else:
-            get_id = query_id
+        # In persistent mode the id on the wire always comes from the pool,
+        # a caller id could be the one of another request in flight
+        get_id = self.__next_ids()[0] if (
+            query_id == 123 or self.__pipelines is not None
+        ) else query_id
 
         response = {
             "jsonrpc": jsonrpc,
@@ -196,17 +227,124 @@ class UnixSocketConnection(IConnection):
             "id": get_id
         }
 
-        request = json.dumps(response)
-        response_str = self.send_to_method(request)
-        self.__set_responses(response_str)
-        response = self.get_response()
+        request = json_codec.dumps(response)
 
-        if response is None:
-            return None
+        if self.__pipelines is not None:
+            response = self.__decode_response(
+                self.__pipelines.request(request, [get_id])
+            )
+            if query_id != 123 and isinstance(response, dict):
+                response['id'] = query_id
+        else:
+            response_str = self.send_to_method(request)
+            response = self.__decode_response(response_str)
+        self.__last.response = response
 
         return response
 
-    def send_to_method(self, request: dict) -> Optional[str]:
+    def query_stream(self,
+                     method: str,
+                     param: Optional[dict] = None,
+                     jsonrpc: str = '2.0'
+                     ) -> JsonListStream:
+        """Run a list query and decode the entries of result.list while
+        the response is received. A dedicated socket is used, even in
+        persistent mode.
+
+        Args:
+            method (str): The method to send to unrealircd (ex. user.list)
+            param (dict, optional): the paramaters to send to unrealircd.
+                Defaults to None.
+            jsonrpc (str, optional): jsonrpc. Defaults to '2.0'.
+
+        Returns:
+            JsonListStream: Iterable over the entries of the list
+        """
+        query_id = self.__next_ids()[0]
+        version_error = utils.check_method_version(
+            method, self.unrealircd_version, query_id, jsonrpc
+        )
+        if version_error is not None:
+            return JsonListStream([json_codec.dumps_bytes(version_error)])
+
+        request = json_codec.dumps({
+            "jsonrpc": jsonrpc,
+            "method": method,
+            "params": {} if param is None else param,
+            "id": query_id
+        })
+
+        return JsonListStream(self.__stream_to_method(request))
+
+    def query_batch(self,
+                    queries: list[tuple[str, Optional[dict]]],
+                    jsonrpc: str = '2.0'
+                    ) -> list[dict]:
+        """Send many queries to the server in one JSON-RPC batch request
+
+        Args:
+            queries (list[tuple[str, Optional[dict]]]): The queries to
+                send as (method, param) tuples
+            jsonrpc (str, optional): jsonrpc. Defaults to '2.0'.
+
+        Returns:
+            list[dict]: One response per query, in the order of the queries
+        """
+        batch: list[dict] = []
+        responses: list[Optional[dict]] = []
+        ids = self.__next_ids(len(queries))
+
+        for get_id, (method, param) in zip(ids, queries):
+            version_error = utils.check_method_version(
+                method, self.unrealircd_version, get_id, jsonrpc
+            )
+            responses.append(version_error)
+            if version_error is None:
+                batch.append({
+                    "jsonrpc": jsonrpc,
+                    "method": method,
+                    "params": {} if param is None else param,
+                    "id": get_id
+                })
+
+        if not batch:
+            return responses
+
+        decoded = None
+        if self.__pipelines is not None:
+            decoded = self.__pipelines.request(
+                json_codec.dumps(batch), [request['id'] for request in batch]
+            )
+        else:
+            response_str = self.send_to_method(json_codec.dumps(batch))
+            try:
+                decoded = (
+                    json_codec.loads(response_str) if response_str else None
+                )
+            except json_codec.JSONDecodeError as jsonerror:
+                self.Logs.error(
+                    f"Impossible to load batch response: {jsonerror}"
+                )
+
+        matched = iter(utils.match_batch_responses(batch, decoded))
+
+        return [next(matched) if r is None else r for r in responses]
+
+    def close(self) -> None:
+        """Close the long-lived sockets of the persistent mode"""
+        if self.__pipelines is not None:
+            self.__pipelines.close()
+
+    def __next_ids(self, number: int = 1) -> list[int]:
+        """Generate the ids of the requests. In persistent mode the ids
+        must be unique as the replies are routed back using them."""
+        if self.__pipelines is not None:
+            return self.__pipelines.next_ids(number)
+
+        first_id = utils.generate_query_id()
+        return [first_id + index for index in range(number)]
+
+    def send_to_method(self, request: str) -> Optional[bytearray]:
         """Use socket module"""
         sock = socket.socket(
             socket.AddressFamily.AF_UNIX, socket.SocketKind.SOCK_STREAM
@@ -220,25 +358,14 @@ class UnixSocketConnection(IConnection):
                 return None
 
             sock.connect(self.path_to_socket_file)
-            sock.settimeout(10)
+            sock.settimeout(self.timeout)
 
             if not request:
                 return None
 
             sock.sendall(f'{request}\r\n'.encode())
 
-            response = b""
-            chunk = b""
-            pattern = b'\n$'
-
-            while True:
-                chunk = sock.recv(4096)
-                response += chunk
-                if findall(pattern, chunk):
-                    break
-
-            str_data = response.decode()
-            return str_data
+            return FrameReader(sock, self.recv_size).read_frame()
 
         except AttributeError as attrerr:
             self.Logs.critical(f'AF_Unix Error: {attrerr}')
@@ -249,6 +376,27 @@ class UnixSocketConnection(IConnection):
         finally:
             sock.close()
 
+    def __stream_to_method(self, request: str) -> Iterator[bytes]:
+        """Send the request and yield the response as it is received"""
+        sock = socket.socket(
+            socket.AddressFamily.AF_UNIX, socket.SocketKind.SOCK_STREAM
+        )
+        try:
+            sock.connect(self.path_to_socket_file)
+            sock.settimeout(self.timeout)
+            sock.sendall(f'{request}\r\n'.encode())
+
+            while chunk := sock.recv(self.recv_size):
+                yield chunk
+                # The response ends with the only line terminator
+                if chunk.endswith(b'\n'):
+                    return
+
+        except OSError as oserr:
+            self.Logs.critical(f'System Error: {oserr}')
+        finally:
+            sock.close()
+
     def establish_first_connection(self) -> Dfn.RPCResult:
         if not self.is_setup:
             self.Logs.critical(
@@ -291,31 +439,32 @@ class UnixSocketConnection(IConnection):
         # Add handler to logs
         self.Logs.addHandler(stdout_hanlder)
 
-    def __set_responses(self, response: str):
-        """Set response as dict and as simple name space"""
-        # Set dict response
-        self.__response_np: Optional[SimpleNamespace] = None
-        self.__response: Optional[dict] = None
-
+    def __decode_response(self, response: Union[str, dict, Any]
+                          ) -> Optional[dict]:
+        """Decode the response of one query. Nothing is shared between the
+        calls so many threads can query the same connection."""
         if not response:
             self.Logs.error(f"Impossible to load response: {response}")
-            return
+            return None
 
-        self.__response = json.loads(response)
+        if isinstance(response, (str, bytes, bytearray)):
+            decoded = json_codec.loads(response)
+        else:
+            decoded = response
 
-        if not isinstance(self.__response, dict):
-            self.__response = None
-            self.__response_np = None
+        if not isinstance(decoded, dict):
             self.Logs.error(f"Impossible to load response: {response}")
+            return None
 
-        # Set response name space
-        self.__response_np = utils.dict_to_namespace(self.__response)
+        return decoded
 
-    def get_response_np(self) -> Optional[SimpleNamespace]:
-        return self.__response_np
+    def get_response_np(self) -> Optional[LazyNamespace]:
+        """The last response received by the current thread, as namespace"""
+        return utils.dict_to_lazy_namespace(self.get_response())
 
     def get_response(self) -> Optional[dict]:
-        return self.__response
+        """The last response received by the current thread"""
+        return getattr(self.__last, 'response', None)
 
     @property
     def path_to_socket_file(self) -> str:
@@ -0,0 +1,559 @@
+"""
+In-memory mirror of the network (users, channels, memberships and
+servers) kept up to date by the live log events.
+
+The mirror is seeded from one listing (user.list, channel.list and
+server.list), then each event of log.subscribe is applied to it: connect,
+quit, nick change, join, part, kick, and the modes or topics carried by
+the events. A periodic check lists the network again and repairs what the
+events missed.
+
+```python
+    conn = ConnectionFactory().get('unixsocket')
+    conn.setup({'path_to_socket_file': '/path/to/rpc.socket'})
+
+    mirror = NetworkMirror(conn)
+    mirror.seed()
+    mirror.start(check_interval=600)
+
+    liveconn = LiveConnectionFactory().get('unixsocket')
+    liveconn.setup({
+        'path_to_socket_file': '/path/to/rpc.socket',
+        'callback_object_instance': mirror,
+        'callback_method_or_function_name': 'apply_event'
+    })
+
+    mirror.get_user('adator')
+    mirror.channel_members('#welcome')     # {'adator': 'o', 'Bob': ''}
+```
+"""
+import threading
+from typing import TYPE_CHECKING, Any, Optional
+import unrealircd_rpc_py.objects.Definition as Dfn
+from unrealircd_rpc_py.modules.mirror.user_index import UserIndex
+from unrealircd_rpc_py.utils import decoder, utils
+
+if TYPE_CHECKING:
+    from unrealircd_rpc_py.connections.sync.IConnection import IConnection
+
+
+def _lower(name: Optional[str]) -> Optional[str]:
+    return name.lower() if isinstance(name, str) else None
+
+
+class _State:
+    """What the mirror holds, swapped at once by seed and check"""
+
+    __slots__ = ('users', 'nicks', 'channels', 'members', 'servers',
+                 'index')
+
+    def __init__(self, indexed: bool = False) -> None:
+        self.users: dict[str, Dfn.Client] = {}
+        """The users by id"""
+        self.nicks: dict[str, str] = {}
+        """The ids by lowercase nick"""
+        self.channels: dict[str, Dfn.Channel] = {}
+        """The channels by lowercase name"""
+        self.members: dict[str, dict[str, str]] = {}
+        """The level of each member id, by lowercase channel name"""
+        self.servers: dict[str, Dfn.ClientServer] = {}
+        """The servers by lowercase name"""
+        self.index: Optional[UserIndex] = UserIndex() if indexed else None
+        """The users by account, country, server, AS and IP"""
+
+
+class NetworkMirror:
+    """Users, channels, memberships and servers of the network, updated by
+    the live log events instead of being listed again.
+
+    The event ids are the ones of UnrealIRCd
+    (https://www.unrealircd.org/docs/List_of_all_log_messages), more can
+    be added to the class attributes. The other events carrying a client
+    or a channel update the fields they carry (modes, topic, account...).
+
+    The models returned are the ones of the mirror, copy them before
+    modifying them.
+    """
+
+    CONNECT_EVENTS = frozenset(('LOCAL_CLIENT_CONNECT',
+                                'REMOTE_CLIENT_CONNECT'))
+    QUIT_EVENTS = frozenset(('LOCAL_CLIENT_DISCONNECT',
+                             'REMOTE_CLIENT_DISCONNECT'))
+    NICK_EVENTS = frozenset(('LOCAL_NICK_CHANGE', 'REMOTE_NICK_CHANGE',
+                             'FORCED_NICK_CHANGE'))
+    JOIN_EVENTS = frozenset(('LOCAL_CLIENT_JOIN', 'REMOTE_CLIENT_JOIN'))
+    PART_EVENTS = frozenset(('LOCAL_CLIENT_PART', 'REMOTE_CLIENT_PART'))
+    KICK_EVENTS = frozenset(('LOCAL_CLIENT_KICK', 'REMOTE_CLIENT_KICK'))
+    LINK_EVENTS = frozenset(('SERVER_LINKED',))
+    SPLIT_EVENTS = frozenset(('SERVER_DELINKED', 'SERVER_SQUIT'))
+
+    def __init__(self, connection: 'IConnection',
+                 object_detail_level: int = 2,
+                 indexed: bool = False) -> None:
+        """
+        Args:
+            connection (IConnection): The connection used to list the
+                network
+            object_detail_level (int, optional): The detail level of the
+                user.list used by seed and check, 2 or more to get the
+                channels of the users. Defaults to 2.
+            indexed (bool, optional): Keep a UserIndex of the users, see
+                find_users. Defaults to False.
+        """
+        self.Connection = connection
+        self.Logs = connection.Logs
+        self.object_detail_level = object_detail_level
+        self.indexed = indexed
+
+        self.seeded = False
+        self.events_applied = 0
+        """Events that changed the mirror"""
+        self.events_ignored = 0
+        """Events that do not concern the mirror"""
+        self.checks = 0
+        """Listings done by seed and check"""
+        self.last_drift: dict[str, int] = {}
+        """Differences found by the last check, see check"""
+
+        self.__state = _State(indexed)
+        self.__lock = threading.RLock()
+        self.__listing = threading.Lock()
+        self.__pending: Optional[list[dict]] = None
+        self.__stop = threading.Event()
+        self.__checker: Optional[threading.Thread] = None
+
+    def seed(self) -> bool:
+        """Build the mirror from one listing of the network
+
+        Returns:
+            bool: False if the network could not be listed
+        """
+        return self.__relist() is not None
+
+    def check(self) -> dict[str, int]:
+        """List the network again and replace the mirror, counting what
+        the events had missed
+
+        Returns:
+            dict[str, int]: The users, channels, memberships and servers
+                added or removed by the listing, empty if the network
+                could not be listed
+        """
+        with self.__lock:
+            before = self.__state
+
+        after = self.__relist()
+        if after is None:
+            return {}
+
+        self.last_drift = {
+            'users': self.__drift(before.users, after.users),
+            'channels': self.__drift(before.channels, after.channels),
+            'memberships': self.__drift(
+                {(channel, member) for channel, members
+                 in before.members.items() for member in members},
+                {(channel, member) for channel, members
+                 in after.members.items() for member in members}
+            ),
+            'servers': self.__drift(before.servers, after.servers)
+        }
+        if any(self.last_drift.values()):
+            self.Logs.debug(f'NetworkMirror check: {self.last_drift}')
+        return self.last_drift
+
+    def start(self, check_interval: float = 600) -> None:
+        """Run check every check_interval seconds in a background thread
+
+        Args:
+            check_interval (float, optional): Seconds between two checks.
+                Defaults to 600.
+        """
+        self.stop()
+        self.__stop.clear()
+
+        def run() -> None:
+            while not self.__stop.wait(check_interval):
+                try:
+                    self.check()
+                except Exception as err:
+                    self.Logs.error(f'NetworkMirror check: {err}')
+
+        self.__checker = threading.Thread(
+            target=run, name='unrealircd-rpc-py-mirror', daemon=True
+        )
+        self.__checker.start()
+
+    def stop(self) -> None:
+        """Stop the periodic check"""
+        self.__stop.set()
+        if self.__checker is not None:
+            self.__checker.join()
+            self.__checker = None
+
+    def apply_event(self, event: Any) -> bool:
+        """Apply a live log event, can be given as the live callback
+
+        Args:
+            event (Any): What the live callback got, in any event_format,
+                its result, or the decoded dict of the event
+
+        Returns:
+            bool: True if the event changed the mirror
+        """
+        data = utils.live_event_to_dict(event)
+        if data is None:
+            self.events_ignored += 1
+            return False
+
+        with self.__lock:
+            if self.__pending is not None:
+                # Applied on the listing once it is received
+                self.__pending.append(data)
+                return False
+
+            applied = self.__apply(self.__state, data)
+
+        if applied:
+            self.events_applied += 1
+        else:
+            self.events_ignored += 1
+        return applied
+
+    def get_user(self, nickoruid: str) -> Optional[Dfn.Client]:
+        """The user of a nick or an id, None if unknown"""
+        with self.__lock:
+            state = self.__state
+            user = state.users.get(nickoruid)
+            if user is None:
+                user = state.users.get(
+                    state.nicks.get(_lower(nickoruid), '')
+                )
+            return user
+
+    def get_channel(self, name: str) -> Optional[Dfn.Channel]:
+        """The channel of a name, None if unknown"""
+        with self.__lock:
+            return self.__state.channels.get(_lower(name))
+
+    def get_server(self, name: str) -> Optional[Dfn.ClientServer]:
+        """The server of a name, None if unknown"""
+        with self.__lock:
+            return self.__state.servers.get(_lower(name))
+
+    def channel_members(self, name: str) -> dict[str, str]:
+        """The level of each member of a channel, by nick"""
+        with self.__lock:
+            state = self.__state
+            return {state.users[member].name: level for member, level
+                    in state.members.get(_lower(name), {}).items()
+                    if member in state.users}
+
+    def find_users(self, **conditions: str) -> list[Dfn.Client]:
+        """The users matching all the conditions, see UserIndex.find
+
+        ```python
+            mirror.find_users(country='FR', cidr='10.0.0.0/8')
+        ```
+
+        Raises:
+            RuntimeError: The mirror was created without indexed=True
+        """
+        with self.__lock:
+            if self.__state.index is None:
+                raise RuntimeError('NetworkMirror(indexed=True) is '
+                                   'required by find_users')
+            return self.__state.index.find(**conditions)
+
+    def user_channels(self, nickoruid: str) -> list[Dfn.UserChannel]:
+        """The channels of a user, empty if unknown"""
+        user = self.get_user(nickoruid)
+        return list(user.user.channels) if user is not None else []
+
+    @property
+    def users(self) -> list[Dfn.Client]:
+        with self.__lock:
+            return list(self.__state.users.values())
+
+    @property
+    def channels(self) -> list[Dfn.Channel]:
+        with self.__lock:
+            return list(self.__state.channels.values())
+
+    @property
+    def servers(self) -> list[Dfn.ClientServer]:
+        with self.__lock:
+            return list(self.__state.servers.values())
+
+    def stats(self) -> dict[str, int]:
+        """The size of the mirror and the counters"""
+        with self.__lock:
+            state = self.__state
+            return {
+                'users': len(state.users),
+                'channels': len(state.channels),
+                'servers': len(state.servers),
+                'events_applied': self.events_applied,
+                'events_ignored': self.events_ignored,
+                'checks': self.checks
+            }
+
+    def __relist(self) -> Optional[_State]:
+        """List the network into a new state, apply the events received
+        meanwhile and install it"""
+        with self.__listing:
+            return self.__relist_once()
+
+    def __relist_once(self) -> Optional[_State]:
+        with self.__lock:
+            self.__pending = []
+
+        try:
+            state = self.__list()
+        except Exception as err:
+            self.Logs.error(f'NetworkMirror listing: {err}')
+            state = None
+
+        with self.__lock:
+            pending, self.__pending = self.__pending, None
+            if state is None:
+                # Keep the current state, the events go to it
+                for data in pending:
+                    self.__apply(self.__state, data)
+                return None
+
+            for data in pending:
+                self.__apply(state, data)
+            self.__state = state
+            self.seeded = True
+            self.checks += 1
+            return state
+
+    def __list(self) -> Optional[_State]:
+        state = _State(self.indexed)
+
+        for client in self.Connection.User.iter_(self.object_detail_level):
+            if client.error.code != 0:
+                self.Logs.error(f'NetworkMirror user.list: '
+                                f'{client.error.message}')
+                return None
+            self.__add_user(state, client)
+
+        for channel in self.Connection.Channel.iter_(1):
+            if channel.error.code != 0:
+                self.Logs.error(f'NetworkMirror channel.list: '
+                                f'{channel.error.message}')
+                return None
+            state.channels[_lower(channel.name)] = channel
+
+        for server in self.Connection.Server.list_():
+            if server.error.code != 0:
+                self.Logs.error(f'NetworkMirror server.list: '
+                                f'{server.error.message}')
+                return None
+            # Shared with the snapshot cache, the servers are never
+            # modified, only replaced
+            state.servers[_lower(server.name)] = server
+
+        for user in state.users.values():
+            for user_channel in user.user.channels:
+                name = _lower(user_channel.name)
+                state.members.setdefault(name, {})[user.id] = (
+                    user_channel.level or ''
+                )
+                if name not in state.channels:
+                    state.channels[name] = Dfn.Channel(
+                        name=user_channel.name
+                    )
+
+        return state
+
+    def __apply(self, state: _State, data: dict) -> bool:
+        event_id = data.get('event_id')
+        client = data.get('client')
+        client = client if isinstance(client, dict) else {}
+
+        if event_id in self.CONNECT_EVENTS:
+            if not client.get('id'):
+                return False
+            self.__remove_user(state, client.get('id'))
+            self.__add_user(state, decoder.decode(Dfn.Client, client))
+            return True
+
+        user = self.__find(state, client)
+
+        if event_id in self.QUIT_EVENTS:
+            return user is not None and self.__remove_user(state, user.id)
+
+        if event_id in self.NICK_EVENTS:
+            new_nick = data.get('new_nick')
+            if user is None or not isinstance(new_nick, str):
+                return False
+            state.nicks.pop(_lower(user.name), None)
+            user.name = new_nick
+            state.nicks[_lower(new_nick)] = user.id
+            return True
+
+        channel = data.get('channel')
+        if isinstance(channel, str):
+            channel = {'name': channel}
+        channel = channel if isinstance(channel, dict) else {}
+
+        if event_id in self.JOIN_EVENTS:
+            return user is not None and self.__join(state, user, channel)
+
+        if event_id in self.PART_EVENTS:
+            return user is not None and self.__part(state, user, channel)
+
+        if event_id in self.KICK_EVENTS:
+            victim = data.get('victim')
+            victim = self.__find(
+                state, victim if isinstance(victim, dict) else {}
+            )
+            return victim is not None and self.__part(state, victim, channel)
+
+        if event_id in self.LINK_EVENTS and client.get('name'):
+            state.servers[_lower(client['name'])] = decoder.decode(
+                Dfn.ClientServer, client
+            )
+            return True
+
+        if event_id in self.SPLIT_EVENTS and client.get('name'):
+            return self.__split(state, client['name'])
+
+        return self.__update(state, user, client, channel)
+
+    def __find(self, state: _State, client: dict) -> Optional[Dfn.Client]:
+        user = state.users.get(client.get('id'))
+        if user is None and isinstance(client.get('name'), str):
+            user = state.users.get(
+                state.nicks.get(_lower(client['name']), '')
+            )
+        return user
+
+    def __add_user(self, state: _State, user: Dfn.Client) -> None:
+        state.users[user.id] = user
+        state.nicks[_lower(user.name)] = user.id
+        if state.index is not None:
+            state.index.add(user)
+
+    def __remove_user(self, state: _State, user_id: str) -> bool:
+        user = state.users.pop(user_id, None)
+        if user is None:
+            return False
+
+        if state.nicks.get(_lower(user.name)) == user_id:
+            del state.nicks[_lower(user.name)]
+        if state.index is not None:
+            state.index.remove(user_id)
+        for user_channel in user.user.channels:
+            self.__remove_member(state, _lower(user_channel.name), user_id)
+        return True
+
+    def __join(self, state: _State, user: Dfn.Client, channel: dict) -> bool:
+        name = _lower(channel.get('name'))
+        if name is None:
+            return False
+
+        members = state.members.setdefault(name, {})
+        if user.id in members:
+            return False
+
+        # The first member of a new channel gets the ops
+        level = 'o' if name not in state.channels else ''
+        if name not in state.channels:
+            state.channels[name] = decoder.decode(Dfn.Channel, channel)
+
+        members[user.id] = level
+        user.user.channels.append(
+            Dfn.UserChannel(name=channel.get('name'), level=level)
+        )
+        state.channels[name].num_users = len(members)
+        return True
+
+    def __part(self, state: _State, user: Dfn.Client, channel: dict) -> bool:
+        name = _lower(channel.get('name'))
+        if name is None or user.id not in state.members.get(name, {}):
+            return False
+
+        user.user.channels = [user_channel for user_channel
+                              in user.user.channels
+                              if _lower(user_channel.name) != name]
+        self.__remove_member(state, name, user.id)
+        return True
+
+    def __remove_member(self, state: _State, name: str, user_id: str
+                        ) -> None:
+        members = state.members.get(name)
+        if members is None:
+            return
+
+        members.pop(user_id, None)
+        channel = state.channels.get(name)
+        if members:
+            if channel is not None:
+                channel.num_users = len(members)
+            return
+
+        del state.members[name]
+        # A permanent channel (+P) stays without members
+        if channel is not None and 'P' not in (channel.modes or ''):
+            del state.channels[name]
+
+    def __split(self, state: _State, server_name: str) -> bool:
+        """Drop a server and its users"""
+        name = _lower(server_name)
+        if state.servers.pop(name, None) is None:
+            return False
+
+        for user in [user for user in state.users.values()
+                     if _lower(user.user.servername) == name]:
+            self.__remove_user(state, user.id)
+        return True
+
+    def __update(self, state: _State, user: Optional[Dfn.Client],
+                 client: dict, channel: dict) -> bool:
+        """Copy the fields carried by the event (modes, topic...)"""
+        updated = False
+
+        if user is not None and isinstance(client.get('user'), dict):
+            # The event may carry a part of the client only (the modes)
+            fresh = decoder.decode(Dfn.Client, client)
+            old_nick = _lower(user.name)
+            self.__copy_fields(user, fresh, client,
+                               ('id', 'user', 'geoip', 'tls'))
+            for part in ('user', 'geoip', 'tls'):
+                if isinstance(client.get(part), dict):
+                    self.__copy_fields(getattr(user, part),
+                                       getattr(fresh, part), client[part],
+                                       ('channels',))
+            if old_nick != _lower(user.name) and \
+                    state.nicks.get(old_nick) == user.id:
+                del state.nicks[old_nick]
+            # Indexed again with the new fields
+            self.__add_user(state, user)
+            updated = True
+
+        kept = state.channels.get(_lower(channel.get('name')))
+        if kept is not None:
+            fresh = decoder.decode(Dfn.Channel, channel)
+            for field_name in ('creation_time', 'topic', 'topic_set_by',
+                               'topic_set_at', 'modes'):
+                if field_name in channel:
+                    setattr(kept, field_name, getattr(fresh, field_name))
+                    updated = True
+
+        return updated
+
+    @staticmethod
+    def __copy_fields(kept: Any, fresh: Any, data: dict,
+                      skipped: tuple[str, ...]) -> None:
+        """Copy onto kept the fields of fresh present in data"""
+        for key in data:
+            field_name = key.replace('-', '_')
+            if key not in skipped and hasattr(kept, field_name):
+                setattr(kept, field_name, getattr(fresh, field_name))
+
+    @staticmethod
+    def __drift(before: Any, after: Any) -> int:
+        """Number of keys in only one of before and after"""
+        return len(set(before) ^ set(after))
@@ -0,0 +1,344 @@
+"""
+Changes between two listings of the users or the channels: connections,
+quits, nick changes, joins, parts, level and topic changes...
+
+A Snapshot keeps the raw JSON entries of a listing by key (the id of the
+users, the name of the channels) with a fingerprint of each entry (hash of
+its JSON encoding). Two snapshots are compared by key and fingerprint in
+one pass; only the entries added, removed or changed are decoded into
+models and compared field by field.
+
+```python
+    before = Snapshot.take(conn, 'user.list', object_detail_level=2)
+    ...
+    after = Snapshot.take(conn, 'user.list', object_detail_level=2)
+
+    for change in diff_users(before, after):
+        if isinstance(change, NickChanged):
+            print(change.old_nick, '->', change.new_nick)
+```
+
+The fields listed in `ignore` (idle_since by default) are left out of the
+fingerprints, they change on every listing.
+"""
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Optional
+import unrealircd_rpc_py.objects.Definition as Dfn
+from unrealircd_rpc_py.objects.Definition import MainModel
+from unrealircd_rpc_py.utils import decoder, json_codec, serializer
+
+if TYPE_CHECKING:
+    from unrealircd_rpc_py.connections.sync.IConnection import IConnection
+
+IGNORED_FIELDS = frozenset(('idle_since',))
+"""Fields left out of the fingerprints by default"""
+
+KEYS = {'user.list': 'id', 'channel.list': 'name'}
+"""The key of the entries of each listing"""
+
+
+###########
+# Changes #
+###########
+@dataclass(slots=True)
+class Change(MainModel):
+    """Parent of the changes"""
+
+
+@dataclass(slots=True)
+class UserConnected(Change):
+    user: Dfn.Client = field(default_factory=Dfn.Client)
+
+
+@dataclass(slots=True)
+class UserQuit(Change):
+    user: Dfn.Client = field(default_factory=Dfn.Client)
+
+
+@dataclass(slots=True)
+class NickChanged(Change):
+    user: Dfn.Client = field(default_factory=Dfn.Client)
+    old_nick: str = None
+    new_nick: str = None
+
+
+@dataclass(slots=True)
+class UserChanged(Change):
+    """Other fields of a user changed (modes, account, away...)"""
+    user: Dfn.Client = field(default_factory=Dfn.Client)
+    fields: list[str] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class MemberJoined(Change):
+    channel: str = None
+    nick: str = None
+    level: str = None
+
+
+@dataclass(slots=True)
+class MemberParted(Change):
+    channel: str = None
+    nick: str = None
+
+
+@dataclass(slots=True)
+class MemberLevelChanged(Change):
+    channel: str = None
+    nick: str = None
+    old_level: str = None
+    new_level: str = None
+
+
+@dataclass(slots=True)
+class ChannelCreated(Change):
+    channel: Dfn.Channel = field(default_factory=Dfn.Channel)
+
+
+@dataclass(slots=True)
+class ChannelRemoved(Change):
+    channel: Dfn.Channel = field(default_factory=Dfn.Channel)
+
+
+@dataclass(slots=True)
+class TopicChanged(Change):
+    channel: Dfn.Channel = field(default_factory=Dfn.Channel)
+    old_topic: str = None
+    new_topic: str = None
+
+
+@dataclass(slots=True)
+class ChannelChanged(Change):
+    """Other fields of a channel changed (modes, num_users...)"""
+    channel: Dfn.Channel = field(default_factory=Dfn.Channel)
+    fields: list[str] = field(default_factory=list)
+
+
+############
+# Snapshot #
+############
+class Snapshot:
+    """Raw entries of a listing and their fingerprints, by key"""
+
+    __slots__ = ('key', 'ignore', 'entries', 'fingerprints')
+
+    def __init__(self, entries: Iterable[dict], key: str = 'id',
+                 ignore: Iterable[str] = IGNORED_FIELDS) -> None:
+        """
+        Args:
+            entries (Iterable[dict]): The JSON entries of the listing, as
+                yielded by IConnection.query_stream
+            key (str, optional): The field identifying an entry.
+                Defaults to 'id'.
+            ignore (Iterable[str], optional): Fields left out of the
+                fingerprints. Defaults to IGNORED_FIELDS.
+        """
+        self.key = key
+        self.ignore = frozenset(ignore)
+        self.entries: dict[Any, dict] = {}
+        self.fingerprints: dict[Any, int] = {}
+
+        fingerprint = self.__fingerprinter()
+        for entry in entries:
+            entry_key = entry.get(key)
+            self.entries[entry_key] = entry
+            self.fingerprints[entry_key] = fingerprint(entry)
+
+    @classmethod
+    def take(cls, connection: 'IConnection', method: str,
+             object_detail_level: int = 2,
+             ignore: Iterable[str] = IGNORED_FIELDS) -> 'Snapshot':
+        """List the users or the channels as a snapshot, without
+        building the models
+
+        Args:
+            connection (IConnection): The connection
+            method (str): 'user.list' or 'channel.list'
+            object_detail_level (int, optional): The detail level of the
+                listing. Defaults to 2.
+            ignore (Iterable[str], optional): Fields left out of the
+                fingerprints. Defaults to IGNORED_FIELDS.
+
+        Raises:
+            KeyError: Unknown method
+            ValueError: The server answered with an error
+
+        Returns:
+            Snapshot: The snapshot
+        """
+        stream = connection.query_stream(
+            method, {'object_detail_level': object_detail_level}
+        )
+        snapshot = cls(stream, KEYS[method], ignore)
+        if stream.error:
+            raise ValueError(f"{method}: {stream.error.get('message')} "
+                             f"({stream.error.get('code')})")
+        return snapshot
+
+    @classmethod
+    def from_models(cls, models: Iterable[MainModel], key: str = 'id',
+                    ignore: Iterable[str] = IGNORED_FIELDS) -> 'Snapshot':
+        """Snapshot of a listing already decoded (e.g. User.list_)"""
+        return cls((serializer.to_dict(model) for model in models
+                    if model.error.code == 0), key, ignore)
+
+    def __fingerprinter(self) -> Callable[[dict], int]:
+        dumps_bytes = json_codec.dumps_bytes
+        ignore = self.ignore
+        if not ignore:
+            return lambda entry: hash(dumps_bytes(entry))
+
+        def fingerprint(entry: dict) -> int:
+            return hash(dumps_bytes({name: value for name, value
+                                     in entry.items()
+                                     if name not in ignore}))
+        return fingerprint
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self.entries
+
+
+########
+# Diff #
+########
+def changed_keys(old: Snapshot, new: Snapshot
+                 ) -> tuple[list[Any], list[Any], list[Any]]:
+    """The keys added, removed and changed between two snapshots
+
+    Returns:
+        tuple[list, list, list]: added, removed, changed
+    """
+    old_fingerprints = old.fingerprints
+    get = old_fingerprints.get
+    # Comparing the fingerprints only, unchanged entries stay untouched
+    differing = [key for key, fingerprint in new.fingerprints.items()
+                 if get(key) != fingerprint]
+    added = [key for key in differing if key not in old_fingerprints]
+    changed = [key for key in differing if key in old_fingerprints]
+    removed = list(old_fingerprints.keys() - new.fingerprints.keys())
+    return added, removed, changed
+
+
+def changed_fields(old: dict, new: dict, ignore: Iterable[str] = ()
+                   ) -> list[str]:
+    """The fields differing between two entries, the fields of the nested
+    objects as 'user.modes'"""
+    fields: list[str] = []
+    for name in old.keys() | new.keys():
+        if name in ignore:
+            continue
+        old_value, new_value = old.get(name), new.get(name)
+        if old_value == new_value:
+            continue
+        if isinstance(old_value, dict) and isinstance(new_value, dict):
+            fields.extend(f'{name}.{nested}' for nested
+                          in changed_fields(old_value, new_value))
+        else:
+            fields.append(name)
+    return sorted(fields)
+
+
+def diff_users(old: Snapshot, new: Snapshot) -> list[Change]:
+    """The changes between two snapshots of user.list, the memberships
+    are compared when the listings hold the channels of the users
+    (object_detail_level 2 or more)
+
+    Returns:
+        list[Change]: UserConnected, UserQuit, NickChanged, UserChanged,
+            MemberJoined, MemberParted and MemberLevelChanged
+    """
+    added, removed, changed = changed_keys(old, new)
+    changes: list[Change] = []
+
+    for key in added:
+        entry = new.entries[key]
+        changes.append(UserConnected(decoder.decode(Dfn.Client, entry)))
+        changes.extend(_memberships(entry.get('name'), {},
+                                    _channels(entry)))
+
+    for key in removed:
+        entry = old.entries[key]
+        changes.append(UserQuit(decoder.decode(Dfn.Client, entry)))
+        changes.extend(_memberships(entry.get('name'), _channels(entry),
+                                    {}))
+
+    for key in changed:
+        before, after = old.entries[key], new.entries[key]
+        fields = [name for name in changed_fields(before, after, new.ignore)
+                  if name not in ('name', 'user.channels')]
+        user = None
+        if before.get('name') != after.get('name') or fields:
+            user = decoder.decode(Dfn.Client, after)
+        if before.get('name') != after.get('name'):
+            changes.append(NickChanged(user, before.get('name'),
+                                       after.get('name')))
+        if fields:
+            changes.append(UserChanged(user, fields))
+        changes.extend(_memberships(after.get('name'), _channels(before),
+                                    _channels(after)))
+
+    return changes
+
+
+def diff_channels(old: Snapshot, new: Snapshot) -> list[Change]:
+    """The changes between two snapshots of channel.list
+
+    Returns:
+        list[Change]: ChannelCreated, ChannelRemoved, TopicChanged and
+            ChannelChanged
+    """
+    added, removed, changed = changed_keys(old, new)
+    changes: list[Change] = []
+
+    for key in added:
+        changes.append(ChannelCreated(
+            decoder.decode(Dfn.Channel, new.entries[key])
+        ))
+
+    for key in removed:
+        changes.append(ChannelRemoved(
+            decoder.decode(Dfn.Channel, old.entries[key])
+        ))
+
+    for key in changed:
+        before, after = old.entries[key], new.entries[key]
+        channel = decoder.decode(Dfn.Channel, after)
+        fields = changed_fields(before, after, new.ignore)
+        if before.get('topic') != after.get('topic'):
+            changes.append(TopicChanged(channel, before.get('topic'),
+                                        after.get('topic')))
+        fields = [name for name in fields if not name.startswith('topic')]
+        if fields:
+            changes.append(ChannelChanged(channel, fields))
+
+    return changes
+
+
+def _channels(entry: dict) -> dict[str, Optional[str]]:
+    """The level of the user on each channel of a user.list entry"""
+    channels = (entry.get('user') or {}).get('channels') or ()
+    memberships: dict[str, Optional[str]] = {}
+    for channel in channels:
+        if isinstance(channel, dict):
+            memberships[channel.get('name')] = channel.get('level')
+        else:
+            # Before UnrealIRCd 6.1 the channels are names only
+            memberships[channel] = None
+    return memberships
+
+
+def _memberships(nick: str, before: dict[str, Optional[str]],
+                 after: dict[str, Optional[str]]) -> list[Change]:
+    changes: list[Change] = []
+    for channel, level in after.items():
+        if channel not in before:
+            changes.append(MemberJoined(channel, nick, level))
+        elif before[channel] != level:
+            changes.append(MemberLevelChanged(channel, nick,
+                                              before[channel], level))
+    for channel in before.keys() - after.keys():
+        changes.append(MemberParted(channel, nick))
+    return changes
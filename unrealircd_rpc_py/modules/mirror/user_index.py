@@ -0,0 +1,262 @@
+"""
+Indexed store of users (Dfn.Client), to find the users of an account, a
+country, a server, an AS or an IP range without scanning all of them.
+
+    - account, country, servername and asname: hash indexes
+    - ip: a trie of the address bytes (one level per byte), a CIDR query
+      walks the bytes of its prefix then gathers the users below
+
+```python
+    index = UserIndex(conn.User.list_(4))
+    index.by_cidr('192.168.1.0/24')
+    index.find(country='FR', cidr='2a01:cb00::/32')
+    index.count_by('servername')             # {'irc.local': 120, ...}
+
+    index.add(client)                        # New or updated user
+    index.remove(client.id)
+```
+
+The index is not thread-safe, NetworkMirror(indexed=True) keeps one
+under its lock.
+"""
+import ipaddress
+from typing import Any, Iterable, Iterator, Optional, Union
+import unrealircd_rpc_py.objects.Definition as Dfn
+
+FIELDS: dict[str, tuple[str, str]] = {
+    'account': ('user', 'account'),
+    'country': ('geoip', 'country_code'),
+    'servername': ('user', 'servername'),
+    'asname': ('geoip', 'asname'),
+}
+"""The hash indexes: name -> path of the value in the Client model"""
+
+IpKey = tuple[int, bytes]
+
+
+def _ip_key(ip: Optional[str]) -> Optional[IpKey]:
+    """(version, packed address) of an IP, None if it is not valid"""
+    try:
+        address = ipaddress.ip_address(ip)
+    except ValueError:
+        return None
+    return address.version, address.packed
+
+
+class _Node:
+    """One byte of the addresses: the children by next byte, and the ids
+    of the users at the full address for the last byte"""
+
+    __slots__ = ('children', 'ids')
+
+    def __init__(self) -> None:
+        self.children: dict[int, '_Node'] = {}
+        self.ids: set[str] = set()
+
+
+class IpTrie:
+    """Trie of IPv4 and IPv6 addresses with a stride of one byte"""
+
+    def __init__(self) -> None:
+        self.__roots = {4: _Node(), 6: _Node()}
+
+    def add(self, key: IpKey, user_id: str) -> None:
+        version, packed = key
+        node = self.__roots[version]
+        for byte in packed:
+            child = node.children.get(byte)
+            if child is None:
+                child = node.children[byte] = _Node()
+            node = child
+        node.ids.add(user_id)
+
+    def remove(self, key: IpKey, user_id: str) -> None:
+        version, packed = key
+        path = [self.__roots[version]]
+        for byte in packed:
+            node = path[-1].children.get(byte)
+            if node is None:
+                return
+            path.append(node)
+
+        path[-1].ids.discard(user_id)
+        # Drop the nodes left empty
+        for depth in range(len(packed), 0, -1):
+            node = path[depth]
+            if node.ids or node.children:
+                break
+            del path[depth - 1].children[packed[depth - 1]]
+
+    def lookup(self, network: Union[ipaddress.IPv4Network,
+                                    ipaddress.IPv6Network]) -> set[str]:
+        """The ids of the users in the network"""
+        packed = network.network_address.packed
+        full_bytes, bits = divmod(network.prefixlen, 8)
+
+        node = self.__roots[network.version]
+        for byte in packed[:full_bytes]:
+            node = node.children.get(byte)
+            if node is None:
+                return set()
+
+        nodes = [node]
+        if bits:
+            # The children sharing the first bits of the partial byte
+            first = packed[full_bytes]
+            nodes = [child for byte, child in node.children.items()
+                     if byte >> (8 - bits) == first >> (8 - bits)]
+
+        ids: set[str] = set()
+        while nodes:
+            node = nodes.pop()
+            ids.update(node.ids)
+            nodes.extend(node.children.values())
+        return ids
+
+
+class UserIndex:
+    """Users by id, with hash indexes (see FIELDS) and an IP trie"""
+
+    def __init__(self, users: Iterable[Dfn.Client] = ()) -> None:
+        self.__users: dict[str, Dfn.Client] = {}
+        self.__keys: dict[str, tuple[tuple[Any, ...], Optional[IpKey]]] = {}
+        self.__indexes: dict[str, dict[Any, set[str]]] = {
+            name: {} for name in FIELDS
+        }
+        self.__ips = IpTrie()
+        self.extend(users)
+
+    def add(self, user: Dfn.Client) -> None:
+        """Add a user, or update it if its id is already indexed"""
+        if user.id is None or user.error.code != 0:
+            return
+
+        self.remove(user.id)
+
+        values = tuple(getattr(getattr(user, first), second, None)
+                       for first, second in FIELDS.values())
+        for name, value in zip(FIELDS, values):
+            if value is not None:
+                self.__indexes[name].setdefault(value, set()).add(user.id)
+
+        ip_key = _ip_key(user.ip)
+        if ip_key is not None:
+            self.__ips.add(ip_key, user.id)
+
+        self.__users[user.id] = user
+        self.__keys[user.id] = (values, ip_key)
+
+    def extend(self, users: Iterable[Dfn.Client]) -> None:
+        for user in users:
+            self.add(user)
+
+    def remove(self, user_id: str) -> bool:
+        """Remove a user by id
+
+        Returns:
+            bool: False if the user was not indexed
+        """
+        keys = self.__keys.pop(user_id, None)
+        if keys is None:
+            return False
+
+        values, ip_key = keys
+        for name, value in zip(FIELDS, values):
+            ids = self.__indexes[name].get(value)
+            if ids is not None:
+                ids.discard(user_id)
+                if not ids:
+                    del self.__indexes[name][value]
+
+        if ip_key is not None:
+            self.__ips.remove(ip_key, user_id)
+
+        del self.__users[user_id]
+        return True
+
+    def get(self, user_id: str) -> Optional[Dfn.Client]:
+        return self.__users.get(user_id)
+
+    def by_account(self, account: str) -> list[Dfn.Client]:
+        return self.find(account=account)
+
+    def by_country(self, country_code: str) -> list[Dfn.Client]:
+        return self.find(country=country_code)
+
+    def by_server(self, servername: str) -> list[Dfn.Client]:
+        return self.find(servername=servername)
+
+    def by_asname(self, asname: str) -> list[Dfn.Client]:
+        return self.find(asname=asname)
+
+    def by_ip(self, ip: str) -> list[Dfn.Client]:
+        return self.find(ip=ip)
+
+    def by_cidr(self, cidr: str) -> list[Dfn.Client]:
+        return self.find(cidr=cidr)
+
+    def find(self, **conditions: str) -> list[Dfn.Client]:
+        """The users matching all the conditions
+
+        ```python
+            index.find(country='FR', cidr='10.0.0.0/8')
+        ```
+
+        Args:
+            **conditions: account, country, servername or asname equal to
+                the value, ip equal to the address, cidr in the network
+                (e.g. '192.168.0.0/16').
+
+        Raises:
+            KeyError: Unknown condition
+            ValueError: Invalid ip or cidr
+
+        Returns:
+            list[Client]: The users
+        """
+        selected: Optional[set[str]] = None
+        # The smallest sets first, the intersections stay small
+        for ids in sorted((self.__select(name, value)
+                           for name, value in conditions.items()), key=len):
+            selected = set(ids) if selected is None else selected & ids
+            if not selected:
+                return []
+
+        if selected is None:
+            return list(self.__users.values())
+        return [self.__users[user_id] for user_id in selected]
+
+    def count_by(self, name: str) -> dict[Any, int]:
+        """Number of users per value of a hash index (see FIELDS)"""
+        return {value: len(ids) for value, ids
+                in self.__indexes[name].items()}
+
+    def values(self, name: str) -> list[Any]:
+        """The distinct values of a hash index (see FIELDS)"""
+        return list(self.__indexes[name])
+
+    def __select(self, name: str, value: str) -> set[str]:
+        if name in self.__indexes:
+            return self.__indexes[name].get(value, set())
+
+        if name == 'ip':
+            network = ipaddress.ip_network(value)
+            return self.__ips.lookup(network)
+
+        if name == 'cidr':
+            network = ipaddress.ip_network(value, strict=False)
+            return self.__ips.lookup(network)
+
+        raise KeyError(name)
+
+    def __len__(self) -> int:
+        return len(self.__users)
+
+    def __contains__(self, user_id: str) -> bool:
+        return user_id in self.__users
+
+    def __iter__(self) -> Iterator[Dfn.Client]:
+        return iter(list(self.__users.values()))
+
+    def __repr__(self) -> str:
+        return f'UserIndex({len(self)} users)'
@@ -213,7 +213,10 @@ class ToSql:
         sql.delete_obj_from_db(sql.delete(ChannelMembers))
 
         for rpc_channel in rpc_channels:
-            _c = rpc_channel.to_dict()
+            _c = rpc_channel.to_dict(
+                exclude={'bans', 'ban_exemptions', 'invite_exceptions',
+                         'members', 'error'}
+            )
             c_id = utils.generate_ids()
 
             if not isinstance(_c['creation_time'], datetime):
@@ -222,15 +225,8 @@ class ToSql:
                     self._date_format
                     ) if _c['creation_time'] is not None else None
 
-            keys_pop = ['bans', 'ban_exemptions',
-                        'invite_exceptions', 'members',
-                        'error']
-            channel_members = rpc_channel.members
-            [_c.pop(keypop) for keypop in keys_pop]
-
-            for chan_member in channel_members:
-                _cm = chan_member.to_dict()
-                [_cm.pop(keypop) for keypop in ['geoip', 'user', 'tls']]
+            for chan_member in rpc_channel.members:
+                _cm = chan_member.to_dict(exclude={'geoip', 'user', 'tls'})
                 _cm['channel_id'] = c_id
                 db_chanmember_models.append(ChannelMembers(**_cm))
 
@@ -262,7 +258,7 @@ class ToSql:
         sql.delete_obj_from_db(sql.delete(Client))
 
         for rpc_client in rpc_clients:
-            _c = rpc_client.to_dict()
+            _c = rpc_client.to_dict(exclude={'geoip', 'tls', 'user', 'error'})
 
             if not isinstance(_c['connected_since'], datetime):
                 _c['connected_since'] = datetime.strptime(
@@ -272,11 +268,9 @@ class ToSql:
                     _c['idle_since'], self._date_format
                     ) if _c['idle_since'] is not None else None
 
-            keys_pop = ['geoip', 'tls', 'user', 'error']
             _user = rpc_client.user
             _user.security_groups = '; '.join(_user.security_groups)
             _user.channels = '; '.join([c.name for c in _user.channels])
-            [_c.pop(keypop) for keypop in keys_pop]
 
             _dict_user = _user.to_dict()
             if not isinstance(_dict_user['away_since'], datetime):
@@ -308,7 +302,7 @@ class ToSql:
         sql.delete_obj_from_db(sql.delete(NameBan))
 
         for rpc_nb in rpc_nbs:
-            _c = rpc_nb.to_dict()
+            _c = rpc_nb.to_dict(exclude={'error'})
 
             if not isinstance(_c['set_at'], datetime):
                 _c['set_at'] = datetime.strptime(
@@ -318,9 +312,6 @@ class ToSql:
                     _c['expire_at'], self._date_format
                     ) if _c['expire_at'] is not None else None
 
-            keys_pop = ['error']
-            [_c.pop(keypop) for keypop in keys_pop]
-
             dbmodels.append(NameBan(**_c))
 
         if sql.insert_multiple_objs_to_db(dbmodels):
@@ -343,7 +334,7 @@ class ToSql:
         sql.delete_obj_from_db(sql.delete(Server))
 
         for rpc_cserv in rpc_servs:
-            _cs = rpc_cserv.to_dict()
+            _cs = rpc_cserv.to_dict(exclude={'server', 'error', 'tls'})
 
             if not isinstance(_cs['connected_since'], datetime):
                 _cs['connected_since'] = datetime.strptime(
@@ -353,19 +344,14 @@ class ToSql:
                     _cs['idle_since'], self._date_format
                     ) if _cs['idle_since'] is not None else None
 
-            _server = rpc_cserv.server.to_dict()
+            _server = rpc_cserv.server.to_dict(exclude={'features'})
             if not isinstance(_server['boot_time'], datetime):
                 _server['boot_time'] = datetime.strptime(
                     _server['boot_time'], self._date_format
                     ) if _server['boot_time'] is not None else None
 
-            keys_pop = ['server', 'error', 'tls']
-            [_cs.pop(keypop) for keypop in keys_pop]
-
             db_clientserver_models.append(ClientServer(**_cs))
 
-            keys_pop = ['features']
-            [_server.pop(keypop) for keypop in keys_pop]
             db_server_models.append(Server(id=rpc_cserv.id, **_server))
 
         db_clientserver_models.extend(db_server_models)
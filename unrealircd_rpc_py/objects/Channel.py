@@ -1,6 +1,7 @@
-from typing import TYPE_CHECKING, Literal
+from typing import TYPE_CHECKING, Iterator, Literal
 import unrealircd_rpc_py.objects.Definition as Dfn
-from unrealircd_rpc_py.utils import utils
+from unrealircd_rpc_py.objects.Table import ChannelTable
+from unrealircd_rpc_py.utils import decoder, utils
 
 if TYPE_CHECKING:
     from unrealircd_rpc_py.connections.sync.IConnection import IConnection
@@ -8,14 +9,19 @@ if TYPE_CHECKING:
 
 class Channel:
 
-    DB_CHANNELS: list[Dfn.Channel] = []
-
     def __init__(self, connection: 'IConnection') -> None:
 
         # Get the Connection instance
         self.Connection = connection
         self.Logs = connection.Logs
 
+    @property
+    def DB_CHANNELS(self) -> list[Dfn.Channel]:
+        """The channels of the last Channel.list_,
+        the error or the empty listing included (IConnection.Snapshots)
+        """
+        return self.Connection.Snapshots.latest('channel.list', [])
+
     def list_(self, object_detail_level: Literal[0, 1, 2, 3, 4] = 1
               ) -> list[Dfn.Channel]:
         """List channels.
@@ -36,8 +42,16 @@ class Channel:
             Channel: List of Channel object, None if nothing see the
                 Error property
         """
+        return self.Connection.Snapshots.get(
+            ('channel.list', object_detail_level),
+            lambda: self.__list(object_detail_level)
+        )
+
+    def __list(self, object_detail_level: Literal[0, 1, 2, 3, 4] = 1
+               ) -> list[Dfn.Channel]:
+        """Query channel.list and build the models"""
         try:
-            self.DB_CHANNELS = []
+            db_channels: list[Dfn.Channel] = []
             response: dict[str, dict] = self.Connection.query(
                 method='channel.list',
                 param={'object_detail_level': object_detail_level}
@@ -47,44 +61,17 @@ class Channel:
             if response_model.error.code != 0:
                 self.Logs.error(f"Code: {response_model.error.code} "
                                 f"- Msg: {response_model.error.message}")
-                self.DB_CHANNELS.append(
+                db_channels.append(
                     Dfn.Channel(error=response_model.error)
                 )
-                return self.DB_CHANNELS
+                return db_channels
 
             channels: list[dict] = response_model.result.get('list', [])
 
             for channel in channels:
-                channel_copy: dict = channel.copy()
-
-                for key in ['bans', 'ban_exemptions', 'invite_exceptions',
-                            'members']:
-                    channel_copy.pop(key, None)
-
-                self.DB_CHANNELS.append(
-                        Dfn.Channel(
-                            **channel_copy,
-                            bans=[
-                                Dfn.ChannelBans(**ban) for ban in
-                                channel.get('bans', [])],
-                            ban_exemptions=[
-                                Dfn.ChannelBanExemptions(**ban_ex)
-                                for ban_ex in channel.get(
-                                    'ban_exemptions', [])
-                            ],
-                            invite_exceptions=[
-                                Dfn.ChannelInviteExceptions(**inv_ex)
-                                for inv_ex in channel.get(
-                                    'invite_exceptions', [])
-                            ],
-                            members=[
-                                Dfn.ChannelMembers(**member)
-                                for member in channel.get('members', [])
-                            ]
-                        )
-                )
+                db_channels.append(self.__build_listed_channel(channel))
 
-            return self.DB_CHANNELS
+            return db_channels
 
         except KeyError as ke:
             self.Logs.error(f'KeyError: {ke}')
@@ -93,6 +80,81 @@ class Channel:
             self.Logs.error(f'General error: {err}')
             return []
 
+    def iter_(self, object_detail_level: Literal[0, 1, 2, 3, 4] = 1
+              ) -> Iterator[Dfn.Channel]:
+        """Iterate over the channels, one Channel at a time, while the
+        list is received. Unlike list_, the whole list is never held in
+        memory and nothing is kept in the snapshot cache (DB_CHANNELS).
+
+        Args:
+            object_detail_level (int, optional): set the detail of the
+                response object, see the Detail level column in Structure
+                of a channel. Defaults to 1.
+
+        Yields:
+            Channel: The Channel objects, or one Channel with the error
+                property set
+        """
+        try:
+            stream = self.Connection.query_stream(
+                method='channel.list',
+                param={'object_detail_level': object_detail_level}
+            )
+
+            for channel in stream:
+                yield self.__build_listed_channel(channel)
+
+            if stream.error:
+                error = decoder.decode(Dfn.RPCErrorModel, stream.error)
+                self.Logs.error(f"Code: {error.code} "
+                                f"- Msg: {error.message}")
+                yield Dfn.Channel(error=error)
+
+        except KeyError as ke:
+            self.Logs.error(f'KeyError: {ke}')
+        except Exception as err:
+            self.Logs.error(f'General error: {err}')
+
+    def list_columns(self, object_detail_level: Literal[0, 1, 2, 3, 4] = 1
+                     ) -> ChannelTable:
+        """List channels as a columnar ChannelTable (one array per
+        attribute), filled while the list is received.
+
+        Args:
+            object_detail_level (int, optional): set the detail of the
+                response object, see the Detail level column in Structure
+                of a channel. Defaults to 1.
+
+        Returns:
+            ChannelTable: The channels, see the error property of the table
+        """
+        try:
+            table = ChannelTable()
+            stream = self.Connection.query_stream(
+                method='channel.list',
+                param={'object_detail_level': object_detail_level}
+            )
+            table.extend(stream)
+
+            if stream.error:
+                error = decoder.decode(Dfn.RPCErrorModel, stream.error)
+                self.Logs.error(f"Code: {error.code} "
+                                f"- Msg: {error.message}")
+                return ChannelTable(error=error)
+
+            return table
+
+        except KeyError as ke:
+            self.Logs.error(f'KeyError: {ke}')
+            return ChannelTable(error=Dfn.RPCErrorModel(-1, ke.__str__()))
+        except Exception as err:
+            self.Logs.error(f'General error: {err}')
+            return ChannelTable(error=Dfn.RPCErrorModel(-1, err.__str__()))
+
+    def __build_listed_channel(self, channel: dict) -> Dfn.Channel:
+        """Build the Channel model from an entry of channel.list"""
+        return decoder.decode(Dfn.Channel, channel)
+
     def get(self, channel: str, object_detail_level: int = 3) -> Dfn.Channel:
         """Retrieve all details of a single channel.
         This returns more information than a channel.list call, see the end
@@ -109,7 +171,7 @@ class Channel:
             Channel: The Channel Object, None if nothing see Error property
         """
         try:
-            response: dict[str, dict] = self.Connection.query(
+            response: dict[str, dict] = self.Connection.query_cached(
                 method='channel.get',
                 param={'channel': channel,
                        'object_detail_level': object_detail_level})
@@ -122,77 +184,67 @@ class Channel:
 
             channel: dict = response_model.result.get('channel', {})
 
-            channel_copy: dict = channel.copy()
-            for key in ['bans', 'ban_exemptions', 'invite_exceptions',
-                        'members']:
-                channel_copy.pop(key, None)
+            return self.__build_channel(channel)
 
-            members: list[dict] = channel.get('members', [])
-            db_members: list[Dfn.ChannelMembers] = []
+        except KeyError as ke:
+            self.Logs.error(f'KeyError: {ke}')
+            return Dfn.Channel(error=Dfn.RPCErrorModel(-1, ke.__str__()))
+        except Exception as err:
+            self.Logs.error(f'General error: {err}')
+            return Dfn.Channel(error=Dfn.RPCErrorModel(-1, err.__str__()))
 
-            for member in members:
-                user_dict: dict[str, dict] = member.get(
-                    'user', Dfn.User().to_dict()
-                )
-                tls_dict: dict[str, dict] = member.get(
-                    'tls', Dfn.Tls().to_dict()
-                )
-                geoip_dict: dict[str, dict] = member.get(
-                    'geoip', Dfn.Geoip().to_dict()
-                )
+    def get_many(self, channels: list[str], object_detail_level: int = 3
+                 ) -> list[Dfn.Channel]:
+        """Retrieve all details of many channels in one batch request.
 
-                if 'security-groups' in user_dict:
-                    # rename key
-                    user_dict['security_groups'] = user_dict.pop(
-                        'security-groups'
-                    )
+        Args:
+            channels (list[str]): The names of the channels
+            object_detail_level (int, optional): set the detail of the
+                response object, see the Detail level column in Structure of
+                a channel. Defaults to 3.
+
+        Returns:
+            list[Channel]: One Channel object per name, in the same order.
+                See the error property of each Channel.
+        """
+        try:
+            responses: list[dict] = self.Connection.query_batch(
+                [('channel.get', {'channel': channel,
+                                  'object_detail_level': object_detail_level})
+                 for channel in channels]
+            )
+
+            db_channels: list[Dfn.Channel] = []
+
+            for response in responses:
+                response_model = utils.construct_rpc_response(response)
 
-                if 'country-code' in geoip_dict:
-                    geoip_dict['country_code'] = geoip_dict.pop(
-                        'country-code'
+                if response_model.error.code != 0:
+                    self.Logs.error(f"Code: {response_model.error.code} "
+                                    f"- Msg: {response_model.error.message}")
+                    db_channels.append(
+                        Dfn.Channel(error=response_model.error)
                     )
+                    continue
 
-                for key in ['user', 'tls', 'geoip']:
-                    member.pop(key, None)
-
-                user_obj = Dfn.User(**user_dict)
-                tls_obj = Dfn.Tls(**tls_dict)
-                geoip_obj = Dfn.Geoip(**geoip_dict)
-
-                member_obj = Dfn.ChannelMembers(**member,
-                                                user=user_obj,
-                                                tls=tls_obj,
-                                                geoip=geoip_obj)
-
-                db_members.append(member_obj)
-
-            channel_obj = Dfn.Channel(
-                        **channel_copy,
-                        bans=[
-                            Dfn.ChannelBans(**ban)
-                            for ban in channel.get('bans', [])
-                        ],
-                        ban_exemptions=[
-                            Dfn.ChannelBanExemptions(**ban_ex)
-                            for ban_ex in channel.get('ban_exemptions', [])
-                        ],
-                        invite_exceptions=[
-                            Dfn.ChannelInviteExceptions(**inv_ex)
-                            for inv_ex in channel.get('invite_exceptions', [])
-                        ],
-                        # members=[Dfn.ChannelMembers(**member)
-                        # for member in channel.get('members', [])]
-                        members=db_members
+                db_channels.append(
+                    self.__build_channel(
+                        response_model.result.get('channel', {})
                     )
+                )
 
-            return channel_obj
+            return db_channels
 
         except KeyError as ke:
             self.Logs.error(f'KeyError: {ke}')
-            return Dfn.Channel(error=Dfn.RPCErrorModel(-1, ke.__str__()))
+            return []
         except Exception as err:
             self.Logs.error(f'General error: {err}')
-            return Dfn.Channel(error=Dfn.RPCErrorModel(-1, err.__str__()))
+            return []
+
+    def __build_channel(self, channel: dict) -> Dfn.Channel:
+        """Build the Channel model from the channel object of channel.get"""
+        return decoder.decode(Dfn.Channel, channel)
 
     def set_mode(self, channel: str, modes: str, parameters: str = ""
                  ) -> Dfn.RPCResult:
@@ -207,7 +259,7 @@ class Channel:
             bool: True if success
         """
         try:
-            response: dict[str, dict] = self.Connection.query(
+            response: dict[str, dict] = self.Connection.query_write(
                 method='channel.set_mode',
                 param={"channel": channel, "modes": modes,
                        "parameters": parameters}
@@ -244,7 +296,7 @@ class Channel:
             bool: True if success
         """
         try:
-            response: dict[str, dict] = self.Connection.query(
+            response: dict[str, dict] = self.Connection.query_write(
                 method='channel.set_topic',
                 param={"channel": channel, "topic": topic, "set_by": set_by,
                        "set_at": set_at}
@@ -277,7 +329,7 @@ class Channel:
             bool: True if success
         """
         try:
-            response: dict[str, dict] = self.Connection.query(
+            response: dict[str, dict] = self.Connection.query_write(
                 method='channel.kick',
                 param={"channel": channel, "nick": nick, "reason": reason}
             )
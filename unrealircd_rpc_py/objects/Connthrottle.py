@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 import unrealircd_rpc_py.objects.Definition as Dfn
-from unrealircd_rpc_py.utils import utils
+from unrealircd_rpc_py.utils import decoder, utils
 
 if TYPE_CHECKING:
     from unrealircd_rpc_py.connections.sync.IConnection import IConnection
@@ -31,21 +31,7 @@ class ConnThrottle:
                                 f"- Msg: {response_model.error.message}")
                 return Dfn.ConnThrottle(error=response_model.error)
 
-            _status: dict = response_model.result
-            _counters = _status.pop('counters')
-            _stats_last_minute = _status.pop('stats_last_minute')
-            _config = _status.pop('config')
-            if 'except' in _config:
-                _config['exceptions'] = _config.pop('except')
-
-            connthrottle = Dfn.ConnThrottle(
-                **_status,
-                counters=Dfn.CTCounters(**_counters),
-                stats_last_minute=Dfn.CTStatsLastMinute(**_stats_last_minute),
-                config=Dfn.CTConfig(**_config)
-                )
-
-            return connthrottle
+            return decoder.decode(Dfn.ConnThrottle, response_model.result)
 
         except KeyError as ke:
             self.Logs.error(f'KeyError: {ke}')
@@ -1,8 +1,9 @@
-from dataclasses import dataclass, field, asdict, fields
+from dataclasses import dataclass, field, fields
 from json import dumps
-from typing import Any, Optional
+from typing import Any, Iterable, Optional
 from warnings import warn
 from functools import wraps
+from unrealircd_rpc_py.utils import serializer
 
 
 def deprecated(reason: str = "Deprecated"):
@@ -19,30 +20,43 @@ def deprecated(reason: str = "Deprecated"):
     return decorator
 
 
-@dataclass
+@dataclass(slots=True)
 class MainModel:
     """Parent Model contains important methods"""
-    def to_dict(self) -> dict[str, Any]:
+    def to_dict(self, exclude: Optional[Iterable[str]] = None
+                ) -> dict[str, Any]:
         """Return the fields of a dataclass instance as a
-        new dictionary mapping field names to field values."""
-        return asdict(self)
+        new dictionary mapping field names to field values.
 
-    def to_json(self) -> str:
-        """Return the object of a dataclass a json str."""
-        return dumps(self.to_dict())
+        Args:
+            exclude (Iterable[str], optional): The fields to skip
+        """
+        return serializer.to_dict(self, exclude)
+
+    def to_json(self, exclude: Optional[Iterable[str]] = None) -> str:
+        """Return the object of a dataclass a json str.
+
+        The str is the one of json.dumps whatever the JSON backend
+        installed, use to_json_bytes for the fastest encoding."""
+        return dumps(self.to_dict(exclude))
+
+    def to_json_bytes(self, exclude: Optional[Iterable[str]] = None
+                      ) -> bytes:
+        """Return the object of a dataclass as json bytes (UTF-8)."""
+        return serializer.to_json_bytes(self, exclude)
 
     def get_attributes(self) -> list[str]:
         """Return a list of attributes name"""
         return [f.name for f in fields(self)]
 
 
-@dataclass
+@dataclass(slots=True)
 class RPCErrorModel(MainModel):
     code: int = 0
     message: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class RPCError(MainModel):
     """This model will contain the error if any"""
     """{"jsonrpc": "2.0", "method": "rpc.set_issuer", "id": 123,
@@ -53,7 +67,7 @@ class RPCError(MainModel):
     error: RPCErrorModel = field(default_factory=RPCErrorModel)
 
 
-@dataclass
+@dataclass(slots=True)
 class RPCResult(MainModel):
     """This the JSONRPC Model Result"""
     jsonrpc: str = "2.0"
@@ -63,7 +77,7 @@ class RPCResult(MainModel):
     id: int = 123
 
 
-@dataclass
+@dataclass(slots=True)
 class LiveRPCError(MainModel):
     """This the Live JSONRPC Model Error"""
     jsonrpc: str = "2.0"
@@ -72,7 +86,7 @@ class LiveRPCError(MainModel):
     error: RPCErrorModel = field(default_factory=RPCErrorModel)
 
 
-@dataclass
+@dataclass(slots=True)
 class LiveRPCResult(MainModel):
     """This the Live JSONRPC Model Result"""
     jsonrpc: str = "2.0"
@@ -82,13 +96,13 @@ class LiveRPCResult(MainModel):
     id: int = 123
 
 
-@dataclass
+@dataclass(slots=True)
 class Tls(MainModel):
     certfp: str = None
     cipher: str = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Geoip(MainModel):
     country_code: str = None
     asn: str = None
@@ -99,7 +113,7 @@ class Geoip(MainModel):
 #################
 
 
-@dataclass
+@dataclass(slots=True)
 class UserChannel(MainModel):
     """User Class
     """
@@ -107,7 +121,7 @@ class UserChannel(MainModel):
     level: str = None
 
 
-@dataclass
+@dataclass(slots=True)
 class User(MainModel):
     """User Class
 
@@ -133,7 +147,7 @@ class User(MainModel):
     channels: list[UserChannel] = field(default_factory=list[UserChannel])
 
 
-@dataclass
+@dataclass(slots=True)
 class Client(MainModel):
     """User Class
 
@@ -163,7 +177,7 @@ class Client(MainModel):
 # Server Class #
 #################
 
-@dataclass
+@dataclass(slots=True)
 class ServerModule(MainModel):
     """Server Class (.module_list)
     """
@@ -177,7 +191,7 @@ class ServerModule(MainModel):
     error: RPCErrorModel = field(default_factory=RPCErrorModel)
 
 
-@dataclass
+@dataclass(slots=True)
 class ServerRehashClient(MainModel):
     """Server Class (.rehash)
     """
@@ -191,7 +205,7 @@ class ServerRehashClient(MainModel):
     idle_since: str = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ServerRehashLogSource(MainModel):
     """Server Class (.rehash)
     """
@@ -200,7 +214,7 @@ class ServerRehashLogSource(MainModel):
     function: str = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ServerRehashLog(MainModel):
     """Server Class (.rehash)
 
@@ -220,7 +234,7 @@ class ServerRehashLog(MainModel):
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class ServerRehash(MainModel):
     """Server Class (.rehash)
 
@@ -240,13 +254,13 @@ class ServerRehash(MainModel):
     error: RPCErrorModel = field(default_factory=RPCErrorModel)
 
 
-@dataclass
+@dataclass(slots=True)
 class ServerRpcModules(MainModel):
     name: str = None
     version: str = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ServerFeatures(MainModel):
     """Server Class
 
@@ -265,7 +279,7 @@ class ServerFeatures(MainModel):
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class Server(MainModel):
     """Server Class
 
@@ -283,7 +297,7 @@ class Server(MainModel):
     features: ServerFeatures = field(default_factory=ServerFeatures)
 
 
-@dataclass
+@dataclass(slots=True)
 class ClientServer(MainModel):
     """Server Class
 
@@ -310,7 +324,7 @@ class ClientServer(MainModel):
 #################
 # Channel Class #
 #################
-@dataclass
+@dataclass(slots=True)
 class ChannelBans(MainModel):
     """Channel Class"""
     name: str = None
@@ -318,7 +332,7 @@ class ChannelBans(MainModel):
     set_at: str = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ChannelBanExemptions(MainModel):
     """Channel Class"""
     name: str = None
@@ -326,7 +340,7 @@ class ChannelBanExemptions(MainModel):
     set_at: str = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ChannelInviteExceptions(MainModel):
     """Channel Class"""
     name: str = None
@@ -334,7 +348,7 @@ class ChannelInviteExceptions(MainModel):
     set_at: str = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ChannelMembers(MainModel):
     """Channel Class
 
@@ -358,7 +372,7 @@ class ChannelMembers(MainModel):
     tls: Tls = field(default_factory=Tls)
 
 
-@dataclass
+@dataclass(slots=True)
 class Channel(MainModel):
     """Channel Class
 
@@ -390,7 +404,7 @@ class Channel(MainModel):
     error: RPCErrorModel = field(default_factory=RPCErrorModel)
 
 
-@dataclass
+@dataclass(slots=True)
 class NameBan(MainModel):
     """Name Ban class"""
     type: str = None
@@ -408,7 +422,7 @@ class NameBan(MainModel):
     error: RPCErrorModel = field(default_factory=RPCErrorModel)
 
 
-@dataclass
+@dataclass(slots=True)
 class ServerBan(MainModel):
     """Server Ban class"""
     type: str = None
@@ -426,7 +440,7 @@ class ServerBan(MainModel):
     error: RPCErrorModel = field(default_factory=RPCErrorModel)
 
 
-@dataclass
+@dataclass(slots=True)
 class ServerBanException(MainModel):
     """Server Ban Exception class"""
     type: str = None
@@ -445,7 +459,7 @@ class ServerBanException(MainModel):
     error: RPCErrorModel = field(default_factory=RPCErrorModel)
 
 
-@dataclass
+@dataclass(slots=True)
 class Spamfilter(MainModel):
     """Spamfilters class"""
     type: str = None
@@ -470,7 +484,7 @@ class Spamfilter(MainModel):
     error: RPCErrorModel = field(default_factory=RPCErrorModel)
 
 
-@dataclass
+@dataclass(slots=True)
 class RpcInfo(MainModel):
     """Rpc Class"""
     name: str = None
@@ -482,21 +496,21 @@ class RpcInfo(MainModel):
 #################
 #  Stats Class  #
 #################
-@dataclass
+@dataclass(slots=True)
 class StatsServer(MainModel):
     """Stats Class"""
     total: int = 0
     ulined: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class StatsUserCountries(MainModel):
     """Stats Class"""
     country: str = None
     count: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class StatsUser(MainModel):
     """Stats Class
 
@@ -514,7 +528,7 @@ class StatsUser(MainModel):
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class StatsServerBan(MainModel):
     """Stats Class"""
     total: int = 0
@@ -524,13 +538,13 @@ class StatsServerBan(MainModel):
     server_ban_exception: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class StatsChannel(MainModel):
     """Stats Class"""
     total: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class Stats(MainModel):
     """Stats Class
 
@@ -552,7 +566,7 @@ class Stats(MainModel):
 ##################
 #  Whowas Class  #
 ##################
-@dataclass
+@dataclass(slots=True)
 class WhowasUser(MainModel):
     username: str = None
     realname: str = None
@@ -561,7 +575,7 @@ class WhowasUser(MainModel):
     account: str = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Whowas(MainModel):
     """Whowas Class
 
@@ -588,33 +602,35 @@ class Whowas(MainModel):
 ######################
 
 
-@dataclass
+@dataclass(slots=True)
 class CTCounters(MainModel):
     local_count: int = 0
     global_count: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class CTStatsLastMinute(MainModel):
     rejected_clients: int = 0
     allowed_except: int = 0
     allowed_unknown_users: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class CTConfig(MainModel):
     local_throttle_count: int = 0
     local_throttle_period: int = 0
     global_throttle_count: int = 0
     global_throttle_period: int = 0
     start_delay: int = 0
-    exceptions: dict = field(default_factory=dict())  # Working With 6.2.5
+    exceptions: dict = field(
+        default_factory=dict, metadata={'aliases': ('except',)}
+    )  # Working With 6.2.5
     except_reputation_score: int = 0
     except_sasl_bypass: bool = False
     except_webirc_bypass: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class ConnThrottle(MainModel):
     """Connection Throttle Class
 
@@ -643,7 +659,7 @@ class ConnThrottle(MainModel):
 #######################
 
 
-@dataclass
+@dataclass(slots=True)
 class SecurityGroup(MainModel):
     name: str = None
     priority: int = 0
@@ -3,10 +3,10 @@ Log object for UnrealIRCd JSON-RPC
 Minimum Unrealircd version: 6.1.8
 """
 import unrealircd_rpc_py.objects.Definition as Dfn
-from types import SimpleNamespace
-from typing import Union, Literal, Optional, TYPE_CHECKING
+from typing import Iterator, Union, Literal, Optional, TYPE_CHECKING
 from time import time
-from unrealircd_rpc_py.utils import utils
+from unrealircd_rpc_py.utils import decoder, utils
+from unrealircd_rpc_py.utils.namespace import LazyNamespace
 
 if TYPE_CHECKING:
     from unrealircd_rpc_py.connections.sync.IConnection import IConnection
@@ -21,7 +21,7 @@ class Log:
         self.Logs = connection.Logs
 
     def list_(self, sources: Optional[list] = None
-              ) -> Union[SimpleNamespace, Dfn.RPCResult]:
+              ) -> Union[LazyNamespace, Dfn.RPCResult]:
         """Fetch past log entries (since boot).
 
         Returns:
@@ -41,7 +41,7 @@ class Log:
                                 f"- Msg: {response_model.error.message}")
                 return response_model
 
-            return utils.dict_to_namespace(response)
+            return utils.dict_to_lazy_namespace(response)
 
         except KeyError as ke:
             self.Logs.error(f'KeyError: {ke}')
@@ -50,6 +50,35 @@ class Log:
             self.Logs.error(f'General error: {err}')
             return Dfn.RPCResult(error=Dfn.RPCErrorModel(-1, err.__str__()))
 
+    def iter_(self, sources: Optional[list] = None
+              ) -> Iterator[Union[LazyNamespace, Dfn.RPCResult]]:
+        """Iterate over the past log entries (since boot), one entry at a
+        time, while the list is received.
+
+        Yields:
+            LazyNamespace: The log entries,
+                or one RPCResult if there is an error
+        """
+        try:
+            stream = self.Connection.query_stream(
+                method='log.list',
+                param={"sources": sources}
+                )
+
+            for entry in stream:
+                yield utils.dict_to_lazy_namespace(entry)
+
+            if stream.error:
+                error = decoder.decode(Dfn.RPCErrorModel, stream.error)
+                self.Logs.error(f"Code: {error.code} "
+                                f"- Msg: {error.message}")
+                yield Dfn.RPCResult(error=error)
+
+        except KeyError as ke:
+            self.Logs.error(f'KeyError: {ke}')
+        except Exception as err:
+            self.Logs.error(f'General error: {err}')
+
     def send(self, msg: str,
              level: Literal['debug', 'info', 'warn', 'error', 'fatal'],
              subsystem: str, event_id: str, timestamp: float = time()
@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 import unrealircd_rpc_py.objects.Definition as Dfn
-from unrealircd_rpc_py.utils import utils
+from unrealircd_rpc_py.utils import decoder, utils
 
 if TYPE_CHECKING:
     from unrealircd_rpc_py.connections.sync.IConnection import IConnection
@@ -8,14 +8,19 @@ if TYPE_CHECKING:
 
 class NameBan:
 
-    DB_NAME_BANS: list[Dfn.NameBan] = []
-
     def __init__(self, connection: 'IConnection') -> None:
 
         # Get the Connection instance
         self.Connection = connection
         self.Logs = connection.Logs
 
+    @property
+    def DB_NAME_BANS(self) -> list[Dfn.NameBan]:
+        """The name bans of the last Name_ban.list_,
+        the error or the empty listing included (IConnection.Snapshots)
+        """
+        return self.Connection.Snapshots.latest('name_ban.list', [])
+
     def list_(self) -> list[Dfn.NameBan]:
         """List name bans (qlines).
 
@@ -23,27 +28,33 @@ class NameBan:
             ModelNameBan: List of ModelNameBan, None if nothing see Error
                 property
         """
+        return self.Connection.Snapshots.get(
+            ('name_ban.list',),
+            lambda: self.__list()
+        )
+
+    def __list(self) -> list[Dfn.NameBan]:
+        """Query name_ban.list and build the models"""
         try:
-            self.DB_NAME_BANS = []
+            name_bans: list[Dfn.NameBan] = []
             response: dict[str, dict] = self.Connection.query('name_ban.list')
             response_model = utils.construct_rpc_response(response)
 
             if response_model.error.code != 0:
                 self.Logs.error(f"Code: {response_model.error.code} "
                                 f"- Msg: {response_model.error.message}")
-                self.DB_NAME_BANS.append(
+                name_bans.append(
                     Dfn.NameBan(error=response_model.error)
                 )
-                return self.DB_NAME_BANS
+                return name_bans
 
             namebans: list[dict] = response.get('result', {}).get('list', [])
 
-            for nameban in namebans:
-                self.DB_NAME_BANS.append(
-                        Dfn.NameBan(**nameban)
-                )
+            name_bans.extend(
+                decoder.decode_list(Dfn.NameBan, namebans)
+            )
 
-            return self.DB_NAME_BANS
+            return name_bans
 
         except KeyError as ke:
             self.Logs.error(f'KeyError: {ke}')
@@ -75,7 +86,7 @@ class NameBan:
 
             nameban = response_model.result.get('tkl', {})
 
-            obj = Dfn.NameBan(**nameban)
+            obj = decoder.decode(Dfn.NameBan, nameban)
 
             return obj
 
@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 import unrealircd_rpc_py.objects.Definition as Dfn
-from unrealircd_rpc_py.utils import utils
+from unrealircd_rpc_py.utils import decoder, utils
 
 if TYPE_CHECKING:
     from unrealircd_rpc_py.connections.sync.IConnection import IConnection
@@ -8,14 +8,19 @@ if TYPE_CHECKING:
 
 class Rpc:
 
-    DB_RPC_INFO: list[Dfn.RpcInfo] = []
-
     def __init__(self, connection: 'IConnection') -> None:
 
         # Get the Connection instance
         self.Connection = connection
         self.Logs = connection.Logs
 
+    @property
+    def DB_RPC_INFO(self) -> list[Dfn.RpcInfo]:
+        """The methods of the last Rpc.info,
+        the error or the empty listing included (IConnection.Snapshots)
+        """
+        return self.Connection.Snapshots.latest('rpc.info', [])
+
     def info(self) -> list[Dfn.RpcInfo]:
         """A response object, with in the result object a "methods" object
         which is a list of: the API method with in that the name,
@@ -24,29 +29,35 @@ class Rpc:
         Returns:
             list[RpcInfo]: List of RpcInfo
         """
+        return self.Connection.Snapshots.get(
+            ('rpc.info',),
+            lambda: self.__info()
+        )
+
+    def __info(self) -> list[Dfn.RpcInfo]:
+        """Query rpc.info and build the models"""
         try:
-            self.DB_RPC_INFO: list[Dfn.RpcInfo] = []
+            rpc_infos: list[Dfn.RpcInfo] = []
             response: dict[str, dict] = self.Connection.query('rpc.info')
             response_model = utils.construct_rpc_response(response)
 
             if response_model.error.code != 0:
                 self.Logs.error(f"Code: {response_model.error.code} "
                                 f"- Msg: {response_model.error.message}")
-                self.DB_RPC_INFO.append(
+                rpc_infos.append(
                     Dfn.RpcInfo(error=response_model.error)
                 )
-                return self.DB_RPC_INFO
+                return rpc_infos
 
             rpcinfos: dict[dict, dict] = response_model.result.get(
                 'methods', {}
             )
 
-            for rpcinfo in rpcinfos:
-                self.DB_RPC_INFO.append(
-                        Dfn.RpcInfo(**rpcinfos.get(rpcinfo, {}))
-                )
+            rpc_infos.extend(
+                decoder.decode_list(Dfn.RpcInfo, rpcinfos.values())
+            )
 
-            return self.DB_RPC_INFO
+            return rpc_infos
 
         except KeyError as ke:
             self.Logs.error(ke)
@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 import unrealircd_rpc_py.objects.Definition as Dfn
-from unrealircd_rpc_py.utils import utils
+from unrealircd_rpc_py.utils import decoder, utils
 
 if TYPE_CHECKING:
     from unrealircd_rpc_py.connections.sync.IConnection import IConnection
@@ -8,21 +8,34 @@ if TYPE_CHECKING:
 
 class SecurityGroup:
 
-    DB_SECURITY_GROUPS: list[Dfn.SecurityGroup] = []
-
     def __init__(self, connection: 'IConnection') -> None:
 
         # Get the Connection instance
         self.Connection = connection
         self.Logs = connection.Logs
 
+    @property
+    def DB_SECURITY_GROUPS(self) -> list[Dfn.SecurityGroup]:
+        """The security groups of the last SecurityGroup.list_,
+        the error or the empty listing included (IConnection.Snapshots)
+        """
+        return self.Connection.Snapshots.latest('security_group.list', [])
+
     def list_(self) -> list[Dfn.SecurityGroup]:
         """The list of all security groups
 
         Returns:
             list[SecurityGroup]: List of SecurityGroup objects
         """
+        return self.Connection.Snapshots.get(
+            ('security_group.list',),
+            lambda: self.__list()
+        )
+
+    def __list(self) -> list[Dfn.SecurityGroup]:
+        """Query security_group.list and build the models"""
         try:
+            security_groups: list[Dfn.SecurityGroup] = []
             response: dict[str, dict] = self.Connection.query(
                 'security_group.list'
                 )
@@ -31,24 +44,25 @@ class SecurityGroup:
             if response_model.error.code != 0:
                 self.Logs.error(f"Code: {response_model.error.code} "
                                 f"- Msg: {response_model.error.message}")
-                self.DB_SECURITY_GROUPS.append(
+                security_groups.append(
                     Dfn.SecurityGroup(error=response_model.error)
                     )
-                return self.DB_SECURITY_GROUPS
+                return security_groups
 
             _sgs = response_model.result.get('list', [])
-            for _sg in _sgs:
-                self.DB_SECURITY_GROUPS.append(Dfn.SecurityGroup(**_sg))
+            security_groups.extend(
+                decoder.decode_list(Dfn.SecurityGroup, _sgs)
+            )
 
-            return self.DB_SECURITY_GROUPS
+            return security_groups
 
         except KeyError as ke:
             self.Logs.error(f'Key error: {ke}')
-            return self.DB_SECURITY_GROUPS
+            return security_groups
 
         except Exception as err:
             self.Logs.error(f'General error: {err}', exc_info=True)
-            return self.DB_SECURITY_GROUPS
+            return security_groups
 
     def get(self, name: str) -> Dfn.SecurityGroup:
         """Retrieve a security group by name
@@ -68,7 +82,7 @@ class SecurityGroup:
                                 f"- Msg: {response_model.error.message}")
                 return Dfn.SecurityGroup(error=response_model.error)
 
-            _sg = Dfn.SecurityGroup(**response_model.result)
+            _sg = decoder.decode(Dfn.SecurityGroup, response_model.result)
             return _sg
 
         except Exception as err:
@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 import unrealircd_rpc_py.objects.Definition as Dfn
-from unrealircd_rpc_py.utils import utils
+from unrealircd_rpc_py.utils import decoder, utils
 
 if TYPE_CHECKING:
     from unrealircd_rpc_py.connections.sync.IConnection import IConnection
@@ -8,15 +8,26 @@ if TYPE_CHECKING:
 
 class Server:
 
-    DB_SERVER: list[Dfn.ClientServer] = []
-    DB_MODULES: list[Dfn.ServerModule] = []
-
     def __init__(self, connection: 'IConnection') -> None:
 
         # Get the Connection instance
         self.Connection = connection
         self.Logs = connection.Logs
 
+    @property
+    def DB_MODULES(self) -> list[Dfn.ServerModule]:
+        """The modules of the last Server.module_list,
+        the error or the empty listing included (IConnection.Snapshots)
+        """
+        return self.Connection.Snapshots.latest('server.module_list', [])
+
+    @property
+    def DB_SERVER(self) -> list[Dfn.ClientServer]:
+        """The servers of the last Server.list_,
+        the error or the empty listing included (IConnection.Snapshots)
+        """
+        return self.Connection.Snapshots.latest('server.list', [])
+
     def list_(self) -> list[Dfn.ClientServer]:
         """List servers.
 
@@ -24,62 +35,33 @@ class Server:
             list[ClientServer]: List with an object contains all Servers
                 information
         """
+        return self.Connection.Snapshots.get(
+            ('server.list',),
+            lambda: self.__list()
+        )
+
+    def __list(self) -> list[Dfn.ClientServer]:
+        """Query server.list and build the models"""
         try:
-            self.DB_SERVER = []
+            db_servers: list[Dfn.ClientServer] = []
             response: dict[str, dict] = self.Connection.query('server.list')
             response_model = utils.construct_rpc_response(response)
 
             if response_model.error.code != 0:
                 self.Logs.error(f"Code: {response_model.error.code} "
                                 f"- Msg: {response_model.error.message}")
-                self.DB_SERVER.append(
+                db_servers.append(
                     Dfn.ClientServer(error=response_model.error)
                 )
-                return self.DB_SERVER
+                return db_servers
 
             servers: list[dict] = response_model.result.get('list', [])
 
-            for server in servers:
-                client_server: dict = server.copy()
-                server_for_client_server: dict = server.get(
-                    'server', {}).copy()
-                features_for_server: dict = server.get('server', {}).get(
-                    'features', {}).copy()
-
-                for key in ['server', 'tls']:
-                    client_server.pop(key, None)
-
-                for key in ['features']:
-                    server_for_client_server.pop(key, None)
-
-                for key in ['rpc_modules']:
-                    features_for_server.pop(key, None)
-
-                features_object = Dfn.ServerFeatures(
-                    **features_for_server,
-                    rpc_modules=[
-                        Dfn.ServerRpcModules(**rpcmod) for rpcmod
-                        in server.get(
-                            'server', {}).get(
-                            'features', {}).get(
-                            'rpc_modules', [])
-                    ]
-                )
-
-                server_object = Dfn.Server(
-                    **server_for_client_server,
-                    features=features_object
-                )
-
-                client_server_object = Dfn.ClientServer(
-                    **client_server,
-                    server=server_object,
-                    tls=Dfn.Tls(**server.get('tls', {}))
-                )
-
-                self.DB_SERVER.append(client_server_object)
+            db_servers.extend(
+                decoder.decode_list(Dfn.ClientServer, servers)
+            )
 
-            return self.DB_SERVER
+            return db_servers
 
         except KeyError as ke:
             self.Logs.error(f'KeyError: {ke}')
@@ -102,7 +84,7 @@ class Server:
                 The ClientServer if success | None if error
         """
         try:
-            response: dict[str, dict] = self.Connection.query(
+            response: dict[str, dict] = self.Connection.query_cached(
                 'server.get', {'server': serverorsid})
             response_model = utils.construct_rpc_response(response)
 
@@ -113,43 +95,7 @@ class Server:
 
             server: dict = response_model.result.get('server', {})
 
-            client_server: dict = server.copy()
-            server_for_client_server: dict = server.get('server', {}).copy()
-            features_for_server: dict = server.get(
-                'server', {}).get('features', {}).copy()
-
-            for key in ['server', 'tls']:
-                client_server.pop(key, None)
-
-            for key in ['features']:
-                server_for_client_server.pop(key, None)
-
-            for key in ['rpc_modules']:
-                features_for_server.pop(key, None)
-
-            features_object = Dfn.ServerFeatures(
-                **features_for_server,
-                rpc_modules=[
-                    Dfn.ServerRpcModules(**rpcmod) for rpcmod in
-                    server.get(
-                        'server', {}).get(
-                        'features', {}).get(
-                        'rpc_modules', [])
-                ]
-            )
-
-            server_object = Dfn.Server(
-                **server_for_client_server,
-                features=features_object
-            )
-
-            client_server_object = Dfn.ClientServer(
-                **client_server,
-                server=server_object,
-                tls=Dfn.Tls(**server.get('tls', {}))
-            )
-
-            return client_server_object
+            return decoder.decode(Dfn.ClientServer, server)
 
         except KeyError as ke:
             self.Logs.error(f'KeyError: {ke}')
@@ -179,7 +125,7 @@ class Server:
             ServerRehash: True if success or False if failed
         """
         try:
-            response: dict[str, dict] = self.Connection.query(
+            response: dict[str, dict] = self.Connection.query_write(
                 'server.rehash', {'server': serverorsid})
             response_model = utils.construct_rpc_response(response)
 
@@ -188,32 +134,7 @@ class Server:
                                 f"- Msg: {response_model.error.message}")
                 return Dfn.ClientServer(error=response_model.error)
 
-            rehash: dict = response_model.result
-
-            rehash_log: list[dict] = rehash.get('log', []).copy()
-
-            db_rehash_log: list[Dfn.ServerRehashLog] = []
-
-            for rlog in rehash_log:
-                rlog_copy = rlog.copy()
-                rlog_copy.pop('source', None)
-                db_rehash_log.append(
-                    Dfn.ServerRehashLog(
-                        **rlog_copy,
-                        source=Dfn.ServerRehashLogSource(
-                            **rlog.get('source', {})
-                        )
-                    )
-                )
-
-            rehash_object = Dfn.ServerRehash(
-                rehash_client=Dfn.ServerRehashClient(
-                    **rehash.get("rehash_client", {})),
-                log=db_rehash_log,
-                success=rehash.get('success', '')
-            )
-
-            return rehash_object
+            return decoder.decode(Dfn.ServerRehash, response_model.result)
 
         except TypeError as te:
             self.Logs.error(f'Type Error: {te}')
@@ -245,7 +166,7 @@ class Server:
             bool: True if success
         """
         try:
-            response: dict[str, dict] = self.Connection.query(
+            response: dict[str, dict] = self.Connection.query_write(
                 'server.connect', {'link': link})
             response_model = utils.construct_rpc_response(response)
 
@@ -276,7 +197,7 @@ class Server:
             bool: True if success
         """
         try:
-            response: dict[str, dict] = self.Connection.query(
+            response: dict[str, dict] = self.Connection.query_write(
                 'server.disconnect', {'link': link})
             response_model = utils.construct_rpc_response(response)
 
@@ -312,8 +233,15 @@ class Server:
             ServerModule (ServerModule): if success you will find the object
                 ServerModule
         """
+        return self.Connection.Snapshots.get(
+            ('server.module_list', serverorsid),
+            lambda: self.__module_list(serverorsid)
+        )
+
+    def __module_list(self, serverorsid: str = None) -> list[Dfn.ServerModule]:
+        """Query server.module_list and build the models"""
         try:
-            self.DB_MODULES = []
+            db_modules: list[Dfn.ServerModule] = []
             response: dict[str, dict] = self.Connection.query(
                 'server.module_list', {'server': serverorsid})
             response_model = utils.construct_rpc_response(response)
@@ -321,17 +249,18 @@ class Server:
             if response_model.error.code != 0:
                 self.Logs.error(f"Code: {response_model.error.code} "
                                 f"- Msg: {response_model.error.message}")
-                self.DB_MODULES.append(
+                db_modules.append(
                     Dfn.ServerModule(error=response_model.error)
                 )
-                return self.DB_MODULES
+                return db_modules
 
             modules: list = response_model.result.get('list', [])
 
-            for module in modules:
-                self.DB_MODULES.append(Dfn.ServerModule(**module))
+            db_modules.extend(
+                decoder.decode_list(Dfn.ServerModule, modules)
+            )
 
-            return self.DB_MODULES
+            return db_modules
 
         except KeyError as ke:
             self.Logs.error(f'KeyError: {ke}')
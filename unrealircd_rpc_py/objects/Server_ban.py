@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 import unrealircd_rpc_py.objects.Definition as Dfn
-from unrealircd_rpc_py.utils import utils
+from unrealircd_rpc_py.utils import decoder, utils
 
 if TYPE_CHECKING:
     from unrealircd_rpc_py.connections.sync.IConnection import IConnection
@@ -8,22 +8,34 @@ if TYPE_CHECKING:
 
 class ServerBan:
 
-    DB_SERVERS_BANS: list[Dfn.ServerBan] = []
-
     def __init__(self, connection: 'IConnection') -> None:
 
         # Get the Connection instance
         self.Connection = connection
         self.Logs = connection.Logs
 
+    @property
+    def DB_SERVERS_BANS(self) -> list[Dfn.ServerBan]:
+        """The server bans of the last Server_ban.list_,
+        the error or the empty listing included (IConnection.Snapshots)
+        """
+        return self.Connection.Snapshots.latest('server_ban.list', [])
+
     def list_(self) -> list[Dfn.ServerBan]:
         """List server bans (LINEs).
 
         Returns:
             list[ServerBan]: List of ServerBan, if empty see Error Object
         """
+        return self.Connection.Snapshots.get(
+            ('server_ban.list',),
+            lambda: self.__list()
+        )
+
+    def __list(self) -> list[Dfn.ServerBan]:
+        """Query server_ban.list and build the models"""
         try:
-            self.DB_SERVERS_BANS = []
+            server_bans: list[Dfn.ServerBan] = []
             response: dict[str, dict] = self.Connection.query(
                 method='server_ban.list')
             response_model = utils.construct_rpc_response(response)
@@ -31,17 +43,18 @@ class ServerBan:
             if response_model.error.code != 0:
                 self.Logs.error(f"Code: {response_model.error.code} "
                                 f"- Msg: {response_model.error.message}")
-                self.DB_SERVERS_BANS.append(
+                server_bans.append(
                     Dfn.ServerBan(error=response_model.error)
                 )
-                return self.DB_SERVERS_BANS
+                return server_bans
 
             srvbans: list[dict] = response_model.result.get('list', [])
 
-            for srvban in srvbans:
-                self.DB_SERVERS_BANS.append(Dfn.ServerBan(**srvban))
+            server_bans.extend(
+                decoder.decode_list(Dfn.ServerBan, srvbans)
+            )
 
-            return self.DB_SERVERS_BANS
+            return server_bans
 
         except KeyError as ke:
             self.Logs.error(f'KeyError: {ke}')
@@ -64,7 +77,7 @@ class ServerBan:
             ServerBan (ServerBan): The ServerBan model Object
         """
         try:
-            response: dict[str, dict] = self.Connection.query(
+            response: dict[str, dict] = self.Connection.query_cached(
                 method='server_ban.get',
                 param={'type': query_type, 'name': name})
             response_model = utils.construct_rpc_response(response)
@@ -76,7 +89,7 @@ class ServerBan:
 
             srvban: dict = response_model.result.get('tkl', {})
 
-            obj = Dfn.ServerBan(**srvban)
+            obj = decoder.decode(Dfn.ServerBan, srvban)
 
             return obj
 
@@ -114,7 +127,7 @@ class ServerBan:
             RPCResult: The RPCResult Model
         """
         try:
-            response: dict[str, dict] = self.Connection.query(
+            response: dict[str, dict] = self.Connection.query_write(
                 method='server_ban.add',
                 param={"type": query_type, "name": name, "reason": reason,
                        "expire_at": expire_at,
@@ -159,7 +172,7 @@ class ServerBan:
             RPCResult: True if success
         """
         try:
-            response: dict[str, dict] = self.Connection.query(
+            response: dict[str, dict] = self.Connection.query_write(
                 method='server_ban.del',
                 param={"type": query_type, "name": name, "set_by": set_by})
             response_model = utils.construct_rpc_response(response)
@@ -177,3 +190,84 @@ class ServerBan:
         except Exception as err:
             self.Logs.error(f'General error: {err}')
             return Dfn.ServerBan(error=Dfn.RPCErrorModel(-1, err.__str__()))
+
+    def add_many(self, bans: list[dict]) -> list[Dfn.RPCResult]:
+        """Add many server bans (LINEs) in one batch request.
+
+        Each ban is a dict using the arguments of the add method:
+
+        ```python
+            Server_ban.add_many([
+                {'query_type': 'gline', 'name': '*@192.168.1.10',
+                 'reason': 'Flood', 'expire_at': None,
+                 'duration_sting': '1d', 'set_by': 'admin'}
+            ])
+        ```
+
+        Args:
+            bans (list[dict]): The server bans to add
+
+        Returns:
+            list[RPCResult]: One RPCResult per ban, in the same order
+        """
+        return self.__batch(
+            'server_ban.add',
+            [{"type": ban.get('query_type'), "name": ban.get('name'),
+              "reason": ban.get('reason'),
+              "expire_at": ban.get('expire_at'),
+              "duration_string": ban.get('duration_sting'),
+              "set_by": ban.get('set_by')}
+             for ban in bans]
+        )
+
+    def del_many(self, bans: list[dict]) -> list[Dfn.RPCResult]:
+        """Delete many server bans (LINEs) in one batch request.
+
+        Each ban is a dict using the arguments of the del_ method:
+
+        ```python
+            Server_ban.del_many([
+                {'query_type': 'gline', 'name': '*@192.168.1.10'}
+            ])
+        ```
+
+        Args:
+            bans (list[dict]): The server bans to delete
+
+        Returns:
+            list[RPCResult]: One RPCResult per ban, in the same order
+        """
+        return self.__batch(
+            'server_ban.del',
+            [{"type": ban.get('query_type'), "name": ban.get('name'),
+              "set_by": ban.get('set_by')}
+             for ban in bans]
+        )
+
+    def __batch(self, method: str, params: list[dict]
+                ) -> list[Dfn.RPCResult]:
+        """Send the same method for each param in one batch request"""
+        try:
+            responses: list[dict] = self.Connection.query_batch_write(
+                [(method, param) for param in params]
+            )
+
+            results: list[Dfn.RPCResult] = []
+
+            for response in responses:
+                response_model = utils.construct_rpc_response(response)
+
+                if response_model.error.code != 0:
+                    self.Logs.error(f"Code: {response_model.error.code} "
+                                    f"- Msg: {response_model.error.message}")
+
+                results.append(response_model)
+
+            return results
+
+        except KeyError as ke:
+            self.Logs.error(f'KeyError: {ke}')
+            return []
+        except Exception as err:
+            self.Logs.error(f'General error: {err}')
+            return []
@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 import unrealircd_rpc_py.objects.Definition as Dfn
-from unrealircd_rpc_py.utils import utils
+from unrealircd_rpc_py.utils import decoder, utils
 
 if TYPE_CHECKING:
     from unrealircd_rpc_py.connections.sync.IConnection import IConnection
@@ -8,14 +8,21 @@ if TYPE_CHECKING:
 
 class ServerBanException:
 
-    DB_SERVERS_BANS_EXCEPTION: list[Dfn.ServerBanException] = []
-
     def __init__(self, connection: 'IConnection') -> None:
 
         # Get the Connection instance
         self.Connection = connection
         self.Logs = connection.Logs
 
+    @property
+    def DB_SERVERS_BANS_EXCEPTION(self) -> list[Dfn.ServerBanException]:
+        """The exceptions of the last Server_ban_exception.list_,
+        the error or the empty listing included (IConnection.Snapshots)
+        """
+        return self.Connection.Snapshots.latest(
+            'server_ban_exception.list', []
+        )
+
     def list_(self) -> list[Dfn.ServerBanException]:
         """List server ban exceptions (ELINEs).
 
@@ -23,8 +30,15 @@ class ServerBanException:
             list[ModelServerBanException]: List of ModelServerBanException,
                 None if nothing see the Error property
         """
+        return self.Connection.Snapshots.get(
+            ('server_ban_exception.list',),
+            lambda: self.__list()
+        )
+
+    def __list(self) -> list[Dfn.ServerBanException]:
+        """Query server_ban_exception.list and build the models"""
         try:
-            self.DB_SERVERS_BANS_EXCEPTION = []
+            exceptions: list[Dfn.ServerBanException] = []
             response: dict[str, dict] = self.Connection.query(
                 method='server_ban_exception.list')
             response_model = utils.construct_rpc_response(response)
@@ -32,19 +46,18 @@ class ServerBanException:
             if response_model.error.code != 0:
                 self.Logs.error(f"Code: {response_model.error.code} "
                                 f"- Msg: {response_model.error.message}")
-                self.DB_SERVERS_BANS_EXCEPTION.append(
+                exceptions.append(
                     Dfn.ServerBanException(error=response_model.error)
                 )
-                return self.DB_SERVERS_BANS_EXCEPTION
+                return exceptions
 
             srvbansexceps = response_model.result.get('list', {})
 
-            for srvbansexcep in srvbansexceps:
-                self.DB_SERVERS_BANS_EXCEPTION.append(
-                        Dfn.ServerBanException(**srvbansexcep)
-                )
+            exceptions.extend(
+                decoder.decode_list(Dfn.ServerBanException, srvbansexceps)
+            )
 
-            return self.DB_SERVERS_BANS_EXCEPTION
+            return exceptions
 
         except KeyError as ke:
             self.Logs.error(f'KeyError: {ke}')
@@ -82,7 +95,7 @@ class ServerBanException:
 
             srvbanexcep = response_model.result.get('tkl')
 
-            obj = Dfn.ServerBanException(**srvbanexcep)
+            obj = decoder.decode(Dfn.ServerBanException, srvbanexcep)
 
             return obj
 
@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 import unrealircd_rpc_py.objects.Definition as Dfn
-from unrealircd_rpc_py.utils import utils
+from unrealircd_rpc_py.utils import decoder, utils
 
 if TYPE_CHECKING:
     from unrealircd_rpc_py.connections.sync.IConnection import IConnection
@@ -8,14 +8,19 @@ if TYPE_CHECKING:
 
 class Spamfilter:
 
-    DB_SPAMFILTERS: list[Dfn.Spamfilter] = []
-
     def __init__(self, connection: 'IConnection') -> None:
 
         # Get the Connection instance
         self.Connection = connection
         self.Logs = connection.Logs
 
+    @property
+    def DB_SPAMFILTERS(self) -> list[Dfn.Spamfilter]:
+        """The spamfilters of the last Spamfilter.list_,
+        the error or the empty listing included (IConnection.Snapshots)
+        """
+        return self.Connection.Snapshots.latest('spamfilter.list', [])
+
     def list_(self) -> list[Dfn.Spamfilter]:
         """List spamfilters.
 
@@ -23,8 +28,15 @@ class Spamfilter:
             list[Spamfilter]: List of Spamfilter, None if nothing,
                 see Error property if any error
         """
+        return self.Connection.Snapshots.get(
+            ('spamfilter.list',),
+            lambda: self.__list()
+        )
+
+    def __list(self) -> list[Dfn.Spamfilter]:
+        """Query spamfilter.list and build the models"""
         try:
-            self.DB_SPAMFILTERS = []
+            db_spamfilters: list[Dfn.Spamfilter] = []
 
             response: dict[str, dict] = self.Connection.query(
                 method='spamfilter.list')
@@ -33,17 +45,18 @@ class Spamfilter:
             if response_model.error.code != 0:
                 self.Logs.error(f"Code: {response_model.error.code} "
                                 f"- Msg: {response_model.error.message}")
-                self.DB_SPAMFILTERS.append(
+                db_spamfilters.append(
                     Dfn.Spamfilter(error=response_model.error)
                 )
-                return self.DB_SPAMFILTERS
+                return db_spamfilters
 
             spamfilters = response_model.result.get('list', [])
 
-            for spamfilter in spamfilters:
-                self.DB_SPAMFILTERS.append(Dfn.Spamfilter(**spamfilter))
+            db_spamfilters.extend(
+                decoder.decode_list(Dfn.Spamfilter, spamfilters)
+            )
 
-            return self.DB_SPAMFILTERS
+            return db_spamfilters
 
         except KeyError as ke:
             self.Logs.error(f'KeyError: {ke}')
@@ -75,7 +88,7 @@ class Spamfilter:
             Spamfilter: The Object Spamfilter. Could be empty if error
         """
         try:
-            response: dict[str, dict] = self.Connection.query(
+            response: dict[str, dict] = self.Connection.query_cached(
                 method='spamfilter.get',
                 param={"name": name, "match_type": match_type,
                        "ban_action": ban_action,
@@ -89,7 +102,7 @@ class Spamfilter:
 
             spamfilter = response_model.result.get('tkl', {})
 
-            object_spamfilter = Dfn.Spamfilter(**spamfilter)
+            object_spamfilter = decoder.decode(Dfn.Spamfilter, spamfilter)
 
             return object_spamfilter
 
@@ -132,7 +145,7 @@ class Spamfilter:
             bool: True if success
         """
         try:
-            response: dict[str, dict] = self.Connection.query(
+            response: dict[str, dict] = self.Connection.query_write(
                 method='spamfilter.add',
                 param={"name": name, "match_type": match_type,
                        "ban_action": ban_action,
@@ -181,7 +194,7 @@ class Spamfilter:
             bool: True if success
         """
         try:
-            response: dict[str, dict] = self.Connection.query(
+            response: dict[str, dict] = self.Connection.query_write(
                 method='spamfilter.del',
                 param={"name": name, "match_type": match_type,
                        "ban_action": ban_action,
@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 import unrealircd_rpc_py.objects.Definition as Dfn
-from unrealircd_rpc_py.utils import utils
+from unrealircd_rpc_py.utils import decoder, utils
 
 if TYPE_CHECKING:
     from unrealircd_rpc_py.connections.sync.IConnection import IConnection
@@ -26,7 +26,7 @@ class Stats:
             Stats: The Stats model.
         """
         try:
-            response: dict[str, dict] = self.Connection.query(
+            response: dict[str, dict] = self.Connection.query_cached(
                 'stats.get',
                 param={'object_detail_level': object_detail_level})
             response_model = utils.construct_rpc_response(response)
@@ -36,37 +36,7 @@ class Stats:
                                 f"- Msg: {response_model.error.message}")
                 return Dfn.Stats(error=response_model.error)
 
-            result: dict = response.get('result', {})
-            server_obj = Dfn.StatsServer(
-                **result.pop('server', Dfn.StatsServer().to_dict())
-            )
-            channel_obj = Dfn.StatsChannel(
-                **result.pop('channel', Dfn.StatsChannel().to_dict())
-            )
-            server_ban_obj = Dfn.StatsServerBan(
-                **result.pop('server_ban', Dfn.StatsServerBan().to_dict())
-            )
-            user_dict: dict[str, dict] = result.get('user', {})
-
-            # list of stats user counrties
-            user_country_list_obj: list[Dfn.StatsUserCountries] = []
-            user_countries_list: list[dict] = user_dict.pop('countries', [])
-            for user_country in user_countries_list:
-                user_country_list_obj.append(
-                    Dfn.StatsUserCountries(**user_country)
-                )
-
-            user_obj = Dfn.StatsUser(
-                **user_dict, countries=user_country_list_obj)
-
-            stats_obj = Dfn.Stats(
-                server=server_obj,
-                user=user_obj,
-                channel=channel_obj,
-                server_ban=server_ban_obj
-            )
-
-            return stats_obj
+            return decoder.decode(Dfn.Stats, response_model.result)
 
         except KeyError as ke:
             self.Logs.error(f'KeyError: {ke}')
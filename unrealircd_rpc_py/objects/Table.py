@@ -0,0 +1,386 @@
+"""
+Columnar results (one array per attribute instead of one object per
+entry) for the big lists: user.list and channel.list.
+
+    - int columns (ports, reputation...) are arrays of 64-bit ints
+    - time columns are arrays of unix timestamps (seconds, 0 if unset)
+    - category columns (server, country, account...) store each distinct
+      string once and an array of codes
+    - str columns are lists of str
+
+```python
+    users = conn.User.list_columns()
+    len(users)
+    users['reputation']                     # array('q', [...])
+    users.count_by('country')               # {'FR': 120, 'DE': 45, ...}
+    french = users.filter(country='FR', reputation=lambda r: r > 100)
+    arrays = users.to_numpy()               # if numpy is installed
+```
+"""
+from array import array
+from collections import Counter
+from itertools import compress
+from datetime import datetime
+from typing import Any, Callable, Iterable, Iterator, Optional, Union
+import unrealircd_rpc_py.objects.Definition as Dfn
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+INT = 'int'
+TIME = 'time'
+CATEGORY = 'category'
+STR = 'str'
+
+
+def to_timestamp(value: Optional[str]) -> int:
+    """Convert a JSON-RPC date (2025-01-01T10:00:00.000Z) to a unix
+    timestamp, 0 if unset"""
+    if not value:
+        return 0
+    if value[-1] == 'Z':
+        value = value[:-1] + '+00:00'
+    return int(datetime.fromisoformat(value).timestamp())
+
+
+def take_array(column: array, rows: Iterable[int]) -> array:
+    """A new array holding the given rows of an array"""
+    taken = array(column.typecode)
+    if numpy is not None:
+        values = numpy.frombuffer(column, dtype=column.typecode)
+        taken.frombytes(values[numpy.asarray(rows, dtype=numpy.intp)]
+                        .tobytes())
+    else:
+        taken.extend(map(column.__getitem__, rows))
+    return taken
+
+
+class Category:
+    """A dictionary-encoded column of strings.
+
+    Each distinct value is stored once in `values`, the rows hold its
+    index in `codes` (-1 for None).
+    """
+
+    __slots__ = ('codes', 'values', '_index')
+
+    def __init__(self) -> None:
+        self.codes = array('i')
+        self.values: list[str] = []
+        self._index: dict[str, int] = {}
+
+    def append(self, value: Optional[str]) -> None:
+        if value is None:
+            self.codes.append(-1)
+            return
+
+        code = self._index.get(value)
+        if code is None:
+            code = self._index[value] = len(self.values)
+            self.values.append(value)
+        self.codes.append(code)
+
+    def code(self, value: Optional[str]) -> Optional[int]:
+        """The code of a value, None if no row holds it"""
+        if value is None:
+            return -1
+        return self._index.get(value)
+
+    def take(self, rows: Iterable[int]) -> 'Category':
+        """A new Category holding the given rows"""
+        taken = Category()
+        taken.values = self.values.copy()
+        taken._index = self._index.copy()
+        taken.codes = take_array(self.codes, rows)
+        return taken
+
+    def __getitem__(self, row: int) -> Optional[str]:
+        code = self.codes[row]
+        return None if code < 0 else self.values[code]
+
+    def __iter__(self) -> Iterator[Optional[str]]:
+        values = self.values
+        for code in self.codes:
+            yield None if code < 0 else values[code]
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __repr__(self) -> str:
+        return (f'Category({len(self.codes)} rows, '
+                f'{len(self.values)} values)')
+
+
+Column = Union[array, Category, list]
+
+
+class Table:
+    """Struct of arrays built from the entries of a list reply.
+
+    The subclasses define COLUMNS: (column name, kind, path of the value
+    in the JSON entry). Like the decoder of the models, a key missing
+    from the entry is looked up hyphenated too (country_code then
+    country-code).
+    """
+
+    COLUMNS: tuple[tuple[str, str, tuple[str, ...]], ...] = ()
+
+    def __init__(self, error: Optional[Dfn.RPCErrorModel] = None) -> None:
+        self.error = error if error is not None else Dfn.RPCErrorModel()
+        self._columns: dict[str, Column] = {}
+        self.__paths = [
+            (name, kind, tuple(
+                (key, key.replace('_', '-') if '_' in key else None)
+                for key in path
+            ))
+            for name, kind, path in self.COLUMNS
+        ]
+
+        for name, kind, _ in self.COLUMNS:
+            if kind in (INT, TIME):
+                self._columns[name] = array('q')
+            elif kind == CATEGORY:
+                self._columns[name] = Category()
+            else:
+                self._columns[name] = []
+
+    @property
+    def columns(self) -> list[str]:
+        """The names of the columns"""
+        return list(self._columns)
+
+    def append(self, entry: dict[str, Any]) -> None:
+        """Add an entry of the list reply as a new row"""
+        for name, kind, path in self.__paths:
+            value = entry
+            for key, hyphenated in path:
+                if value.__class__ is not dict:
+                    value = None
+                    break
+                found = value.get(key)
+                if found is None and hyphenated is not None:
+                    found = value.get(hyphenated)
+                value = found
+
+            if kind == INT:
+                value = int(value or 0)
+            elif kind == TIME:
+                value = to_timestamp(value)
+            self._columns[name].append(value)
+
+    def extend(self, entries: Iterable[dict[str, Any]]) -> None:
+        for entry in entries:
+            self.append(entry)
+
+    def __len__(self) -> int:
+        if not self.COLUMNS:
+            return 0
+        return len(self._columns[self.COLUMNS[0][0]])
+
+    def __getitem__(self, name: str) -> Column:
+        return self._columns[name]
+
+    def row(self, index: int) -> dict[str, Any]:
+        """One row as a dict"""
+        return {name: column[index] for name, column
+                in self._columns.items()}
+
+    def rows(self) -> Iterator[dict[str, Any]]:
+        for index in range(len(self)):
+            yield self.row(index)
+
+    def count_by(self, column_name: str,
+                 mask: Optional[Iterable[bool]] = None, /,
+                 **conditions: Union[Any, Callable[[Any], bool]]
+                 ) -> dict[Any, int]:
+        """Number of rows per value of a column, among the rows matching
+        the conditions (see filter). Only the columns involved are read.
+
+        Returns:
+            dict: The number of rows per value
+        """
+        column = self._columns[column_name]
+        selected = self.__select(mask, conditions)
+
+        if not isinstance(column, Category):
+            if selected is not None:
+                column = compress(column, selected)
+            return dict(Counter(column))
+
+        values = column.values
+        if numpy is None:
+            codes = column.codes
+            if selected is not None:
+                codes = compress(codes, selected)
+            return {None if code < 0 else values[code]: count
+                    for code, count in Counter(codes).items()}
+
+        codes = numpy.frombuffer(column.codes, dtype=numpy.intc)
+        if selected is not None:
+            codes = codes[selected]
+        # The code -1 (None) is counted in the first bin
+        counts = numpy.bincount(codes + 1, minlength=len(values) + 1)
+        return {value: count for value, count
+                in zip([None] + values, counts.tolist()) if count}
+
+    def filter(self, mask: Optional[Iterable[bool]] = None, /,
+               **conditions: Union[Any, Callable[[Any], bool]]
+               ) -> 'Table':
+        """Keep the rows matching all the conditions.
+
+        Args:
+            mask (Iterable[bool], optional): One bool per row, e.g. a
+                numpy comparison on the arrays of to_numpy().
+            **conditions: column=value keeps the rows equal to value,
+                column=callable keeps the rows for which it returns True.
+                Equality is vectorised when numpy is installed.
+
+        Returns:
+            Table: A new table of the same class
+        """
+        selected = self.__select(mask, conditions)
+
+        if selected is None:
+            return self.take(range(len(self)))
+
+        if numpy is not None:
+            return self.take(numpy.flatnonzero(selected))
+        return self.take(compress(range(len(self)), selected))
+
+    def take(self, rows: Iterable[int]) -> 'Table':
+        """A new table holding the given rows, in that order"""
+        if numpy is not None:
+            rows = numpy.asarray(rows, dtype=numpy.intp)
+            row_list = rows.tolist()
+        else:
+            rows = row_list = list(rows)
+
+        taken = type(self)(error=self.error)
+        for name, column in self._columns.items():
+            if isinstance(column, Category):
+                taken._columns[name] = column.take(rows)
+            elif isinstance(column, array):
+                taken._columns[name] = take_array(column, rows)
+            else:
+                taken._columns[name] = list(map(column.__getitem__, row_list))
+        return taken
+
+    def to_numpy(self) -> dict[str, Any]:
+        """The columns as numpy arrays (int64 for int and time columns,
+        object arrays of str for the others).
+
+        Raises:
+            ImportError: numpy is not installed
+        """
+        if numpy is None:
+            raise ImportError('numpy is required by Table.to_numpy')
+
+        arrays: dict[str, Any] = {}
+        for name, column in self._columns.items():
+            if isinstance(column, Category):
+                values = numpy.array(column.values + [None], dtype=object)
+                arrays[name] = values[numpy.frombuffer(
+                    column.codes, dtype=numpy.intc)]
+            elif isinstance(column, array):
+                arrays[name] = numpy.frombuffer(column, dtype=numpy.int64)
+            else:
+                arrays[name] = numpy.array(column, dtype=object)
+        return arrays
+
+    def __select(self, mask: Optional[Iterable[bool]],
+                 conditions: dict[str, Any]) -> Optional[Any]:
+        """One bool per row for the rows matching the mask and all the
+        conditions, None if there is no condition"""
+        selected: Optional[Any] = None
+        if mask is not None:
+            selected = self.__as_mask(mask)
+
+        for name, condition in conditions.items():
+            if name not in self._columns:
+                raise KeyError(name)
+            matched = self.__match(name, condition)
+            if selected is None:
+                selected = matched
+            elif numpy is not None:
+                selected = selected & matched
+            else:
+                selected = [a and b for a, b in zip(selected, matched)]
+
+        return selected
+
+    def __match(self, name: str, condition: Any) -> Any:
+        """One bool per row, a numpy array if numpy is installed"""
+        column = self._columns[name]
+
+        if callable(condition):
+            return self.__as_mask([bool(condition(value))
+                                   for value in column])
+
+        if isinstance(column, Category):
+            code = column.code(condition)
+            if code is None:
+                return self.__as_mask([False] * len(column))
+            if numpy is not None:
+                return numpy.frombuffer(column.codes,
+                                        dtype=numpy.intc) == code
+            return [value == code for value in column.codes]
+
+        if isinstance(column, array) and numpy is not None:
+            return numpy.frombuffer(column, dtype=numpy.int64) == condition
+
+        return self.__as_mask([value == condition for value in column])
+
+    def __as_mask(self, mask: Iterable[bool]) -> Any:
+        if numpy is not None:
+            mask = numpy.asarray(mask, dtype=bool)
+        else:
+            mask = [bool(keep) for keep in mask]
+
+        if len(mask) != len(self):
+            raise ValueError(
+                f'The mask has {len(mask)} values for {len(self)} rows'
+            )
+        return mask
+
+    def __repr__(self) -> str:
+        return (f'{type(self).__name__}({len(self)} rows, '
+                f'columns={self.columns})')
+
+
+class UserTable(Table):
+    """Columnar result of user.list"""
+
+    COLUMNS = (
+        ('name', STR, ('name',)),
+        ('id', STR, ('id',)),
+        ('hostname', STR, ('hostname',)),
+        ('ip', STR, ('ip',)),
+        ('server_port', INT, ('server_port',)),
+        ('client_port', INT, ('client_port',)),
+        ('connected_since', TIME, ('connected_since',)),
+        ('idle_since', TIME, ('idle_since',)),
+        ('username', STR, ('user', 'username')),
+        ('realname', STR, ('user', 'realname')),
+        ('account', CATEGORY, ('user', 'account')),
+        ('reputation', INT, ('user', 'reputation')),
+        ('servername', CATEGORY, ('user', 'servername')),
+        ('modes', CATEGORY, ('user', 'modes')),
+        ('country', CATEGORY, ('geoip', 'country_code')),
+        ('asname', CATEGORY, ('geoip', 'asname')),
+    )
+
+
+class ChannelTable(Table):
+    """Columnar result of channel.list"""
+
+    COLUMNS = (
+        ('name', STR, ('name',)),
+        ('creation_time', TIME, ('creation_time',)),
+        ('num_users', INT, ('num_users',)),
+        ('topic', STR, ('topic',)),
+        ('topic_set_by', CATEGORY, ('topic_set_by',)),
+        ('topic_set_at', TIME, ('topic_set_at',)),
+        ('modes', CATEGORY, ('modes',)),
+    )
@@ -1,6 +1,7 @@
-from typing import TYPE_CHECKING, Literal
+from typing import TYPE_CHECKING, Iterator, Literal
 import unrealircd_rpc_py.objects.Definition as Dfn
-from unrealircd_rpc_py.utils import utils
+from unrealircd_rpc_py.objects.Table import UserTable
+from unrealircd_rpc_py.utils import decoder, utils
 
 if TYPE_CHECKING:
     from unrealircd_rpc_py.connections.sync.IConnection import IConnection
@@ -8,14 +9,19 @@ if TYPE_CHECKING:
 
 class User:
 
-    DB_USER: list[Dfn.Client] = []
-
     def __init__(self, connection: 'IConnection') -> None:
 
         # Get the Connection instance
         self.Connection = connection
         self.Logs = connection.Logs
 
+    @property
+    def DB_USER(self) -> list[Dfn.Client]:
+        """The users of the last User.list_,
+        the error or the empty listing included (IConnection.Snapshots)
+        """
+        return self.Connection.Snapshots.latest('user.list', [])
+
     def list_(
             self, object_detail_level: Literal[0, 1, 2, 4] = 2
     ) -> list[Dfn.Client]:
@@ -30,8 +36,17 @@ class User:
         Returns:
             Client ([Dfn.Client]): List of Client Object
         """
+        return self.Connection.Snapshots.get(
+            ('user.list', object_detail_level),
+            lambda: self.__list(object_detail_level)
+        )
+
+    def __list(
+            self, object_detail_level: Literal[0, 1, 2, 4] = 2
+    ) -> list[Dfn.Client]:
+        """Query user.list and build the models"""
         try:
-            self.DB_USER = []
+            db_users: list[Dfn.Client] = []
             response: dict[str, dict] = self.Connection.query(
                 'user.list',
                 param={'object_detail_level': object_detail_level})
@@ -40,47 +55,17 @@ class User:
             if response_model.error.code != 0:
                 self.Logs.error(f"Code: {response_model.error.code} "
                                 f"- Msg: {response_model.error.message}")
-                self.DB_USER.append(
+                db_users.append(
                     Dfn.Client(error=response_model.error)
                 )
-                return self.DB_USER
+                return db_users
 
             users: list[dict] = response_model.result.get('list', [])
 
             for user in users:
-                user_for_client = user.copy()
-                user_for_user: dict = user.get('user', {}).copy()
-
-                for key in ['geoip', 'tls', 'user']:
-                    user_for_client.pop(key, None)
-
-                for key in ['channels', 'security-groups']:
-                    user_for_user.pop(key, None)
-
-                user_model = Dfn.User(
-                    **user_for_user,
-                    security_groups=user.get('user', {}).get(
-                        'security-groups', []),
-                    channels=[Dfn.UserChannel(**chans)
-                              for chans in user.get('user', {})
-                              .get('channels',
-                                   [Dfn.UserChannel().to_dict()]
-                                   )]
-                )
-
-                self.DB_USER.append(
-                        Dfn.Client(
-                            **user_for_client,
-                            geoip=Dfn.Geoip(
-                                **user.get('geoip',
-                                           Dfn.Geoip().to_dict())),
-                            tls=Dfn.Tls(**user.get('tls',
-                                                   Dfn.Tls().to_dict())),
-                            user=user_model
-                        )
-                )
+                db_users.append(self.__build_listed_client(user))
 
-            return self.DB_USER
+            return db_users
 
         except KeyError as ke:
             self.Logs.error(f'KeyError: {ke}')
@@ -89,6 +74,88 @@ class User:
             self.Logs.error(f'General error: {err}')
             return []
 
+    def iter_(
+            self, object_detail_level: Literal[0, 1, 2, 4] = 2
+    ) -> Iterator[Dfn.Client]:
+        """Iterate over the users, one Client at a time, while the list is
+        received. Unlike list_, the whole list is never held in memory
+        and nothing is kept in the snapshot cache (DB_USER).
+
+        Args:
+            object_detail_level (int, optional):
+                set the detail of the response object,
+                see the Detail level column in Structure
+                of a client object. Defaults to 2.
+
+        Yields:
+            Client (Dfn.Client): The Client Objects, or one Client with
+                the error property set
+        """
+        try:
+            stream = self.Connection.query_stream(
+                'user.list',
+                param={'object_detail_level': object_detail_level})
+
+            for user in stream:
+                yield self.__build_listed_client(user)
+
+            if stream.error:
+                error = decoder.decode(Dfn.RPCErrorModel, stream.error)
+                self.Logs.error(f"Code: {error.code} "
+                                f"- Msg: {error.message}")
+                yield Dfn.Client(error=error)
+
+        except KeyError as ke:
+            self.Logs.error(f'KeyError: {ke}')
+        except Exception as err:
+            self.Logs.error(f'General error: {err}')
+
+    def list_columns(
+            self, object_detail_level: Literal[0, 1, 2, 4] = 2
+    ) -> UserTable:
+        """List users as a columnar UserTable (one array per attribute),
+        filled while the list is received.
+
+        Args:
+            object_detail_level (int, optional):
+                set the detail of the response object,
+                see the Detail level column in Structure
+                of a client object. Defaults to 2.
+
+        Returns:
+            UserTable: The users, see the error property of the table
+        """
+        try:
+            table = UserTable()
+            stream = self.Connection.query_stream(
+                'user.list',
+                param={'object_detail_level': object_detail_level})
+            table.extend(stream)
+
+            if stream.error:
+                error = decoder.decode(Dfn.RPCErrorModel, stream.error)
+                self.Logs.error(f"Code: {error.code} "
+                                f"- Msg: {error.message}")
+                return UserTable(error=error)
+
+            return table
+
+        except KeyError as ke:
+            self.Logs.error(f'KeyError: {ke}')
+            return UserTable(error=Dfn.RPCErrorModel(-1, ke.__str__()))
+        except Exception as err:
+            self.Logs.error(f'General error: {err}')
+            return UserTable(error=Dfn.RPCErrorModel(-1, err.__str__()))
+
+    def __build_listed_client(self, user: dict[str, dict]) -> Dfn.Client:
+        """Build the Client model from an entry of user.list"""
+        client = decoder.decode(Dfn.Client, user)
+
+        if 'channels' not in user.get('user', {}):
+            client.user.channels = [Dfn.UserChannel()]
+
+        return client
+
     def get(self, nickoruid: str) -> Dfn.Client:
         """Get user information
 
@@ -99,7 +166,7 @@ class User:
             Client (Client): The object Client
         """
         try:
-            response: dict[str, dict] = self.Connection.query(
+            response: dict[str, dict] = self.Connection.query_cached(
                 'user.get',
                 {'nick': nickoruid})
             response_model = utils.construct_rpc_response(response)
@@ -111,39 +178,60 @@ class User:
 
             user: dict[str, dict] = response_model.result.get('client', {})
 
-            user_for_client = user.copy()
-            user_for_user: dict = user.get('user', {}).copy()
+            return self.__build_client(user)
 
-            for key in ['geoip', 'tls', 'user']:
-                user_for_client.pop(key, None)
+        except KeyError as ke:
+            self.Logs.error(f'KeyError: {ke}')
+            return Dfn.Client(error=Dfn.RPCErrorModel(-1, ke.__str__()))
+        except Exception as err:
+            self.Logs.error(f'General error: {err}')
+            return Dfn.Client(error=Dfn.RPCErrorModel(-1, err.__str__()))
+
+    def get_many(self, nickoruids: list[str]) -> list[Dfn.Client]:
+        """Get information about many users in one batch request
 
-            for key in ['channels', 'security-groups']:
-                user_for_user.pop(key, None)
+        Args:
+            nickoruids (list[str]): The nicknames or uids of the users
 
-            user_model = Dfn.User(
-                **user_for_user,
-                security_groups=user.get('user', {}).get(
-                    'security-groups', []),
-                channels=[Dfn.UserChannel(**chans)
-                          for chans in
-                          user.get('user', {}).get('channels', [])]
+        Returns:
+            Client ([Dfn.Client]): One Client object per nickname or uid,
+                in the same order. See the error property of each Client.
+        """
+        try:
+            responses: list[dict] = self.Connection.query_batch(
+                [('user.get', {'nick': nickoruid})
+                 for nickoruid in nickoruids]
             )
 
-            user_obj = Dfn.Client(
-                        **user_for_client,
-                        geoip=Dfn.Geoip(**user.get('geoip', {})),
-                        tls=Dfn.Tls(**user.get('tls', {})),
-                        user=user_model
+            clients: list[Dfn.Client] = []
+
+            for response in responses:
+                response_model = utils.construct_rpc_response(response)
+
+                if response_model.error.code != 0:
+                    self.Logs.error(f"Code: {response_model.error.code} "
+                                    f"- Msg: {response_model.error.message}")
+                    clients.append(Dfn.Client(error=response_model.error))
+                    continue
+
+                clients.append(
+                    self.__build_client(
+                        response_model.result.get('client', {})
                     )
+                )
 
-            return user_obj
+            return clients
 
         except KeyError as ke:
             self.Logs.error(f'KeyError: {ke}')
-            return Dfn.Client(error=Dfn.RPCErrorModel(-1, ke.__str__()))
+            return []
         except Exception as err:
             self.Logs.error(f'General error: {err}')
-            return Dfn.Client(error=Dfn.RPCErrorModel(-1, err.__str__()))
+            return []
+
+    def __build_client(self, user: dict[str, dict]) -> Dfn.Client:
+        """Build the Client model from the client object of user.get"""
+        return decoder.decode(Dfn.Client, user)
 
     def set_nick(self, nickoruid: str, newnick: str,
                  force: bool = False) -> Dfn.RPCResult:
@@ -163,7 +251,7 @@ class User:
             bool: True if success else error will be stored in ErrorModel
         """
         try:
-            response: dict[str, dict] = self.Connection.query(
+            response: dict[str, dict] = self.Connection.query_write(
                 'user.set_nick',
                 {'nick': nickoruid, 'newnick': newnick, 'force': force})
             response_model = utils.construct_rpc_response(response)
@@ -193,7 +281,7 @@ class User:
             bool: True if success else error will be stored in ErrorModel
         """
         try:
-            response: dict[str, dict] = self.Connection.query(
+            response: dict[str, dict] = self.Connection.query_write(
                 'user.set_username',
                 {'nick': nickoruid, 'username': username})
             response_model = utils.construct_rpc_response(response)
@@ -223,7 +311,7 @@ class User:
             bool: True if success else error will be stored in ErrorModel
         """
         try:
-            response: dict[str, dict] = self.Connection.query(
+            response: dict[str, dict] = self.Connection.query_write(
                 'user.set_realname',
                 {'nick': nickoruid, 'realname': realname})
             response_model = utils.construct_rpc_response(response)
@@ -253,7 +341,7 @@ class User:
             bool: True if success else error will be stored in ErrorModel
         """
         try:
-            response: dict[str, dict] = self.Connection.query(
+            response: dict[str, dict] = self.Connection.query_write(
                 'user.set_vhost',
                 {'nick': nickoruid, 'vhost': vhost})
             response_model = utils.construct_rpc_response(response)
@@ -283,7 +371,7 @@ class User:
             bool: True if success else error will be stored in ErrorModel
         """
         try:
-            response: dict[str, dict] = self.Connection.query(
+            response: dict[str, dict] = self.Connection.query_write(
                 'user.set_mode',
                 {'nick': nickoruid, 'modes': modes})
             response_model = utils.construct_rpc_response(response)
@@ -313,7 +401,7 @@ class User:
             bool: True if success else error will be stored in ErrorModel
         """
         try:
-            response: dict[str, dict] = self.Connection.query(
+            response: dict[str, dict] = self.Connection.query_write(
                 'user.set_snomask',
                 {'nick': nickoruid, 'snomask': snomask})
             response_model = utils.construct_rpc_response(response)
@@ -371,7 +459,7 @@ class User:
             bool: True if success else error will be stored in ErrorModel
         """
         try:
-            response: dict[str, dict] = self.Connection.query(
+            response: dict[str, dict] = self.Connection.query_write(
                 'user.set_oper',
                 {'nick': nickoruid, 'oper_account': oper_account,
                  'oper_class': oper_class, 'class': class_,
@@ -417,7 +505,7 @@ class User:
             bool: True if success else error will be stored in ErrorModel
         """
         try:
-            response: dict[str, dict] = self.Connection.query(
+            response: dict[str, dict] = self.Connection.query_write(
                 'user.join',
                 {'nick': nickoruid, 'channel': channel,
                  'key': key, 'force': force})
@@ -457,7 +545,7 @@ class User:
             bool: True if success else error will be stored in ErrorModel
         """
         try:
-            response: dict[str, dict] = self.Connection.query(
+            response: dict[str, dict] = self.Connection.query_write(
                 'user.part',
                 {'nick': nickoruid, 'channel': channel, 'force': force})
             response_model = utils.construct_rpc_response(response)
@@ -494,7 +582,7 @@ class User:
             bool: True if success else error will be stored in ErrorModel
         """
         try:
-            response: dict[str, dict] = self.Connection.query(
+            response: dict[str, dict] = self.Connection.query_write(
                 'user.kill',
                 {'nick': nickoruid, 'reason': reason})
             response_model = utils.construct_rpc_response(response)
@@ -531,7 +619,7 @@ class User:
             bool: True if success else error will be stored in ErrorModel
         """
         try:
-            response: dict[str, dict] = self.Connection.query(
+            response: dict[str, dict] = self.Connection.query_write(
                 'user.quit',
                 {'nick': nickoruid, 'reason': reason})
             response_model = utils.construct_rpc_response(response)
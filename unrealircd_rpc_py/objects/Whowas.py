@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 import unrealircd_rpc_py.objects.Definition as Dfn
-from unrealircd_rpc_py.utils import utils
+from unrealircd_rpc_py.utils import decoder, utils
 
 if TYPE_CHECKING:
     from unrealircd_rpc_py.connections.sync.IConnection import IConnection
@@ -8,14 +8,19 @@ if TYPE_CHECKING:
 
 class Whowas:
 
-    DB_WHOWAS: list[Dfn.Whowas] = []
-
     def __init__(self, connection: 'IConnection') -> None:
 
         # Get the Connection instance
         self.Connection = connection
         self.Logs = connection.Logs
 
+    @property
+    def DB_WHOWAS(self) -> list[Dfn.Whowas]:
+        """The entries of the last Whowas.get,
+        the error or the empty listing included (IConnection.Snapshots)
+        """
+        return self.Connection.Snapshots.latest('whowas.get', [])
+
     def get(self, nick: str = None, ip: str = None,
             object_detail_level: int = 2) -> list[Dfn.Whowas]:
         """Get WHOWAS history of a user. 6.1.0+
@@ -36,8 +41,16 @@ class Whowas:
         Returns:
             List[dfn.Whowas]: The Whowas model or Empty Whowas model
         """
+        return self.Connection.Snapshots.get(
+            ('whowas.get', nick, ip, object_detail_level),
+            lambda: self.__get(nick, ip, object_detail_level)
+        )
+
+    def __get(self, nick: str = None, ip: str = None,
+              object_detail_level: int = 2) -> list[Dfn.Whowas]:
+        """Query whowas.get and build the models"""
         try:
-            self.DB_WHOWAS = []
+            whowas_list: list[Dfn.Whowas] = []
             response: dict[str, dict] = self.Connection.query(
                 'whowas.get',
                 param={'nick': nick,
@@ -55,25 +68,10 @@ class Whowas:
                                    .get('result', {})
                                    .get('list', []))
 
-            for whowas in whowass:
-                whowas_exclude_objs = whowas.copy()
-                whowas_exclude_objs.pop('user', None)
-                whowas_exclude_objs.pop('geoip', None)
-
-                self.DB_WHOWAS.append(
-                    Dfn.Whowas(
-                        **whowas_exclude_objs,
-                        user=Dfn.WhowasUser(**whowas.get(
-                            'user',
-                            Dfn.WhowasUser().to_dict())
-                                            ),
-                        geoip=Dfn.Geoip(**whowas.get('geoip',
-                                                     Dfn.Geoip().to_dict()))
-                    )
-                )
+            whowas_list.extend(decoder.decode_list(Dfn.Whowas, whowass))
 
             if not whowass:
-                self.DB_WHOWAS.append(
+                whowas_list.append(
                     Dfn.Whowas(
                         error=Dfn.RPCErrorModel(
                             -1,
@@ -81,7 +79,7 @@ class Whowas:
                     )
                 )
 
-            return self.DB_WHOWAS
+            return whowas_list
 
         except KeyError as ke:
             self.Logs.error(f'KeyError: {ke}')
@@ -0,0 +1,199 @@
+"""
+Decoders from the JSON objects of the replies to the models.
+
+The first time a model is decoded, a function dedicated to it is
+generated: it reads each field from the dict (the JSON keys may use
+hyphens, security-groups gives security_groups), decodes the nested
+models and lists of models, and calls the model with the values.
+The unknown keys are ignored, the dict is never copied nor modified.
+
+```python
+    from unrealircd_rpc_py.utils import decoder
+
+    client = decoder.decode(Dfn.Client, reply['result']['client'])
+    bans = decoder.decode_list(Dfn.ServerBan, reply['result']['list'])
+```
+
+Other JSON keys of a field can be given in its metadata:
+`field(default_factory=dict, metadata={'aliases': ('except',)})`
+"""
+import typing
+from dataclasses import MISSING, Field, fields, is_dataclass
+from typing import Any, Callable, Iterable, Optional, TypeVar
+
+T = TypeVar('T')
+
+_DECODERS: dict[type, Callable[[dict], Any]] = {}
+
+_LITERALS = (type(None), bool, int, str)
+"""Defaults written as constants in the generated code"""
+
+
+def decoder_for(model: type[T]) -> Callable[[dict], T]:
+    """Return the decoder of a model, generated on first use
+
+    Args:
+        model (type): The model (a dataclass)
+
+    Returns:
+        Callable[[dict], model]: The decoder
+    """
+    decode_model = _DECODERS.get(model)
+    if decode_model is None:
+        decode_model = _DECODERS[model] = _compile(model)
+    return decode_model
+
+
+def decode(model: type[T], data: Optional[dict]) -> T:
+    """Build a model from a JSON object
+
+    Args:
+        model (type): The model (a dataclass)
+        data (dict, None): The JSON object, None gives the default model
+
+    Returns:
+        model: The model
+    """
+    if data is None:
+        return model()
+    return decoder_for(model)(data)
+
+
+def decode_list(model: type[T], items: Optional[Iterable[dict]]
+                ) -> list[T]:
+    """Build a list of models from a list of JSON objects
+
+    Args:
+        model (type): The model (a dataclass)
+        items (list[dict], None): The JSON objects
+
+    Returns:
+        list[model]: The models
+    """
+    if items is None:
+        return []
+    decode_model = decoder_for(model)
+    return [decode_model(item) for item in items]
+
+
+def _model_of(hint: Any) -> Optional[type]:
+    """The model of a type hint (Model or Optional[Model]), if any"""
+    if isinstance(hint, type) and is_dataclass(hint):
+        return hint
+
+    if typing.get_origin(hint) is typing.Union:
+        for arg in typing.get_args(hint):
+            if isinstance(arg, type) and is_dataclass(arg):
+                return arg
+
+    return None
+
+
+def _list_model_of(hint: Any) -> Optional[type]:
+    """The model of the items of a type hint (list[Model]), if any"""
+    if typing.get_origin(hint) is list:
+        args = typing.get_args(hint)
+        if args:
+            return _model_of(args[0])
+    return None
+
+
+def _keys(model_field: Field) -> tuple[str, ...]:
+    """The JSON keys of a field, in the order they are looked up"""
+    keys = [model_field.name]
+    hyphenated = model_field.name.replace('_', '-')
+    if hyphenated != model_field.name:
+        keys.append(hyphenated)
+    keys.extend(model_field.metadata.get('aliases', ()))
+    return tuple(keys)
+
+
+def _compile(model: type) -> Callable[[dict], Any]:
+    """Generate the decoder of a model"""
+    if not is_dataclass(model):
+        raise TypeError(f'{model!r} is not a dataclass')
+
+    hints = typing.get_type_hints(model)
+    env: dict[str, Any] = {
+        'model': model, 'new': object.__new__, 'MISSING': MISSING
+    }
+
+    # The attributes are set on a new instance, unless __init__ has to run
+    params = getattr(model, '__dataclass_params__', None)
+    direct = (not getattr(params, 'frozen', False)
+              and not hasattr(model, '__post_init__'))
+
+    body = ['    get = data.get']
+    if direct:
+        body.append('    obj = new(model)')
+    arguments: list[str] = []
+
+    for index, model_field in enumerate(fields(model)):
+        if not model_field.init:
+            continue
+
+        value = f'v{index}'
+        keys = _keys(model_field)
+
+        if model_field.default is not MISSING:
+            if model_field.default.__class__ in _LITERALS:
+                missing = repr(model_field.default)
+            else:
+                env[f'd{index}'] = model_field.default
+                missing = f'd{index}'
+        elif model_field.default_factory is not MISSING:
+            env[f'f{index}'] = model_field.default_factory
+            missing = f'f{index}()'
+        else:
+            missing = None
+
+        hint = hints.get(model_field.name, Any)
+        nested = _model_of(hint)
+        nested_list = None if nested else _list_model_of(hint)
+
+        if nested or nested_list:
+            env[f'n{index}'] = decoder_for(nested or nested_list)
+
+        if (len(keys) == 1 and missing is not None and not nested
+                and not nested_list and model_field.default is not MISSING):
+            # Most fields: a single key and a plain default
+            value = f'get({keys[0]!r}, {missing})'
+        else:
+            body.append(f'    {value} = get({keys[0]!r}, MISSING)')
+            for key in keys[1:]:
+                body.append(f'    if {value} is MISSING:')
+                body.append(f'        {value} = get({key!r}, MISSING)')
+
+            if missing is None:
+                fallback = f'raise KeyError({model_field.name!r})'
+            else:
+                fallback = f'{value} = {missing}'
+
+            if nested or nested_list:
+                # A missing or null object gives the default value
+                body.append(f'    if {value} is MISSING or {value} is None:')
+                body.append(f'        {fallback}')
+                if nested:
+                    body.append(f'    elif {value}.__class__ is dict:')
+                    body.append(f'        {value} = n{index}({value})')
+                else:
+                    body.append(f'    elif {value}.__class__ is list:')
+                    body.append(f'        {value} = [n{index}(item) '
+                                f'for item in {value}]')
+            else:
+                body.append(f'    if {value} is MISSING:')
+                body.append(f'        {fallback}')
+
+        if direct:
+            body.append(f'    obj.{model_field.name} = {value}')
+        else:
+            arguments.append(f'{model_field.name}={value}')
+
+    if direct:
+        body.append('    return obj')
+    else:
+        body.append(f'    return model({", ".join(arguments)})')
+    source = f'def decode_{model.__name__}(data):\n' + '\n'.join(body)
+
+    exec(compile(source, f'<decoder {model.__qualname__}>', 'exec'), env)
+    return env[f'decode_{model.__name__}']
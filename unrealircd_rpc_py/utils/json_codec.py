@@ -0,0 +1,115 @@
+"""
+JSON codec used by all the connections.
+
+orjson is used when it is installed, then ujson, else the json module of
+the standard library. The decoders accept str, bytes and bytearray so the
+replies can be decoded without converting them to str first.
+
+```python
+    from unrealircd_rpc_py.utils import json_codec
+
+    json_codec.backend          # 'orjson', 'ujson' or 'json'
+    json_codec.use('json')      # Force a backend
+```
+"""
+import json
+from typing import Any, Callable, Union
+
+JSONDecodeError = json.JSONDecodeError
+"""Raised by loads whatever the backend"""
+
+BACKENDS = ('orjson', 'ujson', 'json')
+"""The supported backends, in order of preference"""
+
+backend: str = 'json'
+"""The backend in use"""
+
+dumps: Callable[[Any], str]
+"""Encode an object to a JSON str"""
+
+dumps_bytes: Callable[[Any], bytes]
+"""Encode an object to JSON bytes (UTF-8)"""
+
+loads: Callable[[Union[str, bytes, bytearray]], Any]
+"""Decode a JSON document from str, bytes or bytearray"""
+
+
+def _json_codec() -> tuple[Callable, Callable, Callable]:
+    def _dumps(obj: Any) -> str:
+        return json.dumps(obj)
+
+    def _dumps_bytes(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
+    return _dumps, _dumps_bytes, json.loads
+
+
+def _orjson_codec() -> tuple[Callable, Callable, Callable]:
+    import orjson
+
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+
+    # orjson.JSONDecodeError is a subclass of json.JSONDecodeError
+    return _dumps, orjson.dumps, orjson.loads
+
+
+def _ujson_codec() -> tuple[Callable, Callable, Callable]:
+    import ujson
+
+    def _dumps(obj: Any) -> str:
+        return ujson.dumps(obj, ensure_ascii=False,
+                           escape_forward_slashes=False)
+
+    def _dumps_bytes(obj: Any) -> bytes:
+        return _dumps(obj).encode()
+
+    def _loads(data: Union[str, bytes, bytearray]) -> Any:
+        try:
+            return ujson.loads(
+                bytes(data) if isinstance(data, bytearray) else data
+            )
+        except ValueError as err:
+            raise JSONDecodeError(str(err), '', 0) from None
+
+    return _dumps, _dumps_bytes, _loads
+
+
+_FACTORIES: dict[str, Callable[[], tuple[Callable, Callable, Callable]]] = {
+    'orjson': _orjson_codec,
+    'ujson': _ujson_codec,
+    'json': _json_codec
+}
+
+
+def use(name: str) -> None:
+    """Select the backend used by dumps, dumps_bytes and loads
+
+    Args:
+        name (str): 'orjson', 'ujson' or 'json'
+
+    Raises:
+        ValueError: The backend is unknown
+        ImportError: The backend is not installed
+    """
+    global backend, dumps, dumps_bytes, loads
+
+    if name not in _FACTORIES:
+        raise ValueError(
+            f'({name}) is an invalid JSON backend! choose one of {BACKENDS}'
+        )
+
+    dumps, dumps_bytes, loads = _FACTORIES[name]()
+    backend = name
+
+
+def _use_fastest() -> None:
+    for name in BACKENDS:
+        try:
+            use(name)
+            return
+        except ImportError:
+            continue
+
+
+_use_fastest()
@@ -0,0 +1,174 @@
+"""
+Incremental parser for the JSON-RPC replies holding a big list
+(user.list, channel.list, log.list...).
+
+The entries of result.list are decoded one at a time while the reply is
+received, so the whole reply never has to be held in memory.
+"""
+import codecs
+import json
+import re
+from typing import Any, Iterable, Iterator, Optional
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_NUMBER_TAIL = re.compile(r'[0-9eE.+-]*')
+
+COMPACT_SIZE = 1 << 16
+"""Number of consumed chars after which the buffer is compacted"""
+
+
+class JsonListStream:
+    """Iterate over the entries of `result.list` of a JSON-RPC reply
+    received as chunks of bytes.
+
+    ```python
+        stream = JsonListStream(chunks)
+        for entry in stream:
+            ...
+        stream.error    # The error of the reply, if any
+    ```
+
+    The other members of the reply (jsonrpc, method, id, error...) are
+    available in `response` once the iteration is over.
+    """
+
+    def __init__(self, chunks: Iterable[bytes],
+                 path: tuple[str, ...] = ('result', 'list')) -> None:
+        self.path = path
+        self.response: dict[str, Any] = {}
+
+        self.__chunks = iter(chunks)
+        self.__utf8 = codecs.getincrementaldecoder('utf-8')()
+        self.__text = ''
+        self.__pos = 0
+        self.__eof = False
+
+    @property
+    def error(self) -> Optional[dict]:
+        """The error member of the reply, once the iteration is over"""
+        return self.response.get('error', None)
+
+    def __iter__(self) -> Iterator[Any]:
+        if self.__peek() != '{':
+            raise json.JSONDecodeError(
+                'Expecting a JSON-RPC object', self.__text, self.__pos
+            )
+        yield from self.__members(0)
+
+    def __members(self, depth: int) -> Iterator[Any]:
+        """Walk the members of an object, down to the list"""
+        self.__pos += 1
+        if self.__peek() == '}':
+            self.__pos += 1
+            return
+
+        while True:
+            key = self.__value()
+            self.__expect(':')
+
+            wanted = key == self.path[depth]
+            last = depth + 1 == len(self.path)
+            next_char = self.__peek()
+
+            if wanted and last and next_char == '[':
+                yield from self.__items()
+            elif wanted and not last and next_char == '{':
+                yield from self.__members(depth + 1)
+            else:
+                value = self.__value()
+                if depth == 0:
+                    self.response[key] = value
+
+            separator = self.__peek()
+            self.__pos += 1
+            if separator == '}':
+                return
+            if separator != ',':
+                raise json.JSONDecodeError(
+                    "Expecting ',' delimiter", self.__text, self.__pos - 1
+                )
+
+    def __items(self) -> Iterator[Any]:
+        """Yield the entries of the list"""
+        self.__pos += 1
+        if self.__peek() == ']':
+            self.__pos += 1
+            return
+
+        while True:
+            yield self.__value()
+
+            separator = self.__peek()
+            self.__pos += 1
+            if separator == ']':
+                return
+            if separator != ',':
+                raise json.JSONDecodeError(
+                    "Expecting ',' delimiter", self.__text, self.__pos - 1
+                )
+
+    def __value(self) -> Any:
+        """Decode the next value, reading more data until it is complete"""
+        self.__peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.__text, self.__pos)
+            except json.JSONDecodeError:
+                if self.__fill():
+                    continue
+                raise
+
+            # A number at the end of the buffer may be cut ("1.5e" of
+            # "1.5e10" is decoded as 1.5)
+            if (isinstance(value, (int, float))
+                    and _NUMBER_TAIL.match(self.__text, end).end()
+                    == len(self.__text)
+                    and self.__fill()):
+                continue
+
+            self.__pos = end
+            return value
+
+    def __expect(self, char: str) -> None:
+        if self.__peek() != char:
+            raise json.JSONDecodeError(
+                f"Expecting '{char}'", self.__text, self.__pos
+            )
+        self.__pos += 1
+
+    def __peek(self) -> str:
+        """Skip the whitespaces and return the next char"""
+        while True:
+            self.__pos = _WHITESPACE.match(self.__text, self.__pos).end()
+            if self.__pos < len(self.__text):
+                return self.__text[self.__pos]
+            if not self.__fill():
+                raise json.JSONDecodeError(
+                    'Unexpected end of data', self.__text, self.__pos
+                )
+
+    def __fill(self) -> bool:
+        """Append the next chunk to the buffer
+
+        Returns:
+            bool: False when there is no more data
+        """
+        if self.__eof:
+            return False
+
+        try:
+            chunk = next(self.__chunks)
+        except StopIteration:
+            self.__eof = True
+            tail = self.__utf8.decode(b'', final=True)
+            self.__text += tail
+            return bool(tail)
+
+        # Drop what has already been parsed
+        if self.__pos > COMPACT_SIZE:
+            self.__text = self.__text[self.__pos:]
+            self.__pos = 0
+
+        self.__text += self.__utf8.decode(chunk)
+        return True
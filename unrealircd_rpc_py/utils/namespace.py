@@ -0,0 +1,80 @@
+from typing import Any
+
+
+class LazyNamespace:
+    """Attribute view of a decoded JSON dict.
+
+    It behaves like the SimpleNamespace built by `utils.dict_to_namespace`
+    but nothing is copied: the nested dicts are wrapped only when they are
+    accessed, and the other values (lists included) are returned as they
+    are. Setting an attribute writes into the wrapped dict.
+
+    ```python
+        response = LazyNamespace({'result': {'list': [...]}})
+        response.result.list
+    ```
+    """
+
+    __slots__ = ('__data',)
+
+    def __init__(self, data: dict) -> None:
+        object.__setattr__(self, '_LazyNamespace__data', data)
+
+    @classmethod
+    def wrap(cls, value: Any) -> Any:
+        """Wrap the value if it is a dict, else return it as it is"""
+        return cls(value) if isinstance(value, dict) else value
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith('__') or name == '_LazyNamespace__data':
+            raise AttributeError(name)
+
+        try:
+            value = self.__data[name]
+        except KeyError:
+            raise AttributeError(
+                f"'LazyNamespace' object has no attribute '{name}'"
+            ) from None
+
+        return LazyNamespace(value) if isinstance(value, dict) else value
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        self.__data[name] = value
+
+    def __delattr__(self, name: str) -> None:
+        try:
+            del self.__data[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, LazyNamespace):
+            return self.__data == other.__data
+        return NotImplemented
+
+    __hash__ = None
+
+    def __dir__(self) -> list[str]:
+        return [*self.__data, *super().__dir__()]
+
+    def __repr__(self) -> str:
+        items = ', '.join(
+            f'{key}={LazyNamespace.wrap(value)!r}'
+            for key, value in self.__data.items()
+        )
+        return f'namespace({items})'
+
+    def __getstate__(self) -> dict:
+        return self.__data
+
+    def __setstate__(self, data: dict) -> None:
+        object.__setattr__(self, '_LazyNamespace__data', data)
+
+    @property
+    def __dict__(self) -> dict:
+        """The wrapped dict, so `vars()` works like on SimpleNamespace"""
+        return self.__data
+
+    def to_dict(self) -> dict:
+        """Return the wrapped dict"""
+        return self.__data
@@ -0,0 +1,383 @@
+"""
+Read-through cache of the single-object queries (user.get, channel.get,
+server.get, stats.get, server_ban.get, spamfilter.get).
+
+A response is kept per method and params for the TTL of its method, the
+least recently used responses are dropped past max_size. The TTLs are 0
+by default: nothing is cached until they are set.
+
+Each response is tagged with what it describes (the client, the channel
+and its members, the server bans...), a live log event drops the
+responses it touches: a nick change or a quit drops the user.get of the
+client and the channel.get of its channels. The writes of the
+connection itself (User.set_nick, Server_ban.add...) drop them the same
+way once they succeed, see IConnection.query_write.
+
+```python
+    conn.setup({..., 'read_cache_ttl': {'user.get': 2, 'stats.get': 5}})
+
+    liveconn.setup({..., 'read_cache': conn.ReadCache})
+    # or from your own callback
+    conn.ReadCache.apply_event(response)
+```
+
+The responses are shared by all the readers, copy them before modifying
+them.
+"""
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Callable, Hashable, Optional, Union
+from unrealircd_rpc_py.utils import utils
+
+DEFAULT_MAX_SIZE = 1024
+
+CACHEABLE_METHODS = ('user.get', 'channel.get', 'server.get', 'stats.get',
+                     'server_ban.get', 'spamfilter.get')
+"""Methods cached when read_cache_ttl is a number"""
+
+STATS_SUBSYSTEMS = frozenset(('connect', 'join', 'part', 'kick', 'link',
+                              'tkl', 'spamfilter'))
+"""Subsystems of the log events that change the counters of stats.get"""
+
+TKL_SUBSYSTEMS = frozenset(('tkl', 'spamfilter'))
+
+RECENT_EVENTS = 256
+"""Invalidations remembered to check the responses received meanwhile"""
+
+Tag = tuple[str, ...]
+
+
+def _lower(value: Any) -> Optional[str]:
+    return value.lower() if isinstance(value, str) and value else None
+
+
+def _client_tags(client: Any) -> list[Tag]:
+    """Tags of a client given by its dict or its nick"""
+    if isinstance(client, str):
+        client = {'name': client}
+    if not isinstance(client, dict):
+        return []
+    return [('user', value) for value in
+            (_lower(client.get('name')), _lower(client.get('id'))) if value]
+
+
+def _channel_name(channel: Any) -> Optional[str]:
+    if isinstance(channel, dict):
+        channel = channel.get('name')
+    return _lower(channel)
+
+
+def response_tags(method: str, param: dict, response: dict) -> set[Tag]:
+    """What a response describes, see event_tags"""
+    tags: set[Tag] = {('method', method)}
+    result = response.get('result')
+    result = result if isinstance(result, dict) else {}
+
+    if method == 'user.get':
+        tags.update(_client_tags(param.get('nick')))
+        tags.update(_client_tags(result.get('client')))
+
+    elif method == 'channel.get':
+        channel = result.get('channel')
+        channel = channel if isinstance(channel, dict) else {}
+        for name in (param.get('channel'), channel.get('name')):
+            if _lower(name):
+                tags.add(('channel', _lower(name)))
+        for member in channel.get('members') or ():
+            tags.update(_client_tags(member))
+
+    elif method == 'server.get':
+        tags.add(('server',))
+
+    elif method == 'stats.get':
+        tags.add(('stats',))
+
+    elif method in ('server_ban.get', 'spamfilter.get'):
+        tags.add(('tkl',))
+
+    return tags
+
+
+def write_tags(method: str, param: dict) -> set[Tag]:
+    """What a write query (user.set_nick, server_ban.add...) changes, see
+    event_tags"""
+    tags: set[Tag] = set()
+    module = method.partition('.')[0]
+
+    if module in ('user', 'channel'):
+        tags.update(_client_tags(param.get('nick')))
+        if _lower(param.get('newnick')):
+            tags.add(('user', _lower(param.get('newnick'))))
+        # user.join and user.part take a comma separated list
+        for channel in str(param.get('channel') or '').split(','):
+            if _lower(channel):
+                tags.add(('channel', _lower(channel)))
+        if method in ('user.join', 'user.part', 'user.kill', 'user.quit',
+                      'channel.kick'):
+            tags.add(('stats',))
+
+    elif module in ('server_ban', 'spamfilter'):
+        tags.update((('tkl',), ('stats',)))
+
+    elif module == 'server':
+        tags.update((('server',), ('stats',)))
+
+    return tags
+
+
+def event_tags(event: Any) -> set[Tag]:
+    """What a live log event touches
+
+    Args:
+        event (Any): What the live callback got, in any event_format,
+            its result, or the decoded dict of the event
+
+    Returns:
+        set[tuple]: The tags of the responses to drop
+    """
+    event = utils.live_event_to_dict(event)
+    if event is None:
+        return set()
+
+    tags: set[Tag] = set()
+    for key in ('client', 'victim', 'target'):
+        tags.update(_client_tags(event.get(key)))
+    for key in ('new_nick', 'newnick', 'old_nick'):
+        if _lower(event.get(key)):
+            tags.add(('user', _lower(event.get(key))))
+
+    channel = _channel_name(event.get('channel'))
+    if channel:
+        tags.add(('channel', channel))
+
+    subsystem = event.get('subsystem')
+    if subsystem in TKL_SUBSYSTEMS:
+        tags.add(('tkl',))
+    if subsystem == 'link':
+        tags.add(('server',))
+    if subsystem in STATS_SUBSYSTEMS:
+        tags.add(('stats',))
+
+    return tags
+
+
+class _Entry:
+
+    __slots__ = ('response', 'expires_at', 'tags')
+
+    def __init__(self, response: dict, ttl: float, tags: set[Tag]) -> None:
+        self.response = response
+        self.expires_at = time.monotonic() + ttl
+        self.tags = tags
+
+
+class ReadCache:
+    """Keep the responses of the get queries of a connection
+
+    ```python
+        conn.ReadCache.configure(ttls={'user.get': 2})
+        conn.User.get('adator')     # Query the server
+        conn.User.get('adator')     # Served from memory for 2 seconds
+        conn.ReadCache.stats()      # {'hits': 1, 'misses': 1, ...}
+    ```
+    """
+
+    def __init__(self, ttls: Union[float, dict[str, float], None] = None,
+                 max_size: int = DEFAULT_MAX_SIZE) -> None:
+        self.ttls: dict[str, float] = {}
+        self.max_size = max_size
+
+        self.hits = 0
+        """Responses returned without querying the server"""
+        self.misses = 0
+        """Queries sent for a cached method"""
+        self.invalidations = 0
+        """Responses dropped by the live events or invalidate"""
+
+        self.__entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self.__tags: dict[Tag, set[Hashable]] = {}
+        self.__generation = 0
+        self.__recent: deque[tuple[int, set[Tag]]] = deque(
+            maxlen=RECENT_EVENTS
+        )
+        self.__lock = threading.Lock()
+
+        self.configure(ttls=ttls)
+
+    def configure(self, ttls: Union[float, dict[str, float], None] = None,
+                  max_size: Optional[int] = None) -> None:
+        """Change the settings, the kept responses are cleared
+
+        Args:
+            ttls (float | dict, optional): Seconds a response is kept, per
+                method ({'user.get': 2}), or one value for all the
+                CACHEABLE_METHODS
+            max_size (int, optional): Number of responses kept
+        """
+        with self.__lock:
+            if isinstance(ttls, (int, float)):
+                self.ttls = dict.fromkeys(CACHEABLE_METHODS, ttls)
+            elif ttls is not None:
+                self.ttls = dict(ttls)
+            if max_size is not None:
+                self.max_size = max_size
+            self.__clear()
+
+    def get(self, method: str, param: Optional[dict],
+            loader: Callable[[], Optional[dict]]) -> Optional[dict]:
+        """Return the kept response of the query, calling loader when
+        there is none. Only the responses without error are kept.
+
+        Args:
+            method (str): The method name, e.g. 'user.get'
+            param (dict, optional): The params of the query
+            loader (Callable): Send the query, return the response
+
+        Returns:
+            dict: The response
+        """
+        ttl = self.ttls.get(method, 0)
+        key = self.__key(method, param) if ttl > 0 else None
+        if key is None:
+            return loader()
+
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None and entry.expires_at > time.monotonic():
+                self.hits += 1
+                self.__entries.move_to_end(key)
+                return entry.response
+            self.misses += 1
+            generation = self.__generation
+
+        response = loader()
+        if (not isinstance(response, dict) or 'error' in response
+                or 'result' not in response):
+            return response
+
+        tags = response_tags(method, param or {}, response)
+        with self.__lock:
+            # An event may have changed the object while it was queried
+            if not self.__touched_since(generation, tags):
+                self.__remove(key)
+                self.__entries[key] = _Entry(response, ttl, tags)
+                for tag in tags:
+                    self.__tags.setdefault(tag, set()).add(key)
+                self.__evict()
+        return response
+
+    def apply_event(self, event: Any) -> int:
+        """Drop the responses touched by a live log event
+
+        Args:
+            event (Any): What the live callback got, in any event_format,
+                its result, or the decoded dict of the event
+
+        Returns:
+            int: The number of responses dropped
+        """
+        return self.__invalidate_tags(event_tags(event))
+
+    def apply_write(self, method: str, param: Optional[dict],
+                    response: Optional[dict]) -> int:
+        """Drop the responses changed by a write query, once the server
+        accepted it
+
+        Args:
+            method (str): The method name, e.g. 'user.set_nick'
+            param (dict, optional): The params of the query
+            response (dict, optional): The response of the server
+
+        Returns:
+            int: The number of responses dropped
+        """
+        if not isinstance(response, dict) or 'error' in response:
+            return 0
+        return self.__invalidate_tags(write_tags(method, param or {}))
+
+    def invalidate(self, method: Optional[str] = None) -> int:
+        """Drop the responses of a method, or all of them
+
+        Returns:
+            int: The number of responses dropped
+        """
+        if method is not None:
+            return self.__invalidate_tags({('method', method)})
+
+        with self.__lock:
+            dropped = len(self.__entries)
+            self.invalidations += dropped
+            self.__clear()
+            return dropped
+
+    def stats(self) -> dict[str, int]:
+        """The counters and the number of responses kept"""
+        with self.__lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'invalidations': self.invalidations,
+                'size': len(self.__entries)
+            }
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def __key(self, method: str, param: Optional[dict]
+              ) -> Optional[Hashable]:
+        """(method, sorted params), None if a param is not hashable"""
+        key = (method, tuple(sorted((param or {}).items())))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def __touched_since(self, generation: int, tags: set[Tag]) -> bool:
+        """Whether an invalidation since generation matched the tags"""
+        if generation == self.__generation:
+            return False
+        if not self.__recent or self.__recent[0][0] > generation + 1:
+            # Too many invalidations since then to know
+            return True
+        return any(not tags.isdisjoint(touched)
+                   for touched_at, touched in self.__recent
+                   if touched_at > generation)
+
+    def __invalidate_tags(self, tags: set[Tag]) -> int:
+        if not tags:
+            return 0
+
+        with self.__lock:
+            self.__generation += 1
+            self.__recent.append((self.__generation, tags))
+            keys = set()
+            for tag in tags:
+                keys.update(self.__tags.get(tag, ()))
+            for key in keys:
+                self.__remove(key)
+            self.invalidations += len(keys)
+            return len(keys)
+
+    def __remove(self, key: Hashable) -> None:
+        entry = self.__entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry.tags:
+            keys = self.__tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.__tags[tag]
+
+    def __clear(self) -> None:
+        self.__generation += 1
+        self.__recent.clear()
+        self.__entries.clear()
+        self.__tags.clear()
+
+    def __evict(self) -> None:
+        """Drop the least recently used responses past max_size"""
+        while len(self.__entries) > max(self.max_size, 1):
+            self.__remove(next(iter(self.__entries)))
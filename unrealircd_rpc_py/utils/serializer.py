@@ -0,0 +1,169 @@
+"""
+Serializers from the models to dicts and JSON, used by MainModel.
+
+The first time a model is serialized, a function dedicated to it is
+generated: it reads each field directly and builds the dict, calling the
+serializers of the nested models. The result is the same as
+dataclasses.asdict without its generic introspection, and the fields
+given in `exclude` are skipped instead of being built then popped.
+
+```python
+    from unrealircd_rpc_py.utils import serializer
+
+    serializer.to_dict(client, exclude={'geoip', 'tls', 'user'})
+    serializer.to_json_bytes(client)
+```
+"""
+import copy
+import typing
+from dataclasses import fields, is_dataclass
+from typing import Any, Callable, Iterable, Optional
+from unrealircd_rpc_py.utils import json_codec
+
+_SERIALIZERS: dict[tuple[type, frozenset], Callable[[Any], dict]] = {}
+
+_ATOMIC_HINTS = (str, int, float, bool, type(None))
+"""Fields of these types are copied as is"""
+
+_ATOMIC = frozenset(_ATOMIC_HINTS)
+
+
+def serializer_for(model: type, exclude: Iterable[str] = ()
+                   ) -> Callable[[Any], dict]:
+    """Return the serializer of a model, generated on first use
+
+    Args:
+        model (type): The model (a dataclass)
+        exclude (Iterable[str], optional): The fields to skip
+
+    Returns:
+        Callable[[model], dict]: The serializer
+    """
+    key = (model, frozenset(exclude))
+    serialize = _SERIALIZERS.get(key)
+    if serialize is None:
+        serialize = _SERIALIZERS[key] = _compile(model, key[1])
+    return serialize
+
+
+def to_dict(obj: Any, exclude: Optional[Iterable[str]] = None) -> dict:
+    """The fields of a model as a new dict, like dataclasses.asdict
+
+    Args:
+        obj (Any): The model
+        exclude (Iterable[str], optional): The fields to skip
+
+    Returns:
+        dict: The fields, the nested models are converted too
+    """
+    return serializer_for(type(obj), exclude or ())(obj)
+
+
+def to_json_bytes(obj: Any, exclude: Optional[Iterable[str]] = None
+                  ) -> bytes:
+    """The fields of a model as JSON bytes (UTF-8)
+
+    Args:
+        obj (Any): The model
+        exclude (Iterable[str], optional): The fields to skip
+
+    Returns:
+        bytes: The JSON document
+    """
+    if not exclude and json_codec.backend == 'orjson':
+        # orjson encodes the dataclasses natively
+        return json_codec.dumps_bytes(obj)
+    return json_codec.dumps_bytes(to_dict(obj, exclude))
+
+
+def convert(value: Any) -> Any:
+    """Copy a value of any type, converting the models it holds"""
+    cls = value.__class__
+    if cls in _ATOMIC:
+        return value
+    if is_dataclass(cls):
+        return serializer_for(cls)(value)
+    if cls is list:
+        return [convert(item) for item in value]
+    if cls is dict:
+        return {convert(key): convert(item) for key, item in value.items()}
+    if isinstance(value, tuple) and hasattr(value, '_fields'):
+        return cls(*[convert(item) for item in value])
+    if isinstance(value, (list, tuple)):
+        return cls(convert(item) for item in value)
+    if isinstance(value, dict):
+        return cls((convert(key), convert(item))
+                   for key, item in value.items())
+    return copy.deepcopy(value)
+
+
+def _model_of(hint: Any) -> Optional[type]:
+    """The model of a type hint (Model), if any"""
+    if isinstance(hint, type) and is_dataclass(hint):
+        return hint
+    return None
+
+
+def _is_atomic(hint: Any) -> bool:
+    """True for str, int, float, bool and their Optional"""
+    if hint in _ATOMIC_HINTS:
+        return True
+    if typing.get_origin(hint) is typing.Union:
+        return all(arg in _ATOMIC_HINTS for arg in typing.get_args(hint))
+    return False
+
+
+def _compile(model: type, exclude: frozenset) -> Callable[[Any], dict]:
+    """Generate the serializer of a model"""
+    if not is_dataclass(model):
+        raise TypeError(f'{model!r} is not a dataclass')
+
+    hints = typing.get_type_hints(model)
+    env: dict[str, Any] = {'convert': convert}
+    body: list[str] = []
+    items: list[str] = []
+
+    for index, model_field in enumerate(fields(model)):
+        if model_field.name in exclude:
+            continue
+
+        attribute = f'obj.{model_field.name}'
+        hint = hints.get(model_field.name, Any)
+        nested = _model_of(hint)
+        item_model = None
+        if typing.get_origin(hint) is list and typing.get_args(hint):
+            item_model = _model_of(typing.get_args(hint)[0])
+
+        if _is_atomic(hint):
+            # The value may still be of another type, convert it then
+            body.append(f'    v{index} = {attribute}')
+            body.append(f'    if v{index}.__class__ not in ATOMIC:')
+            body.append(f'        v{index} = convert(v{index})')
+        elif nested is not None:
+            env[f'm{index}'] = nested
+            env[f's{index}'] = serializer_for(nested)
+            body.append(f'    v{index} = {attribute}')
+            body.append(f'    v{index} = s{index}(v{index}) '
+                        f'if v{index}.__class__ is m{index} '
+                        f'else convert(v{index})')
+        elif item_model is not None:
+            env[f'm{index}'] = item_model
+            env[f's{index}'] = serializer_for(item_model)
+            body.append(f'    v{index} = {attribute}')
+            body.append(f'    if v{index}.__class__ is list:')
+            body.append(f'        v{index} = [s{index}(item) '
+                        f'if item.__class__ is m{index} else convert(item) '
+                        f'for item in v{index}]')
+            body.append('    else:')
+            body.append(f'        v{index} = convert(v{index})')
+        else:
+            body.append(f'    v{index} = convert({attribute})')
+
+        items.append(f'{model_field.name!r}: v{index}')
+
+    env['ATOMIC'] = _ATOMIC
+    body.append(f'    return {{{", ".join(items)}}}')
+    source = f'def serialize_{model.__name__}(obj):\n' + '\n'.join(body)
+
+    exec(compile(source, f'<serializer {model.__qualname__}>', 'exec'), env)
+    return env[f'serialize_{model.__name__}']
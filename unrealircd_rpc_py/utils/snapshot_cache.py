@@ -0,0 +1,246 @@
+"""
+Per-connection cache of the listings (user.list, channel.list,
+server_ban.list...) returned by the list_ methods of the object modules.
+
+    - ttl: a snapshot younger than ttl seconds is returned without
+      querying the server. With 0 (the default) every call queries the
+      server, only the last snapshot of each method is kept.
+    - stale_ttl: during stale_ttl more seconds, the old snapshot is
+      still returned at once while a background thread fetches a new one
+      (stale-while-revalidate).
+    - max_size: number of snapshots kept, the least recently used is
+      dropped first. Snapshots older than ttl + stale_ttl are dropped.
+
+The last listing returned for each method is what the DB_* attributes of
+the modules (User.DB_USER, Channel.DB_CHANNELS...) return, errors and
+empty listings included. Only the valid listings are kept as snapshots.
+
+The models of a snapshot are shared by all the readers, copy them before
+modifying them.
+"""
+import threading
+import time
+from collections import OrderedDict
+from logging import Logger
+from typing import Any, Callable, Hashable, Optional
+
+DEFAULT_MAX_SIZE = 16
+
+
+def is_valid_listing(value: Any) -> bool:
+    """Default check before keeping a snapshot: a non empty list without
+    error model in first position"""
+    if not isinstance(value, list) or not value:
+        return False
+    error = getattr(value[0], 'error', None)
+    return error is None or getattr(error, 'code', 0) == 0
+
+
+class _Snapshot:
+
+    __slots__ = ('value', 'stored_at', 'refreshing')
+
+    def __init__(self, value: Any) -> None:
+        self.value = value
+        self.stored_at = time.monotonic()
+        self.refreshing = False
+
+
+class SnapshotCache:
+    """Keep the last listings of a connection
+
+    ```python
+        conn.Snapshots.configure(ttl=5, stale_ttl=30, max_size=16)
+        conn.User.list_()       # Query the server
+        conn.User.list_()       # Served from memory for 5 seconds
+        conn.Snapshots.stats()  # {'hits': 1, 'misses': 1, ...}
+    ```
+    """
+
+    def __init__(self, ttl: float = 0, stale_ttl: float = 0,
+                 max_size: int = DEFAULT_MAX_SIZE,
+                 logs: Optional[Logger] = None) -> None:
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_size = max_size
+        self.Logs = logs
+
+        self.hits = 0
+        """Snapshots returned without querying the server"""
+        self.stale_hits = 0
+        """Stale snapshots returned while a new one is fetched"""
+        self.misses = 0
+        """Queries sent because no usable snapshot was kept"""
+        self.refreshes = 0
+        """Snapshots fetched by the background thread"""
+
+        self.__snapshots: OrderedDict[Hashable, _Snapshot] = OrderedDict()
+        self.__latest: dict[str, Any] = {}
+        self.__loading: dict[Hashable, threading.Event] = {}
+        self.__lock = threading.Lock()
+
+    def configure(self, ttl: Optional[float] = None,
+                  stale_ttl: Optional[float] = None,
+                  max_size: Optional[int] = None) -> None:
+        """Change the settings, the kept snapshots are cleared"""
+        with self.__lock:
+            if ttl is not None:
+                self.ttl = ttl
+            if stale_ttl is not None:
+                self.stale_ttl = stale_ttl
+            if max_size is not None:
+                self.max_size = max_size
+            self.__snapshots.clear()
+
+    def get(self, key: tuple, loader: Callable[[], Any],
+            is_valid: Callable[[Any], bool] = is_valid_listing) -> Any:
+        """Return the snapshot of key, calling loader when there is no
+        usable one.
+
+        Args:
+            key (tuple): The method name followed by the parameters,
+                e.g. ('user.list', 2)
+            loader (Callable): Query the server and build the listing
+            is_valid (Callable, optional): Whether the listing can be kept
+                (errors are not).
+
+        Returns:
+            Any: The listing
+        """
+        value = self.__get(key, loader, is_valid)
+        with self.__lock:
+            self.__latest[key[0]] = value
+        return value
+
+    def latest(self, method: str, default: Any = None) -> Any:
+        """The last listing returned for a method, whatever its parameters
+        and even if it was not kept (an error, an empty listing)
+
+        Args:
+            method (str): The method name, e.g. 'user.list'
+            default (Any, optional): Returned if the method was not called
+
+        Returns:
+            Any: The listing or default
+        """
+        with self.__lock:
+            return self.__latest.get(method, default)
+
+    def invalidate(self, method: Optional[str] = None) -> None:
+        """Drop the snapshots of a method, or all of them"""
+        with self.__lock:
+            if method is None:
+                self.__snapshots.clear()
+                return
+
+            for key in [key for key in self.__snapshots if key[0] == method]:
+                del self.__snapshots[key]
+
+    def stats(self) -> dict[str, int]:
+        """The counters and the number of snapshots kept"""
+        with self.__lock:
+            return {
+                'hits': self.hits,
+                'stale_hits': self.stale_hits,
+                'misses': self.misses,
+                'refreshes': self.refreshes,
+                'size': len(self.__snapshots)
+            }
+
+    def __len__(self) -> int:
+        return len(self.__snapshots)
+
+    def __get(self, key: tuple, loader: Callable[[], Any],
+              is_valid: Callable[[Any], bool]) -> Any:
+        if self.ttl <= 0:
+            with self.__lock:
+                self.misses += 1
+            return self.__load(key, loader, is_valid)
+
+        while True:
+            with self.__lock:
+                snapshot = self.__snapshots.get(key)
+                if snapshot is not None:
+                    age = time.monotonic() - snapshot.stored_at
+                    if age < self.ttl:
+                        self.hits += 1
+                        self.__snapshots.move_to_end(key)
+                        return snapshot.value
+
+                    if age < self.ttl + self.stale_ttl:
+                        self.stale_hits += 1
+                        self.__snapshots.move_to_end(key)
+                        if not snapshot.refreshing:
+                            snapshot.refreshing = True
+                            self.__refresh_in_background(
+                                key, loader, is_valid)
+                        return snapshot.value
+
+                loading = self.__loading.get(key)
+                if loading is None:
+                    loading = self.__loading[key] = threading.Event()
+                    self.misses += 1
+                    break
+
+            # Another thread is fetching the same listing, use it
+            loading.wait()
+            with self.__lock:
+                snapshot = self.__snapshots.get(key)
+                if snapshot is not None:
+                    self.hits += 1
+                    return snapshot.value
+
+        try:
+            return self.__load(key, loader, is_valid)
+        finally:
+            with self.__lock:
+                self.__loading.pop(key, None)
+            loading.set()
+
+    def __load(self, key: tuple, loader: Callable[[], Any],
+               is_valid: Callable[[Any], bool]) -> Any:
+        value = loader()
+        # With ttl 0 a snapshot is never served, only __latest keeps it
+        if self.ttl > 0 and is_valid(value):
+            self.__store(key, value)
+        return value
+
+    def __store(self, key: tuple, value: Any) -> None:
+        with self.__lock:
+            self.__snapshots[key] = _Snapshot(value)
+            self.__snapshots.move_to_end(key)
+            self.__evict()
+
+    def __evict(self) -> None:
+        """Drop the expired snapshots and the least recently used ones"""
+        if self.ttl > 0:
+            deadline = time.monotonic() - self.ttl - self.stale_ttl
+            for key in [key for key, snapshot in self.__snapshots.items()
+                        if snapshot.stored_at <= deadline]:
+                del self.__snapshots[key]
+
+        while len(self.__snapshots) > max(self.max_size, 1):
+            self.__snapshots.popitem(last=False)
+
+    def __refresh_in_background(self, key: tuple, loader: Callable[[], Any],
+                                is_valid: Callable[[Any], bool]) -> None:
+
+        def refresh() -> None:
+            try:
+                value = self.__load(key, loader, is_valid)
+                with self.__lock:
+                    self.refreshes += 1
+                    if is_valid(value):
+                        self.__latest[key[0]] = value
+            except Exception as err:
+                if self.Logs is not None:
+                    self.Logs.error(f'Snapshot refresh of {key}: {err}')
+            finally:
+                with self.__lock:
+                    snapshot = self.__snapshots.get(key)
+                    if snapshot is not None:
+                        snapshot.refreshing = False
+
+        threading.Thread(
+            target=refresh, name='unrealircd-rpc-py-snapshot', daemon=True
+        ).start()
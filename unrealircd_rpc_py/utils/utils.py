@@ -1,15 +1,21 @@
 from datetime import datetime
 import logging
 import os
+from random import randint
 from re import match
 from secrets import token_hex
+from time import time
 from types import SimpleNamespace
 from typing import Any, Optional, Union
 import unrealircd_rpc_py.objects.Definition as Dfn
+from unrealircd_rpc_py.connections.sync import __version_required__
+from unrealircd_rpc_py.connections.live import raw_event
 from unrealircd_rpc_py.exceptions.rpc_exceptions import (
     RpcInvalidUrlFormat,
     RpcUnixSocketFileNotFoundError
 )
+from unrealircd_rpc_py.utils import decoder
+from unrealircd_rpc_py.utils.namespace import LazyNamespace
 
 
 def check_unix_socket_file(path_to_socket_file: str) -> bool:
@@ -72,12 +78,13 @@ def construct_rpc_response(response: dict) -> Dfn.RPCResult:
                  )
         ```
     """
-    error_dict = response.pop('error', {})
-    error_model = Dfn.RPCErrorModel()
-    if error_dict:
-        error_model = Dfn.RPCErrorModel(**error_dict)
+    if not isinstance(response, dict):
+        # The transport failed, query() returned None
+        return Dfn.RPCResult(error=Dfn.RPCErrorModel(
+            -1, 'No response from the server'
+        ))
 
-    return Dfn.RPCResult(**response, error=error_model)
+    return decoder.decode(Dfn.RPCResult, response)
 
 
 def get_timestamp() -> str:
@@ -130,6 +137,27 @@ def dict_to_namespace(dictionary: Any) -> Union[SimpleNamespace, Any]:
         return dictionary
 
 
+def dict_to_lazy_namespace(dictionary: Any) -> Union[LazyNamespace, Any]:
+    """Wrap a dictionary in a LazyNamespace. Unlike dict_to_namespace
+    nothing is copied, the nested dicts are wrapped when accessed.
+
+    :param dictionary:
+    :return: LazyNamespace object or the object if it is not a dict
+    """
+    return LazyNamespace.wrap(dictionary)
+
+
+def live_event_to_dict(event: Any) -> Optional[dict]:
+    """Return the decoded dict of a live log event, in any event_format
+
+    :param event: What the live callback got (LiveRPCResult, the decoded
+        line or a RawLiveEvent), the result (LazyNamespace) or the dict
+        itself
+    :return: The dict of the event, None if it is not a log event
+    """
+    return raw_event.event_dict(event)
+
+
 def verify_unix_socket_file(path_to_socket_file: str) -> bool:
     """Check provided full path to socket file if it exist
 
@@ -224,6 +252,77 @@ def is_version_ircd_ok(
         return True
 
 
+def check_method_version(method: str,
+                         current_server_version: Optional[tuple] = None,
+                         query_id: int = 123,
+                         jsonrpc: str = '2.0'
+                         ) -> Optional[dict]:
+    """Check if the method is available for the ircd version
+
+    Args:
+        method (str): The method to send to unrealircd (ex. log.list)
+        current_server_version (Optional[tuple]): The ircd version
+        query_id (int, optional): id of the request. Defaults to 123.
+        jsonrpc (str, optional): jsonrpc. Defaults to '2.0'.
+
+    Returns:
+        dict: The error response if the method is not available
+        None: The method is available
+    """
+    _method = method.split('.')[0]
+    _req_ver = __version_required__.get(_method, None)
+
+    if _req_ver is None or is_version_ircd_ok(current_server_version,
+                                              _req_ver):
+        return None
+
+    return {
+        "jsonrpc": jsonrpc,
+        "method": method,
+        "error": {
+            'message': f'This object {_method} is not available '
+                       f'for this ircd version. '
+                       f'must be {_req_ver} or higher',
+            'code': -1},
+        "id": query_id
+    }
+
+
+def generate_query_id() -> int:
+    """Generate the id of a request when the caller did not provide one"""
+    return int(time()) + randint(1, 6000)
+
+
+def match_batch_responses(batch: list[dict], response: Any
+                          ) -> list[dict]:
+    """Match the responses of a JSON-RPC batch to its requests
+
+    Args:
+        batch (list[dict]): The requests sent to the server
+        response (Any): The decoded response of the server
+
+    Returns:
+        list[dict]: One response per request, in the order of the batch
+    """
+    by_id: dict[int, dict] = {}
+    error_message = 'No response from the server for this request'
+
+    if isinstance(response, list):
+        by_id = {r.get('id'): r for r in response if isinstance(r, dict)}
+    elif isinstance(response, dict) and 'error' in response:
+        error_message = response['error'].get('message', error_message)
+
+    return [
+        by_id.get(request['id'], {
+            "jsonrpc": request['jsonrpc'],
+            "method": request['method'],
+            "error": {'message': error_message, 'code': -1},
+            "id": request['id']
+        })
+        for request in batch
+    ]
+
+
 def generate_ids(nbytes: int = 16) -> str:
     """Generates a random hexadecimal token for IDs.
         Args: